@@ -0,0 +1,4 @@
+"""Benchmarks for the client's hot paths.
+
+Run with ``python -m benchmarks`` from the repository root.
+"""
@@ -0,0 +1,96 @@
+"""Run the benchmarks and write the results as JSON.
+
+Usage (from the repository root)::
+
+    python -m benchmarks -o results.json
+    python -m benchmarks -k micro --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import Any
+
+from . import macro, micro  # noqa: F401  (registers the benchmarks)
+from .harness import BENCHMARKS, compare, environment, run
+
+
+def _print_result(name: str, result: dict[str, Any]) -> None:
+    print(
+        f"{name:<40} {result['per_op'] * 1e6:>12.2f} us/{result['unit']}"
+        f"  (stdev {result['stdev'] / result['iterations'] * 1e6:.2f} us)"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the selected benchmarks; return 1 if a regression was found."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        default=[],
+        help="Run only benchmarks whose name contains this (repeatable)",
+    )
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Measured runs per benchmark"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Run fewer iterations, as a smoke test"
+    )
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="Compare against a results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown reported as a regression with --compare (default: 0.1)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the benchmarks and exit"
+    )
+    args = parser.parse_args(argv)
+
+    selected = [
+        bench
+        for name, bench in BENCHMARKS.items()
+        if not args.filter or any(f in name for f in args.filter)
+    ]
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return 0
+    if not selected:
+        parser.error("No benchmarks match the filter")
+
+    # aiomqtt logs each connection the reconnect storm drops as an error
+    logging.getLogger("mqtt").setLevel(logging.CRITICAL)
+    results = asyncio.run(
+        run(selected, repeat=args.repeat, quick=args.quick, progress=_print_result)
+    )
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as file:
+        baseline = json.load(file)
+    rows = compare(baseline, report, args.threshold)
+    print()
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<40} {row['change']:>+8.1%}{flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Benchmark registry, runner and JSON results."""
+
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+import platform
+import statistics
+import subprocess
+from typing import Any
+
+# A benchmark runs its operation ``iterations`` times and returns the
+# seconds the measured part took (setup and teardown excluded)
+BenchmarkFunc = Callable[[int], Awaitable[float]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A registered benchmark.
+
+    Attributes:
+        name: Unique name, e.g. "micro.mqtt_dispatch".
+        func: Runs the operation a number of times and returns seconds taken.
+        iterations: Operations per repeat.
+        quick_iterations: Operations per repeat with ``--quick``.
+        unit: What one operation is, e.g. "message" or "request".
+    """
+
+    name: str
+    func: BenchmarkFunc
+    iterations: int
+    quick_iterations: int
+    unit: str = "op"
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, iterations: int, quick_iterations: int | None = None, unit: str = "op"
+) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """Register an async benchmark function under ``name``."""
+
+    def register(func: BenchmarkFunc) -> BenchmarkFunc:
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark '{name}'")
+        BENCHMARKS[name] = Benchmark(
+            name,
+            func,
+            iterations,
+            quick_iterations if quick_iterations is not None else iterations,
+            unit,
+        )
+        return func
+
+    return register
+
+
+def summarize(
+    bench: Benchmark, iterations: int, timings: list[float]
+) -> dict[str, Any]:
+    """Return the result record for the repeat timings of a benchmark.
+
+    ``per_op`` and ``ops_per_sec`` use the median repeat, which is the
+    figure compared between runs.
+    """
+    median = statistics.median(timings)
+    return {
+        "unit": bench.unit,
+        "iterations": iterations,
+        "repeat": len(timings),
+        "timings": timings,
+        "min": min(timings),
+        "median": median,
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "per_op": median / iterations,
+        "ops_per_sec": iterations / median if median > 0 else None,
+    }
+
+
+async def run(
+    benchmarks: Iterable[Benchmark],
+    repeat: int = 5,
+    quick: bool = False,
+    progress: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Run each benchmark ``repeat`` times and return results by name.
+
+    A warm-up run precedes the measured repeats.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    for bench in benchmarks:
+        iterations = bench.quick_iterations if quick else bench.iterations
+        await bench.func(iterations)
+        timings = [await bench.func(iterations) for _ in range(repeat)]
+        results[bench.name] = summarize(bench, iterations, timings)
+        if progress is not None:
+            progress(bench.name, results[bench.name])
+    return results
+
+
+def environment() -> dict[str, Any]:
+    """Describe the library version and machine the results come from."""
+    try:
+        version: str | None = metadata.version("olarmflowclient")
+    except metadata.PackageNotFoundError:
+        version = None
+    try:
+        commit: str | None = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "olarmflowclient": version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """Compare the ``per_op`` medians of two result files.
+
+    Returns one row per benchmark present in both, with ``change`` as the
+    relative change in time per operation (positive is slower) and
+    ``regression`` set when it exceeds ``threshold``.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before["per_op"]:
+            continue
+        change = result["per_op"] / before["per_op"] - 1
+        rows.append(
+            {
+                "name": name,
+                "baseline": before["per_op"],
+                "current": result["per_op"],
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
@@ -0,0 +1,95 @@
+"""Macrobenchmarks of whole client operations against the local fake servers."""
+
+import asyncio
+import time
+from typing import Any
+
+from olarmflowclient import BulkAction, OlarmFlowClient
+from olarmflowclient.testing import FakeMqttBroker, FakeOlarmApi
+
+from .harness import benchmark
+
+# Simulated API round trip, so concurrency is exercised as against the
+# real service
+API_LATENCY = 0.005
+CONCURRENCY = 100
+# Topics subscribed by the reconnect storm benchmark
+STORM_TOPICS = 10_000
+
+
+@benchmark(
+    "macro.get_device_concurrent",
+    iterations=2_000,
+    quick_iterations=200,
+    unit="request",
+)
+async def get_device_concurrent(iterations: int) -> float:
+    """Fetch devices with CONCURRENCY get_device() calls in flight."""
+    async with FakeOlarmApi(devices=100, latency=API_LATENCY) as api:
+        async with OlarmFlowClient("token", base_url=api.url) as client:
+            device_ids = list(api.devices)
+            ids = (device_ids[n % len(device_ids)] for n in range(iterations))
+            start = time.perf_counter()
+            async for _, result in client.get_devices_by_id(ids, CONCURRENCY):
+                assert isinstance(result, dict)
+            return time.perf_counter() - start
+
+
+@benchmark("macro.bulk_actions", iterations=2_000, quick_iterations=200, unit="action")
+async def bulk_actions(iterations: int) -> float:
+    """Send area commands with send_bulk_actions() at CONCURRENCY."""
+    async with FakeOlarmApi(devices=100, latency=API_LATENCY) as api:
+        async with OlarmFlowClient("token", base_url=api.url) as client:
+            device_ids = list(api.devices)
+            actions = [
+                BulkAction(device_ids[n % len(device_ids)], "area-arm", n % 2 + 1)
+                for n in range(iterations)
+            ]
+            start = time.perf_counter()
+            summary = await client.send_bulk_actions(actions, CONCURRENCY)
+            elapsed = time.perf_counter() - start
+            assert not summary.failed
+            return elapsed
+
+
+@benchmark("macro.mqtt_reconnect_storm", iterations=1, unit="reconnect")
+async def mqtt_reconnect_storm(iterations: int) -> float:
+    """Reconnect and re-subscribe STORM_TOPICS topics after a broker drop.
+
+    Times each reconnect from the client starting to connect until it
+    reports connected with every topic subscribed again, so the client's
+    reconnect backoff is not included.
+    """
+    async with FakeMqttBroker() as broker:
+        client = OlarmFlowClient(
+            "token", mqtt_host=broker.host, mqtt_port=broker.port, mqtt_tls=False
+        )
+        for n in range(STORM_TOPICS):
+            client.subscribe_to_device(f"device-{n:05d}", _ignore)
+        statuses: asyncio.Queue[tuple[str, float]] = asyncio.Queue()
+        client.set_mqtt_status_callback(
+            lambda status, info: statuses.put_nowait((status, time.perf_counter()))
+        )
+        await client.start_mqtt_async("user", timeout=60)
+        elapsed = 0.0
+        try:
+            for _ in range(iterations):
+                while not statuses.empty():
+                    statuses.get_nowait()
+                await broker.disconnect_clients()
+                connecting_at = None
+                while True:
+                    status, at = await asyncio.wait_for(statuses.get(), 60)
+                    if status == "connecting":
+                        connecting_at = at
+                    elif status == "connected" and connecting_at is not None:
+                        elapsed += at - connecting_at
+                        break
+                assert broker.stats()["subscriptions"] == STORM_TOPICS
+        finally:
+            client.stop_mqtt()
+        return elapsed
+
+
+def _ignore(topic: str, data: dict[str, Any]) -> None:
+    pass
@@ -0,0 +1,128 @@
+"""Microbenchmarks of single client code paths, without network I/O."""
+
+import json
+import time
+from typing import Any
+
+from olarmflowclient import OlarmFlowClient, OlarmFlowClientApiError
+from olarmflowclient.testing import fake_device
+
+from .harness import benchmark
+
+DEVICE_ID = "device-00001"
+DEVICE_PAYLOAD = json.dumps(fake_device(1)).encode()
+DEVICE_PAGE = json.dumps(
+    {"userId": "user", "data": [fake_device(n) for n in range(1, 101)]}
+).encode()
+
+
+@benchmark(
+    "micro.mqtt_dispatch", iterations=50_000, quick_iterations=2_000, unit="message"
+)
+async def mqtt_dispatch(iterations: int) -> float:
+    """Decode a device state message and run its callback."""
+    client = OlarmFlowClient("token")
+    received = 0
+
+    def callback(topic: str, data: dict[str, Any]) -> None:
+        nonlocal received
+        received += 1
+
+    topic = f"v4/devices/{DEVICE_ID}"
+    client._mqtt_callbacks[topic] = callback
+    dispatch = client._mqtt_dispatch
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dispatch(topic, DEVICE_PAYLOAD)
+    elapsed = time.perf_counter() - start
+    assert received == iterations
+    return elapsed
+
+
+@benchmark(
+    "micro.mqtt_dispatch_unsubscribed",
+    iterations=200_000,
+    quick_iterations=2_000,
+    unit="message",
+)
+async def mqtt_dispatch_unsubscribed(iterations: int) -> float:
+    """Drop a message for a topic without a callback."""
+    client = OlarmFlowClient("token")
+    dispatch = client._mqtt_dispatch
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dispatch("v4/devices/other", DEVICE_PAYLOAD)
+    return time.perf_counter() - start
+
+
+@benchmark(
+    "micro.api_request_build", iterations=50_000, quick_iterations=2_000, unit="request"
+)
+async def api_request_build(iterations: int) -> float:
+    """Build the URL, headers and JSON body of an action request."""
+    client = OlarmFlowClient("token")
+    codec = client._json
+    params = {"deviceApiAccessOnly": "1", "search": None}
+    body = {"actionCmd": "area-arm", "actionNum": 1}
+    endpoint = f"/api/v4/devices/{DEVICE_ID}/actions"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client._api_url(endpoint, params)
+        client._api_headers()
+        codec.dumps(body)
+    return time.perf_counter() - start
+
+
+@benchmark(
+    "micro.api_response_parse", iterations=2_000, quick_iterations=100, unit="page"
+)
+async def api_response_parse(iterations: int) -> float:
+    """Decode a 100-device get_devices() page."""
+    codec = OlarmFlowClient("token")._json
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.loads(DEVICE_PAGE)
+    return time.perf_counter() - start
+
+
+class _ErrorResponse:
+    """The parts of an aiohttp response read when building an API error."""
+
+    status = 429
+    headers = {"Retry-After": "2", "X-Olarm-Req-Id": "req-1"}
+
+    async def text(self) -> str:
+        return '{"error": "rateLimited", "message": "Too many requests"}'
+
+
+@benchmark(
+    "micro.api_error_parse", iterations=20_000, quick_iterations=1_000, unit="response"
+)
+async def api_error_parse(iterations: int) -> float:
+    """Build the API error for a 429 response from its headers and body."""
+    client = OlarmFlowClient("token")
+    response: Any = _ErrorResponse()
+    endpoint = f"/api/v4/devices/{DEVICE_ID}"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await client._api_response_error(response, "GET", endpoint)
+    return time.perf_counter() - start
+
+
+@benchmark(
+    "micro.handle_api_error", iterations=50_000, quick_iterations=2_000, unit="error"
+)
+async def handle_api_error(iterations: int) -> float:
+    """Map API errors of each common status to their specific exceptions."""
+    client = OlarmFlowClient("token")
+    errors = [
+        OlarmFlowClientApiError("Request failed", status_code=status)
+        for status in (401, 403, 429, 500, 503, 418)
+    ]
+    start = time.perf_counter()
+    for index in range(iterations):
+        try:
+            client._handle_api_error(errors[index % len(errors)])
+        except OlarmFlowClientApiError:
+            pass
+    return time.perf_counter() - start
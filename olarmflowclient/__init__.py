@@ -1,7 +1,20 @@
 """OlarmFlowClient - An async Python client for connecting to Olarm services."""
 
+from .actions import (
+    ActionScheduler,
+    BulkAction,
+    BulkActionResult,
+    BulkActionSummary,
+)
+from .cache import ResponseCache
+from .circuit import CircuitBreaker, CircuitPermit
+from .codec import JsonCodec, get_codec
 from .const import ZonesTypes
+from .hedging import HedgingPolicy
+from .metrics import ApiMetrics, RequestSample
 from .olarmflowclient import (
+    ActionNotConfirmed,
+    CircuitOpen,
     OlarmFlowClientApiError,
     OlarmFlowClientConnectionError,
     TokenExpired,
@@ -9,6 +22,7 @@ from .olarmflowclient import (
     DeviceNotFound,
     DevicesNotFound,
     RateLimited,
+    RequestTimeout,
     ServerError,
     ServiceUnavailable,
     MqttAuthError,
@@ -16,6 +30,11 @@ from .olarmflowclient import (
     MqttTimeoutError,
     OlarmFlowClient,
 )
+from .priority import PriorityScheduler
+from .ratelimit import AdaptiveRateLimiter
+from .retry import RetryPolicy
+from .sync import CursorStore, DeviceSyncStatus, EventSync, SqliteCursorStore
+from .tracing import OpenTelemetryTracer, Span, Tracer
 
 __all__ = [
     "OlarmFlowClientApiError",
@@ -30,6 +49,31 @@ __all__ = [
     "MqttAuthError",
     "MqttConnectError",
     "MqttTimeoutError",
+    "ActionNotConfirmed",
+    "CircuitOpen",
+    "RequestTimeout",
     "OlarmFlowClient",
+    "AdaptiveRateLimiter",
+    "RetryPolicy",
+    "ResponseCache",
+    "CircuitBreaker",
+    "CircuitPermit",
+    "PriorityScheduler",
+    "HedgingPolicy",
+    "JsonCodec",
+    "get_codec",
+    "CursorStore",
+    "DeviceSyncStatus",
+    "EventSync",
+    "SqliteCursorStore",
+    "BulkAction",
+    "BulkActionResult",
+    "BulkActionSummary",
+    "ActionScheduler",
+    "ApiMetrics",
+    "RequestSample",
+    "Tracer",
+    "Span",
+    "OpenTelemetryTracer",
     "ZonesTypes",
 ]
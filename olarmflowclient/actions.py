@@ -0,0 +1,201 @@
+"""Bulk dispatch and per-device ordering of device actions."""
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Callable, Coroutine, Hashable
+import contextvars
+from dataclasses import dataclass, field
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BulkAction:
+    """One action command to send as part of a bulk dispatch.
+
+    Attributes:
+        device_id: Target device.
+        action_cmd: Action command, e.g. "area-arm" or "zone-bypass".
+        action_num: Area, zone, PGM or output number the command applies to.
+        prolink_id: Olarm LINK id for LINK output/relay commands.
+    """
+
+    device_id: str
+    action_cmd: str
+    action_num: int
+    prolink_id: str | None = None
+
+
+@dataclass
+class BulkActionResult:
+    """Outcome of one action in a bulk dispatch.
+
+    Attributes:
+        action: The action that was sent.
+        success: True if the API accepted the action.
+        response: The API response on success.
+        error: The exception raised on failure.
+        latency: Seconds from sending the action to its outcome.
+    """
+
+    action: BulkAction
+    success: bool
+    response: dict[str, Any] | None = None
+    error: Exception | None = None
+    latency: float = 0.0
+
+    @property
+    def error_class(self) -> str | None:
+        """Name of the exception class on failure, e.g. "RateLimited"."""
+        return type(self.error).__name__ if self.error is not None else None
+
+
+@dataclass
+class BulkActionSummary:
+    """Aggregated outcome of a bulk dispatch, in the order actions were given."""
+
+    results: list[BulkActionResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> list[BulkActionResult]:
+        """Results of the actions that were accepted."""
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> list[BulkActionResult]:
+        """Results of the actions that failed."""
+        return [result for result in self.results if not result.success]
+
+    def error_counts(self) -> dict[str, int]:
+        """Return the number of failures per exception class name."""
+        return dict(
+            Counter(result.error_class for result in self.results if result.error_class)
+        )
+
+
+@dataclass(eq=False)
+class _QueuedAction:
+    key: Hashable
+    send: Callable[[], Coroutine[Any, Any, dict[str, Any]]]
+    future: "asyncio.Future[dict[str, Any]]"
+    # The submitter's context (deadline, lane), which the send runs in
+    context: contextvars.Context
+    # Callers waiting for the outcome (more than one once coalesced)
+    waiters: int = 1
+
+
+class ActionScheduler:
+    """Runs actions in order per device and in parallel across devices.
+
+    Each device has its own FIFO queue drained by a worker task that exists
+    only while the queue is non-empty, so a zone bypass queued before an
+    area arm is always applied first while other devices proceed
+    independently. An action identical to the one queued just before it
+    (and not yet started) is coalesced: both callers share one request.
+
+    Each action is sent in a copy of its submitter's context, so context
+    variables such as the request deadline apply to that action alone. An
+    action whose callers all gave up (were cancelled) before it started is
+    dropped from the queue and never sent.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._queues: dict[str, deque[_QueuedAction]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self._running: set[str] = set()
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of submitted actions merged into an identical queued one."""
+        return self._coalesced
+
+    def queue_depth(self, device_id: str) -> int:
+        """Return the number of queued and running actions for a device."""
+        queue = self._queues.get(device_id)
+        return (len(queue) if queue else 0) + (device_id in self._running)
+
+    def queue_depths(self) -> dict[str, int]:
+        """Return the queue depth of every device with pending actions."""
+        devices = set(self._queues) | self._running
+        return {device_id: self.queue_depth(device_id) for device_id in devices}
+
+    async def submit(
+        self,
+        device_id: str,
+        key: Hashable,
+        send: Callable[[], Coroutine[Any, Any, dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Queue an action for a device and wait for its response.
+
+        ``key`` identifies the command (e.g. command, number and LINK id)
+        for coalescing; ``send`` performs the request when its turn comes.
+        """
+        queue = self._queues.setdefault(device_id, deque())
+        if queue and queue[-1].key == key:
+            self._coalesced += 1
+            _LOGGER.debug("API: coalesced queued action %s for %s", key, device_id)
+            queue[-1].waiters += 1
+            return await self._wait(device_id, queue[-1])
+
+        loop = asyncio.get_running_loop()
+        item = _QueuedAction(
+            key, send, loop.create_future(), contextvars.copy_context()
+        )
+        # Mark the exception retrieved even if the caller went away
+        item.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        queue.append(item)
+        if device_id not in self._workers:
+            self._workers[device_id] = loop.create_task(self._drain(device_id))
+        return await self._wait(device_id, item)
+
+    async def _wait(self, device_id: str, item: _QueuedAction) -> dict[str, Any]:
+        """Wait for a queued action's outcome on behalf of one caller."""
+        try:
+            # Shield so a cancelled caller doesn't cancel an action others
+            # share or that is already being sent
+            return await asyncio.shield(item.future)
+        except asyncio.CancelledError:
+            item.waiters -= 1
+            queue = self._queues.get(device_id)
+            if item.waiters == 0 and queue is not None and item in queue:
+                # Not started and nobody wants it any more: never send it
+                _LOGGER.debug(
+                    "API: dropped cancelled action %s for %s", item.key, device_id
+                )
+                queue.remove(item)
+                item.future.cancel()
+            raise
+
+    async def _drain(self, device_id: str) -> None:
+        queue = self._queues[device_id]
+        loop = asyncio.get_running_loop()
+        try:
+            while queue:
+                item = queue.popleft()
+                self._running.add(device_id)
+                try:
+                    # A task created inside the context runs in a copy of it
+                    result = await item.context.run(loop.create_task, item.send())
+                except asyncio.CancelledError:
+                    item.future.cancel()
+                    raise
+                except Exception as err:  # noqa: BLE001
+                    item.future.set_exception(err)
+                else:
+                    item.future.set_result(result)
+                finally:
+                    self._running.discard(device_id)
+        except asyncio.CancelledError:
+            # Don't leave callers waiting on actions that will never run
+            for pending in queue:
+                pending.future.cancel()
+            queue.clear()
+            raise
+        finally:
+            del self._workers[device_id]
+            if not queue:
+                del self._queues[device_id]
@@ -0,0 +1,139 @@
+"""In-memory response cache for Olarm REST API reads."""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+import time
+from typing import Any
+
+
+class ResponseCache:
+    """TTL + LRU cache for API responses with tag-based invalidation.
+
+    Entries expire ``ttl`` seconds after they were stored (never, if ttl is
+    None) and the least recently used entry is evicted once ``max_entries``
+    is reached. Each entry can carry tags, e.g. the ids of the devices it
+    contains, so everything mentioning a device can be dropped at once with
+    invalidate_tag().
+
+    A response that was requested before an invalidation but arrives after
+    it must not be stored: read ``generation`` before the request and pass
+    it to set() as ``since``.
+    """
+
+    def __init__(self, ttl: float | None = 30.0, max_entries: int = 1024) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[
+            Hashable, tuple[float | None, Any, tuple[Hashable, ...]]
+        ] = OrderedDict()
+        self._tags: dict[Hashable, set[Hashable]] = {}
+        # Bumped by every invalidate_tag(); the value at each tag's last one
+        self._generation = 0
+        self._tag_generations: dict[Hashable, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored entries (including expired ones)."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    @property
+    def generation(self) -> int:
+        """Counter advanced by every invalidate_tag(), for set(since=...)."""
+        return self._generation
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Hashable] = (),
+        since: int | None = None,
+    ) -> bool:
+        """Store ``value`` under ``key``, evicting the LRU entry if full.
+
+        With ``since`` (a ``generation`` read before ``value`` was fetched),
+        the value is not stored if any of its tags was invalidated after
+        that, as it may predate the change. Returns True if it was stored.
+        """
+        entry_tags = tuple(tags)
+        if since is not None and any(
+            self._tag_generations.get(tag, 0) > since for tag in entry_tags
+        ):
+            return False
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        self._entries[key] = (expires_at, value, entry_tags)
+        for tag in entry_tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+        return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop one entry; return True if it was present."""
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        self._invalidations += 1
+        return True
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Drop every entry carrying ``tag``; return how many were dropped."""
+        self._generation += 1
+        self._tag_generations[tag] = self._generation
+        keys = self._tags.get(tag)
+        if not keys:
+            return 0
+        count = 0
+        for key in list(keys):
+            count += self.invalidate(key)
+        return count
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit-rate and eviction statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
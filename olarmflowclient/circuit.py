@@ -0,0 +1,167 @@
+"""Circuit breaker for the Olarm REST API."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Literal
+
+_LOGGER = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass(frozen=True)
+class CircuitPermit:
+    """Permission to send one request, returned by allow_request().
+
+    Attributes:
+        probe: Whether the request was let through as a half-open probe.
+        generation: The breaker's state generation when it was admitted.
+    """
+
+    probe: bool
+    generation: int
+
+
+class CircuitBreaker:
+    """Stops sending requests while the API is failing, then probes it.
+
+    The circuit starts ``closed``. After ``failure_threshold`` consecutive
+    failures (gateway errors or connection failures) it opens and every
+    call fails fast for ``recovery_time`` seconds. It then turns
+    ``half_open`` and lets up to ``probe_requests`` calls through: if they
+    all succeed the circuit closes again, and if any fails it reopens.
+
+    Callers ask allow_request() before sending and report the outcome with
+    on_success(), on_failure() or, for calls that ended without an answer
+    (e.g. cancelled), on_abandoned(), passing back the permit it returned.
+    Only the outcomes of the current probes decide whether a half-open
+    circuit closes or reopens; requests admitted earlier that finish late
+    don't count.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        probe_requests: int = 1,
+        on_state_change: Callable[[CircuitState, dict[str, Any]], None] | None = None,
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_time: Seconds the circuit stays open before probing.
+            probe_requests: Calls let through (and needed to succeed) while
+                half-open.
+            on_state_change: Called with the new state and an info dict on
+                every transition.
+        """
+        self._failure_threshold = failure_threshold
+        self._recovery_time = recovery_time
+        self._probe_requests = probe_requests
+        self.on_state_change = on_state_change
+        self._state: CircuitState = "closed"
+        self._generation = 0
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an open circuit reports half_open once it may probe."""
+        if self._state == "open" and self.retry_after == 0:
+            return "half_open"
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets probe requests through."""
+        if self._state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self._recovery_time - time.monotonic())
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures counted towards opening the circuit."""
+        return self._failures
+
+    def allow_request(self) -> CircuitPermit | None:
+        """Return a permit if a request may be sent now, else None.
+
+        A permit given while half-open claims one of the probe slots, so it
+        must be followed by exactly one outcome report.
+        """
+        if self._state == "closed":
+            return CircuitPermit(False, self._generation)
+        if self._state == "open":
+            if self.retry_after > 0:
+                return None
+            self._transition("half_open")
+        if self._probes_in_flight + self._probe_successes >= self._probe_requests:
+            return None
+        self._probes_in_flight += 1
+        return CircuitPermit(True, self._generation)
+
+    def on_success(self, permit: CircuitPermit | None = None) -> None:
+        """Report a request that got an answer from the API."""
+        self._failures = 0
+        if not self._is_current_probe(permit):
+            return
+        self._probes_in_flight -= 1
+        self._probe_successes += 1
+        if self._probe_successes >= self._probe_requests:
+            self._transition("closed")
+
+    def on_failure(self, permit: CircuitPermit | None = None) -> None:
+        """Report a request that failed because the API is unavailable."""
+        self._failures += 1
+        if self._is_current_probe(permit):
+            self._probes_in_flight -= 1
+            self._open()
+        elif self._state == "closed" and self._failures >= self._failure_threshold:
+            self._open()
+
+    def on_abandoned(self, permit: CircuitPermit | None = None) -> None:
+        """Report a request that ended without an outcome, freeing its slot."""
+        if self._is_current_probe(permit):
+            self._probes_in_flight -= 1
+
+    def _is_current_probe(self, permit: CircuitPermit | None) -> bool:
+        """Return True if ``permit`` is a probe of the current half-open state."""
+        return (
+            permit is not None
+            and permit.probe
+            and permit.generation == self._generation
+            and self._state == "half_open"
+        )
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self._failures = 0
+        if self._state != "closed":
+            self._transition("closed")
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._transition("open")
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        self._generation += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        _LOGGER.debug(
+            "API: circuit %s (failures=%d)", state.replace("_", "-"), self._failures
+        )
+        if self.on_state_change is None:
+            return
+        info: dict[str, Any] = {"failures": self._failures}
+        if state == "open":
+            info["retry_after"] = self._recovery_time
+        try:
+            self.on_state_change(state, info)
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("API: circuit state callback raised (state=%s)", state)
@@ -0,0 +1,105 @@
+"""JSON codecs for REST bodies and MQTT payloads.
+
+orjson and msgspec are optional; get_codec() picks the fastest one that is
+installed and falls back to the standard library.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+
+class JsonCodec:
+    """Standard library JSON codec.
+
+    ``loads`` accepts bytes directly (no intermediate ``str``) and raises
+    ValueError for malformed input; ``dumps`` returns compact UTF-8 bytes.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode a JSON document."""
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object as JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Initialize the codec."""
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode a JSON document."""
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object as JSON bytes."""
+        return orjson.dumps(obj)  # type: ignore[no-any-return]
+
+
+class MsgspecCodec(JsonCodec):
+    """JSON codec backed by msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """Initialize the codec."""
+        if msgspec is None:
+            raise RuntimeError("msgspec is not installed")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode a JSON document."""
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as err:
+            # Normalise to ValueError like the other codecs
+            raise ValueError(str(err)) from err
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object as JSON bytes."""
+        return self._encoder.encode(obj)  # type: ignore[no-any-return]
+
+
+_CODECS: dict[str, type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(name: str | None = None) -> JsonCodec:
+    """Return a JSON codec by name ("orjson", "msgspec" or "json").
+
+    Without a name, the fastest installed codec is returned.
+    """
+    if name is not None:
+        if name not in _CODECS:
+            raise ValueError(f"Unknown JSON codec '{name}'")
+        return _CODECS[name]()
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JsonCodec()
@@ -3,11 +3,24 @@
 from enum import IntEnum
 
 BASE_URL = "https://api.olarm.com"
+API_CONNECTOR_LIMIT = 100  # Total simultaneous connections in the pool
+API_CONNECTOR_LIMIT_PER_HOST = 0  # 0 = no per-host cap beyond the total
+API_KEEPALIVE_TIMEOUT = 30.0  # Seconds an idle pooled connection is kept open
+API_DNS_CACHE_TTL = 300  # Seconds resolved API addresses are cached
+API_CONNECT_TIMEOUT = 10.0  # Seconds to open a connection (DNS, TCP, TLS)
+API_READ_TIMEOUT = 30.0  # Seconds to wait for the response or the next chunk
+API_REQUEST_TIMEOUT = 60.0  # Seconds for one call, including retries
+API_WARM_UP_TIMEOUT = 10.0  # Seconds allowed for each pre-warmed connection
+API_VALIDATOR_CACHE_SIZE = 256  # URLs whose ETag/Last-Modified and body are kept
+# Event fields used to page through device event history
+EVENTS_CURSOR_FIELD = "eventId"  # Passed back as the ``after`` cursor
+EVENTS_TIMESTAMP_FIELD = "eventTs"
 MQTT_HOST = "mqtt-pubapi.olarm.com"
 MQTT_PORT = 443
 MQTT_USER = "public-api-user-v1"
 MQTT_KEEPALIVE = 30
-MQTT_RETRIES_BEFORE_DISCONNECT = 3 # Consecutive retry failures before flagging as disconnected
+# Consecutive retry failures before flagging as disconnected
+MQTT_RETRIES_BEFORE_DISCONNECT = 3
 MQTT_RECONNECT_BACKOFF_MIN = 4.0
 MQTT_RECONNECT_BACKOFF_MAX = 60.0
 
@@ -0,0 +1,48 @@
+"""Deadlines bounding the total time spent on REST calls."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+_deadline: ContextVar[float | None] = ContextVar(
+    "olarmflowclient_deadline", default=None
+)
+
+
+@contextmanager
+def request_deadline(timeout: float) -> Iterator[None]:
+    """Finish the REST calls made inside the block within ``timeout`` seconds.
+
+    The deadline covers every attempt, retry delay and queue wait of the
+    calls, and is inherited by tasks started inside the block. A nested
+    deadline can only shorten the outer one.
+    """
+    deadline = time.monotonic() + timeout
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the block without any deadline.
+
+    Used to start a task shared by several callers, each of which applies
+    its own deadline while waiting for it.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    """Return the active deadline (a time.monotonic() value), if any."""
+    return _deadline.get()
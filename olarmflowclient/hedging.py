@@ -0,0 +1,106 @@
+"""Hedged reads: duplicate slow requests to cut tail latency."""
+
+from collections import deque
+from typing import Any
+
+
+class HedgingPolicy:
+    """Decides when a slow read is duplicated and caps how often.
+
+    A read that has not answered after the hedge delay is sent again and the
+    first answer wins. The delay tracks the ``quantile`` (p95 by default)
+    of the recent latencies of the same endpoint, so only reads slower than
+    usual are hedged; until ``min_samples`` latencies are known
+    ``initial_delay`` is used. Hedges are limited to ``max_ratio`` of all
+    hedgeable reads so they can't eat much of the rate budget.
+    """
+
+    def __init__(
+        self,
+        max_ratio: float = 0.05,
+        quantile: float = 0.95,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.02,
+        max_delay: float = 5.0,
+        window: int = 256,
+        min_samples: int = 20,
+        max_page_length: int = 50,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            max_ratio: Maximum hedges as a fraction of hedgeable reads.
+            quantile: Latency quantile used as the hedge delay.
+            initial_delay: Hedge delay in seconds before enough samples.
+            min_delay: Lower bound for the hedge delay in seconds.
+            max_delay: Upper bound for the hedge delay in seconds.
+            window: Recent latencies kept per endpoint.
+            min_samples: Latencies needed before the quantile is used.
+            max_page_length: Largest get_devices() page that is hedged.
+        """
+        self.max_ratio = max_ratio
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.max_page_length = max_page_length
+        self._latencies: dict[str, deque[float]] = {}
+        # Cached hedge delay per endpoint, dropped when a latency is added
+        self._delays: dict[str, float] = {}
+        self._requests = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    def delay(self, endpoint: str) -> float:
+        """Return the seconds to wait for a read before hedging it."""
+        delay = self._delays.get(endpoint)
+        if delay is not None:
+            return delay
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            ordered = sorted(latencies)
+            delay = ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+        delay = min(self.max_delay, max(self.min_delay, delay))
+        self._delays[endpoint] = delay
+        return delay
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        """Record how long a read of ``endpoint`` took."""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = deque(maxlen=self.window)
+        latencies.append(latency)
+        self._delays.pop(endpoint, None)
+
+    def on_request(self) -> None:
+        """Count a hedgeable read."""
+        self._requests += 1
+
+    def try_hedge(self) -> bool:
+        """Return True, and count the hedge, if the budget allows one more."""
+        if self._hedges + 1 > self.max_ratio * self._requests:
+            return False
+        self._hedges += 1
+        return True
+
+    def on_hedge_won(self) -> None:
+        """Count a hedge that answered before the original read."""
+        self._hedge_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return hedging statistics.
+
+        ``hedge_wins`` counts hedges that answered first, i.e. reads whose
+        latency hedging actually cut.
+        """
+        return {
+            "requests": self._requests,
+            "hedges": self._hedges,
+            "hedge_ratio": self._hedges / self._requests if self._requests else 0.0,
+            "hedge_wins": self._hedge_wins,
+            "delays": {endpoint: self.delay(endpoint) for endpoint in self._latencies},
+        }
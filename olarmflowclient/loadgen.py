@@ -0,0 +1,493 @@
+"""Synthetic load generator for sizing deployments of the client.
+
+Drives an OlarmFlowClient at a target request rate against any API host
+(and optionally MQTT broker), or against the local fakes with ``--fake``,
+and reports throughput, latency percentiles and errors::
+
+    python -m olarmflowclient.loadgen --fake --devices 500 --rate 200 \\
+        --mix get_device=70,get_device_events=20,action=10 --mqtt-rate 500
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any
+
+from .olarmflowclient import OlarmFlowClient
+from .retry import RetryPolicy
+
+OPERATIONS = ("get_device", "get_devices", "get_device_events", "action")
+DEFAULT_MIX = {"get_device": 80.0, "get_device_events": 10.0, "action": 10.0}
+DEFAULT_ACTIONS = {"area-arm": 1.0, "area-disarm": 1.0}
+# Client method sending each action command the ``action`` operation can use
+ACTION_METHODS = {
+    "area-arm": "send_device_area_arm",
+    "area-disarm": "send_device_area_disarm",
+    "area-stay": "send_device_area_stay",
+    "area-sleep": "send_device_area_sleep",
+    "zone-bypass": "send_device_zone_bypass",
+    "zone-unbypass": "send_device_zone_unbypass",
+    "pgm-open": "send_device_pgm_open",
+    "pgm-close": "send_device_pgm_close",
+    "pgm-pulse": "send_device_pgm_pulse",
+    "ukey-activate": "send_device_ukey_activate",
+}
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_weights(text: str, allowed: Sequence[str] | None = None) -> dict[str, float]:
+    """Parse ``"name=weight,name=weight"`` into a dict of positive weights.
+
+    A name without ``=weight`` has weight 1.
+
+    Raises:
+        ValueError: On an unknown name or a weight that isn't positive.
+    """
+    weights: dict[str, float] = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if allowed is not None and name not in allowed:
+            raise ValueError(f"Unknown name '{name}' (expected one of {allowed})")
+        weights[name] = float(weight) if weight else 1.0
+        if weights[name] <= 0:
+            raise ValueError(f"Weight of '{name}' must be positive")
+    return weights
+
+
+def percentile(ordered: Sequence[float], pct: float) -> float | None:
+    """Return the ``pct`` percentile of sorted values (nearest rank)."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class OperationStats:
+    """Outcomes of one kind of operation.
+
+    Attributes:
+        latencies: Seconds each successful call took.
+        errors: Failed calls by exception class name.
+    """
+
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        """Return counts, throughput and latency percentiles in milliseconds."""
+        ordered = sorted(self.latencies)
+        failed = sum(self.errors.values())
+        summary: dict[str, Any] = {
+            "count": len(ordered) + failed,
+            "ok": len(ordered),
+            "failed": failed,
+            "rate": (len(ordered) + failed) / elapsed if elapsed else 0.0,
+            "errors": dict(self.errors),
+        }
+        for pct in PERCENTILES:
+            value = percentile(ordered, pct)
+            summary[f"p{pct}_ms"] = value * 1000 if value is not None else None
+        summary["max_ms"] = ordered[-1] * 1000 if ordered else None
+        return summary
+
+
+class LoadGenerator:
+    """Issues a weighted mix of REST calls at a fixed rate.
+
+    Calls are started on an open-loop schedule: one every ``1 / rate``
+    seconds whether or not earlier calls have finished, as independent
+    users would. At most ``concurrency`` calls are in flight; a call due
+    while that many are outstanding is skipped and counted, which shows the
+    client (or API) can't sustain the rate.
+    """
+
+    def __init__(
+        self,
+        client: OlarmFlowClient,
+        device_ids: Sequence[str],
+        rate: float,
+        concurrency: int = 100,
+        mix: dict[str, float] | None = None,
+        actions: dict[str, float] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the generator.
+
+        Args:
+            client: Client to drive.
+            device_ids: Devices the calls are spread over.
+            rate: Target calls per second; 0 sends none (MQTT only).
+            concurrency: Maximum calls in flight.
+            mix: Relative weight of each operation in OPERATIONS.
+            actions: Relative weight of each action command in
+                ACTION_METHODS sent by the ``action`` operation (always for
+                area/number 1).
+            seed: Seed for choosing operations and devices.
+
+        Raises:
+            ValueError: If there are no devices or an action is unknown.
+        """
+        if not device_ids:
+            raise ValueError("At least one device is needed")
+        for action in actions or ():
+            if action not in ACTION_METHODS:
+                raise ValueError(f"Unknown action '{action}'")
+        self._client = client
+        self._device_ids = list(device_ids)
+        self._rate = rate
+        self._concurrency = concurrency
+        self._mix = mix or DEFAULT_MIX
+        self._actions = actions or DEFAULT_ACTIONS
+        self._random = random.Random(seed)
+        self._stats: dict[str, OperationStats] = {}
+        self._in_flight: set[asyncio.Task[None]] = set()
+        self._skipped = 0
+        self._mqtt_messages = 0
+        self._mqtt_statuses: Counter[str] = Counter()
+
+    def subscribe(self) -> None:
+        """Count the MQTT messages of every device (call before starting MQTT)."""
+        self._client.set_mqtt_status_callback(
+            lambda status, info: self._mqtt_statuses.update((status,))
+        )
+        for device_id in self._device_ids:
+            self._client.subscribe_to_device(device_id, self._on_message)
+
+    def reset(self) -> None:
+        """Forget the outcomes so far, e.g. after a warm-up run."""
+        self._stats.clear()
+        self._skipped = 0
+        self._mqtt_statuses.clear()
+
+    def _on_message(self, topic: str, data: dict[str, Any]) -> None:
+        self._mqtt_messages += 1
+
+    def _operation(self) -> tuple[str, Callable[[], Awaitable[Any]]]:
+        name = self._random.choices(list(self._mix), list(self._mix.values()))[0]
+        device_id = self._random.choice(self._device_ids)
+        client = self._client
+        if name == "get_device":
+            return name, lambda: client.get_device(device_id)
+        if name == "get_devices":
+            return name, lambda: client.get_devices()
+        if name == "get_device_events":
+            return name, lambda: client.get_device_events(device_id, limit=50)
+        action = self._random.choices(
+            list(self._actions), list(self._actions.values())
+        )[0]
+        send = getattr(client, ACTION_METHODS[action])
+        return f"action:{action}", lambda: send(device_id, 1)
+
+    async def _call(self, name: str, call: Callable[[], Awaitable[Any]]) -> None:
+        stats = self._stats.setdefault(name, OperationStats())
+        start = time.perf_counter()
+        try:
+            await call()
+        except Exception as err:  # noqa: BLE001
+            # API and connection errors; the load goes on
+            stats.errors[type(err).__name__] += 1
+        else:
+            stats.latencies.append(time.perf_counter() - start)
+
+    async def run(self, duration: float) -> dict[str, Any]:
+        """Generate load for ``duration`` seconds and return the report.
+
+        Calls still in flight at the end are awaited and included.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = start + duration
+        messages_before = self._mqtt_messages
+        if self._rate > 0:
+            interval = 1 / self._rate
+            next_at = start
+            while next_at < end:
+                if len(self._in_flight) >= self._concurrency:
+                    self._skipped += 1
+                else:
+                    task = loop.create_task(self._call(*self._operation()))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._in_flight.discard)
+                next_at += interval
+                await asyncio.sleep(max(0.0, next_at - loop.time()))
+        else:
+            await asyncio.sleep(duration)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        return self._report(loop.time() - start, self._mqtt_messages - messages_before)
+
+    def _report(self, elapsed: float, mqtt_messages: int) -> dict[str, Any]:
+        total = OperationStats()
+        for stats in self._stats.values():
+            total.latencies.extend(stats.latencies)
+            total.errors.update(stats.errors)
+        return {
+            "duration": elapsed,
+            "target_rate": self._rate,
+            "skipped": self._skipped,
+            "total": total.summary(elapsed),
+            "operations": {
+                name: stats.summary(elapsed)
+                for name, stats in sorted(self._stats.items())
+            },
+            "mqtt": {
+                "messages": mqtt_messages,
+                "rate": mqtt_messages / elapsed if elapsed else 0.0,
+                "statuses": dict(self._mqtt_statuses),
+            },
+        }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Render a report as a text table."""
+
+    def ms(value: float | None) -> str:
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+    total = report["total"]
+    lines = [
+        f"Duration {report['duration']:.1f}s, target {report['target_rate']:g} req/s,"
+        f" achieved {total['rate']:.1f} req/s ({total['ok']} ok,"
+        f" {total['failed']} failed, {report['skipped']} skipped)",
+        "",
+        f"{'operation':<24}{'count':>8}{'req/s':>9}"
+        + "".join(f"{f'p{pct} ms':>9}" for pct in PERCENTILES)
+        + f"{'max ms':>9}",
+    ]
+    rows = {**report["operations"], "total": total}
+    for name, stats in rows.items():
+        lines.append(
+            f"{name:<24}{stats['count']:>8}{stats['rate']:>9.1f}"
+            + "".join(ms(stats[f"p{pct}_ms"]) for pct in PERCENTILES)
+            + ms(stats["max_ms"])
+        )
+    if total["errors"]:
+        lines.append("")
+        lines.append(
+            "Errors: "
+            + ", ".join(
+                f"{name} {count}"
+                for name, count in sorted(
+                    total["errors"].items(), key=lambda item: -item[1]
+                )
+            )
+        )
+    mqtt = report["mqtt"]
+    if mqtt["messages"] or mqtt["statuses"]:
+        lines.append("")
+        lines.append(
+            f"MQTT: {mqtt['messages']} messages, {mqtt['rate']:.1f} msg/s"
+            f" (connection events: {mqtt['statuses']})"
+        )
+    return "\n".join(lines)
+
+
+async def _device_ids(client: OlarmFlowClient, count: int) -> list[str]:
+    """Read up to ``count`` device ids from the API, a page at a time."""
+    device_ids: list[str] = []
+    page = 1
+    while len(device_ids) < count:
+        result = await client.get_devices(page=page, pageLength=100)
+        devices = result.get("data") or []
+        device_ids.extend(device["deviceId"] for device in devices)
+        if len(devices) < 100:
+            break
+        page += 1
+    return device_ids[:count]
+
+
+async def run_load(args: argparse.Namespace) -> dict[str, Any]:
+    """Set up the client (and fakes) described by ``args`` and run the load."""
+    async with AsyncExitStack() as stack:
+        base_url, mqtt_host, mqtt_port = args.base_url, args.mqtt_host, args.mqtt_port
+        mqtt_tls, user_id = not args.no_mqtt_tls, args.mqtt_user_id
+        if args.fake:
+            # Imported here so the fakes load only when used
+            from .testing import FakeMqttBroker, FakeOlarmApi
+
+            api = await stack.enter_async_context(
+                FakeOlarmApi(
+                    devices=args.devices,
+                    latency=args.fake_latency,
+                    rate_limit_ratio=args.fake_rate_limit_ratio,
+                    error_ratio=args.fake_error_ratio,
+                    seed=args.seed,
+                )
+            )
+            broker = await stack.enter_async_context(
+                FakeMqttBroker(
+                    api,
+                    publish_rate=args.mqtt_rate / args.devices,
+                    seed=args.seed,
+                )
+            )
+            base_url, mqtt_host, mqtt_port = api.url, broker.host, broker.port
+            mqtt_tls, user_id = False, user_id or "loadgen"
+
+        client = await stack.enter_async_context(
+            OlarmFlowClient(
+                args.api_token,
+                base_url=base_url,
+                mqtt_host=mqtt_host,
+                mqtt_port=mqtt_port,
+                mqtt_tls=mqtt_tls,
+                connector_limit=max(args.concurrency, 1),
+                retry_policy=None if args.no_retries else RetryPolicy(),
+            )
+        )
+        device_ids = args.device_id or await _device_ids(client, args.devices)
+        generator = LoadGenerator(
+            client,
+            device_ids,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            mix=args.mix,
+            actions=args.actions,
+            seed=args.seed,
+        )
+        if user_id is not None:
+            generator.subscribe()
+            await client.start_mqtt_async(user_id, "loadgen")
+            stack.callback(client.stop_mqtt)
+        if args.warm_up:
+            await generator.run(args.warm_up)
+            generator.reset()
+        return await generator.run(args.duration)
+
+
+def _weights(allowed: Sequence[str] | None) -> Callable[[str], dict[str, float]]:
+    def parse(text: str) -> dict[str, float]:
+        try:
+            return parse_weights(text, allowed)
+        except ValueError as err:
+            raise argparse.ArgumentTypeError(str(err)) from err
+
+    return parse
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m olarmflowclient.loadgen",
+        description="Drive an OlarmFlowClient at a target rate and report "
+        "throughput, latency percentiles and errors.",
+    )
+    target = parser.add_argument_group("target")
+    target.add_argument(
+        "--api-token",
+        default=os.environ.get("OLARM_API_TOKEN", "loadgen"),
+        help="Olarm API token (default: $OLARM_API_TOKEN)",
+    )
+    target.add_argument("--base-url", help="API base URL (default: Olarm API)")
+    target.add_argument("--mqtt-host", help="MQTT broker host (default: Olarm)")
+    target.add_argument("--mqtt-port", type=int, help="MQTT broker port")
+    target.add_argument(
+        "--no-mqtt-tls", action="store_true", help="Connect to MQTT without TLS"
+    )
+    target.add_argument(
+        "--mqtt-user-id",
+        help="Olarm user id; subscribes to every device and counts messages",
+    )
+    target.add_argument(
+        "--fake",
+        action="store_true",
+        help="Run against an in-process FakeOlarmApi and FakeMqttBroker",
+    )
+
+    load = parser.add_argument_group("load")
+    load.add_argument(
+        "--rate", type=float, default=10.0, help="REST calls per second (0 for none)"
+    )
+    load.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to generate load"
+    )
+    load.add_argument(
+        "--warm-up", type=float, default=0.0, help="Unreported seconds of load first"
+    )
+    load.add_argument(
+        "--concurrency", type=int, default=100, help="Maximum calls in flight"
+    )
+    load.add_argument(
+        "--devices",
+        type=_positive_int,
+        default=100,
+        help="Devices to spread calls over",
+    )
+    load.add_argument(
+        "--device-id",
+        action="append",
+        help="Use this device instead of listing devices (repeatable)",
+    )
+    load.add_argument(
+        "--mix",
+        type=_weights(OPERATIONS),
+        default=DEFAULT_MIX,
+        help="Operation weights, e.g. get_device=80,get_device_events=10,action=10",
+    )
+    load.add_argument(
+        "--actions",
+        type=_weights(tuple(ACTION_METHODS)),
+        default=DEFAULT_ACTIONS,
+        help="Action command weights, e.g. area-arm=1,area-disarm=1",
+    )
+    load.add_argument(
+        "--no-retries", action="store_true", help="Disable the client's retries"
+    )
+    load.add_argument("--seed", type=int, help="Random seed")
+
+    fake = parser.add_argument_group("fake servers (with --fake)")
+    fake.add_argument(
+        "--mqtt-rate",
+        type=float,
+        default=0.0,
+        help="MQTT state messages per second across all devices",
+    )
+    fake.add_argument(
+        "--fake-latency", type=float, default=0.0, help="Seconds added per request"
+    )
+    fake.add_argument(
+        "--fake-rate-limit-ratio",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429",
+    )
+    fake.add_argument(
+        "--fake-error-ratio",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with a 5xx",
+    )
+
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logging")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the load generator from the command line."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    report = asyncio.run(run_load(args))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Latency and outcome metrics for Olarm REST API requests."""
+
+import bisect
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+import logging
+import re
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets; slower requests
+# land in a final overflow bucket
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Path segments following these collections are ids
+_ID_SEGMENT = re.compile(r"(/(?:devices|prolinks)/)[^/?]+")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Return the route of an endpoint with ids replaced by ``{id}``.
+
+    e.g. "/api/v4/devices/abc123/actions" -> "/api/v4/devices/{id}/actions"
+    """
+    return _ID_SEGMENT.sub(r"\1{id}", endpoint)
+
+
+@dataclass
+class RequestSample:
+    """Measurements of one API call, including all of its retries.
+
+    Attributes:
+        method: HTTP method.
+        endpoint: Endpoint template, e.g. "/api/v4/devices/{id}".
+        status: HTTP status of the last attempt, or None if no response.
+        error: Exception class name on failure, e.g. "RateLimited".
+        retries: Attempts made after the first one.
+        latency: Seconds from the call to its outcome, including backoff.
+        rate_limit_wait: Seconds spent waiting on the rate limiter.
+        pool_wait: Seconds spent waiting for a free pooled connection.
+        connect_time: Seconds spent opening new connections (DNS, TCP, TLS).
+        bytes_in: Response body bytes received.
+        bytes_out: Request body bytes sent.
+    """
+
+    method: str
+    endpoint: str
+    status: int | None = None
+    error: str | None = None
+    retries: int = 0
+    latency: float = 0.0
+    rate_limit_wait: float = 0.0
+    pool_wait: float = 0.0
+    connect_time: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in seconds."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """Initialize the histogram with the given bucket upper bounds."""
+        self._bounds = sorted(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def observe(self, value: float) -> None:
+        """Add one latency."""
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket holding it.
+
+        Values in the overflow bucket are reported as the maximum seen.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the histogram as a plain dict.
+
+        ``buckets`` maps each upper bound (``"+Inf"`` for the overflow
+        bucket) to the number of latencies that fell into it.
+        """
+        buckets = {
+            str(bound): count for bound, count in zip(self._bounds, self._counts)
+        }
+        buckets["+Inf"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class _EndpointStats:
+    latency: LatencyHistogram
+    statuses: Counter[int] = field(default_factory=Counter)
+    errors: Counter[str] = field(default_factory=Counter)
+    retries: int = 0
+    rate_limit_wait: float = 0.0
+    pool_wait: float = 0.0
+    connect_time: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class ApiMetrics:
+    """Per-endpoint latency histograms and outcome counters for REST calls.
+
+    Pass an instance to OlarmFlowClient(metrics=...) and read it with
+    snapshot(), or register listeners that receive every RequestSample as
+    it completes. Requests are grouped by method and endpoint template.
+    """
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        on_request: Callable[[RequestSample], None] | None = None,
+    ) -> None:
+        """Initialize the metrics.
+
+        Args:
+            buckets: Upper bounds in seconds of the latency histogram buckets.
+            on_request: Listener called with every completed RequestSample.
+        """
+        self._buckets = tuple(buckets)
+        self._endpoints: dict[str, _EndpointStats] = {}
+        self._listeners: list[Callable[[RequestSample], None]] = []
+        if on_request is not None:
+            self._listeners.append(on_request)
+
+    def add_listener(
+        self, callback: Callable[[RequestSample], None]
+    ) -> Callable[[], None]:
+        """Call ``callback`` with every completed RequestSample.
+
+        Returns a function that removes the listener again.
+        """
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback)
+
+    def record(self, sample: RequestSample) -> None:
+        """Add a completed request to the metrics and notify listeners."""
+        key = f"{sample.method} {sample.endpoint}"
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats(
+                LatencyHistogram(self._buckets)
+            )
+        stats.latency.observe(sample.latency)
+        if sample.status is not None:
+            stats.statuses[sample.status] += 1
+        if sample.error is not None:
+            stats.errors[sample.error] += 1
+        stats.retries += sample.retries
+        stats.rate_limit_wait += sample.rate_limit_wait
+        stats.pool_wait += sample.pool_wait
+        stats.connect_time += sample.connect_time
+        stats.bytes_in += sample.bytes_in
+        stats.bytes_out += sample.bytes_out
+        for listener in self._listeners:
+            try:
+                listener(sample)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Metrics: error in request listener")
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the metrics so far, keyed by e.g. "GET /api/v4/devices/{id}".
+
+        Wait times are totals in seconds across all requests to the endpoint.
+        """
+        return {
+            key: {
+                "count": stats.latency.count,
+                "latency": stats.latency.snapshot(),
+                "statuses": dict(stats.statuses),
+                "errors": dict(stats.errors),
+                "retries": stats.retries,
+                "rate_limit_wait": stats.rate_limit_wait,
+                "pool_wait": stats.pool_wait,
+                "connect_time": stats.connect_time,
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+            }
+            for key, stats in self._endpoints.items()
+        }
+
+    def reset(self) -> None:
+        """Discard everything recorded so far."""
+        self._endpoints.clear()
+
+    @staticmethod
+    def trace_config() -> aiohttp.TraceConfig:
+        """Return a trace config that times pool waits and new connections.
+
+        The client adds it to the session it creates; add it to an injected
+        session (``trace_configs=[ApiMetrics.trace_config()]``) to get
+        ``pool_wait`` and ``connect_time`` for it as well.
+        """
+        config = aiohttp.TraceConfig()
+
+        def timer(
+            attr: str, start: bool
+        ) -> Callable[[aiohttp.ClientSession, SimpleNamespace, Any], Any]:
+            async def handler(
+                session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+            ) -> None:
+                sample = ctx.trace_request_ctx
+                if not isinstance(sample, RequestSample):
+                    return
+                now = time.monotonic()
+                if start:
+                    setattr(ctx, attr, now)
+                elif hasattr(ctx, attr):
+                    setattr(
+                        sample, attr, getattr(sample, attr) + now - getattr(ctx, attr)
+                    )
+
+            return handler
+
+        config.on_connection_queued_start.append(timer("pool_wait", True))
+        config.on_connection_queued_end.append(timer("pool_wait", False))
+        config.on_connection_create_start.append(timer("connect_time", True))
+        config.on_connection_create_end.append(timer("connect_time", False))
+        return config
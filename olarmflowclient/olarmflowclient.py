@@ -4,18 +4,42 @@ See https://www.olarm.com for more info.
 """
 
 import asyncio
-from collections.abc import Callable
-import json
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import AbstractContextManager
 import logging
+import math
 import ssl
-from typing import Any, Literal
+import time
+from typing import Any, Literal, TypeVar
 import urllib.parse
 
 import aiohttp
 import aiomqtt
 
+from .actions import (
+    ActionScheduler,
+    BulkAction,
+    BulkActionResult,
+    BulkActionSummary,
+)
+from .cache import ResponseCache
+from .circuit import CircuitBreaker, CircuitPermit, CircuitState
+from .codec import JsonCodec, get_codec
+from .deadline import current_deadline, no_deadline, request_deadline
 from .const import (
+    API_CONNECT_TIMEOUT,
+    API_CONNECTOR_LIMIT,
+    API_CONNECTOR_LIMIT_PER_HOST,
+    API_DNS_CACHE_TTL,
+    API_KEEPALIVE_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_REQUEST_TIMEOUT,
+    API_VALIDATOR_CACHE_SIZE,
+    API_WARM_UP_TIMEOUT,
     BASE_URL,
+    EVENTS_CURSOR_FIELD,
+    EVENTS_TIMESTAMP_FIELD,
     MQTT_HOST,
     MQTT_KEEPALIVE,
     MQTT_PORT,
@@ -24,9 +48,55 @@ from .const import (
     MQTT_RECONNECT_BACKOFF_MAX,
     MQTT_RECONNECT_BACKOFF_MIN,
 )
+from .hedging import HedgingPolicy
+from .metrics import ApiMetrics, RequestSample, endpoint_template
+from .priority import Lane, PriorityScheduler, classify_request, request_lane
+from .ratelimit import AdaptiveRateLimiter
+from .retry import RetryPolicy
+from .streaming import JsonArrayStreamer
+from .tracing import (
+    ApiRequestTrace,
+    Span,
+    Tracer,
+    api_trace_config,
+    traced,
+    traced_request,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Requests that can safely be repeated without side effects
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Connection failures raised before any part of the request was sent
+_NOT_SENT_ERRORS: tuple[type[Exception], ...] = (aiohttp.ClientConnectorError,)
+if hasattr(aiohttp, "ConnectionTimeoutError"):  # aiohttp >= 3.10
+    _NOT_SENT_ERRORS += (aiohttp.ConnectionTimeoutError,)
+
+# asyncio.timeout() (Python >= 3.11) bounds a block without creating a task
+_asyncio_timeout = getattr(asyncio, "timeout", None)
+
+# Gateway statuses meaning the Olarm service itself is unavailable
+_OUTAGE_STATUSES = frozenset({502, 503, 504})
+
+_T = TypeVar("_T")
+
+
+async def _before_deadline(deadline: float | None, awaitable: Awaitable[_T]) -> _T:
+    """Await ``awaitable``, raising asyncio.TimeoutError at ``deadline``.
+
+    Bounds a single wait, so unlike a timeout around a whole async
+    generator it never fires while the generator is suspended at a yield.
+    """
+    if deadline is None:
+        return await awaitable
+    # A deadline already past still raises, at the first suspension
+    remaining = deadline - time.monotonic()
+    if _asyncio_timeout is not None:
+        async with _asyncio_timeout(remaining):
+            return await awaitable
+    return await asyncio.wait_for(awaitable, remaining)
+
 
 class OlarmFlowClientApiError(Exception):
     """Raised when the API returns an error."""
@@ -198,6 +268,36 @@ class OlarmFlowClientConnectionError(OlarmFlowClientApiError):
         super().__init__(message, **kwargs)
 
 
+class RequestTimeout(OlarmFlowClientConnectionError):
+    """Raised when a REST call runs out of time.
+
+    Covers connect and response (time to first byte) timeouts of a single
+    attempt as well as the call's overall deadline, which spans retries.
+    """
+
+    def __init__(
+        self, message: str = "Olarm API request timed out", **kwargs: Any
+    ) -> None:
+        """Initialize the request timeout error."""
+        super().__init__(message, **kwargs)
+
+
+class CircuitOpen(OlarmFlowClientApiError):
+    """Raised without contacting the API while the circuit breaker is open.
+
+    ``retry_after`` holds the seconds until the circuit lets a probe
+    request through.
+    """
+
+    def __init__(
+        self,
+        message: str = "Olarm API unavailable - circuit breaker is open",
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the circuit open error."""
+        super().__init__(message, **kwargs)
+
+
 class MqttConnectError(OlarmFlowClientApiError):
     """Raised when MQTT connection fails."""
 
@@ -226,6 +326,45 @@ class MqttTimeoutError(OlarmFlowClientApiError):
         super().__init__(message)
 
 
+class ActionNotConfirmed(OlarmFlowClientApiError):
+    """Raised when an action's state change is not seen over MQTT in time."""
+
+    def __init__(
+        self, message: str = "Action was not confirmed before the timeout"
+    ) -> None:
+        """Initialize the action not confirmed error."""
+        super().__init__(message)
+
+
+# Device area state reported once each area command has taken effect
+_AREA_CONFIRM_STATES = {
+    "area-arm": "arm",
+    "area-disarm": "disarm",
+    "area-stay": "stay",
+    "area-sleep": "sleep",
+}
+
+
+def _area_state_matcher(
+    action_cmd: str, area_num: int
+) -> Callable[[dict[str, Any]], bool]:
+    """Return a matcher for MQTT device state showing an area command applied.
+
+    Looks for the ``areas`` state list in the payload itself or under its
+    ``deviceState`` or ``data`` key.
+    """
+    expected = _AREA_CONFIRM_STATES[action_cmd]
+
+    def match(payload: dict[str, Any]) -> bool:
+        for state in (payload, payload.get("deviceState"), payload.get("data")):
+            if isinstance(state, dict) and isinstance(state.get("areas"), list):
+                areas = state["areas"]
+                return 0 < area_num <= len(areas) and areas[area_num - 1] == expected
+        return False
+
+    return match
+
+
 class OlarmFlowClient:
     """Async client class for interacting with the Olarm API."""
 
@@ -234,8 +373,107 @@ class OlarmFlowClient:
         access_token: str,
         expires_at: float | None = None,
         mqtt_retries_before_disconnect: int = MQTT_RETRIES_BEFORE_DISCONNECT,
+        session: aiohttp.ClientSession | None = None,
+        connector_limit: int = API_CONNECTOR_LIMIT,
+        connector_limit_per_host: int = API_CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout: float = API_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int | None = API_DNS_CACHE_TTL,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        retry_policy: RetryPolicy | None = RetryPolicy(),
+        coalesce_reads: bool = False,
+        response_cache: ResponseCache | None = None,
+        conditional_requests: bool = False,
+        json_codec: JsonCodec | None = None,
+        ordered_actions: bool = False,
+        warm_connections: int = 0,
+        metrics: ApiMetrics | None = None,
+        tracer: Tracer | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        priority_scheduler: PriorityScheduler | None = None,
+        hedging: HedgingPolicy | None = None,
+        connect_timeout: float | None = API_CONNECT_TIMEOUT,
+        read_timeout: float | None = API_READ_TIMEOUT,
+        request_timeout: float | None = API_REQUEST_TIMEOUT,
+        base_url: str | None = None,
+        mqtt_host: str | None = None,
+        mqtt_port: int | None = None,
+        mqtt_tls: bool = True,
     ) -> None:
-        """Initialize the Olarm Flow Client."""
+        """Initialize the Olarm Flow Client.
+
+        The client owns a pooled aiohttp session that is kept open (and its
+        connections reused) until the client is closed. Pass ``session`` to
+        share an existing ``aiohttp.ClientSession`` instead; an injected
+        session is never closed by the client and the connector options are
+        ignored.
+
+        Pass ``rate_limiter`` to pace all REST calls through an
+        AdaptiveRateLimiter that backs off on 429 responses.
+
+        ``retry_policy`` controls retries of transient failures (see
+        _api_make_request); pass None to disable retries.
+
+        With ``coalesce_reads`` enabled, concurrent identical GET requests
+        share a single HTTP request and all callers receive its result (the
+        same object) or its exception.
+
+        Pass ``response_cache`` to serve get_device() and get_devices()
+        from memory; entries for a device are invalidated whenever an MQTT
+        message for that device arrives.
+
+        With ``conditional_requests`` enabled, the ETag/Last-Modified
+        validators and body of recent GET responses are kept per URL and
+        sent back as If-None-Match/If-Modified-Since; a 304 Not Modified
+        answer returns the stored body without downloading it again.
+
+        ``json_codec`` encodes request bodies and decodes responses and MQTT
+        payloads; by default the fastest installed codec (orjson, msgspec or
+        the standard library) is used.
+
+        With ``ordered_actions`` enabled, actions for the same device are
+        sent one at a time in the order they were requested while different
+        devices proceed in parallel, and an action identical to the one
+        queued just before it shares its request.
+
+        With ``warm_connections`` above zero, entering the client as an
+        async context manager calls warm_up() to open that many pooled
+        connections (and build the MQTT TLS context) up front.
+
+        Pass ``metrics`` to record the latency, status, error class, retries
+        and bytes of every REST call per endpoint in an ApiMetrics instance.
+
+        Pass ``tracer`` (e.g. an OpenTelemetryTracer) to trace every REST
+        request attempt, split into connection and response phases, and
+        MQTT connects, subscribes and message dispatch.
+
+        Pass ``circuit_breaker`` to stop sending REST calls while the API
+        keeps failing with gateway errors (502/503/504) or connection
+        errors; calls then fail fast with CircuitOpen until a probe request
+        succeeds (see set_circuit_status_callback()).
+
+        Pass ``priority_scheduler`` to admit REST calls by lane: panic and
+        disarm commands go first and have reserved capacity, then other
+        actions and single device reads, then bulk reads such as device
+        pages and event history (see lane()). Critical calls also skip the
+        rate limiter's queue.
+
+        Pass ``hedging`` to hedge get_device() and small get_devices()
+        pages: a read slower than the policy's delay (the endpoint's recent
+        p95 by default) is sent again and the first answer is used.
+
+        Every REST call is bounded by timeouts raising RequestTimeout:
+        ``connect_timeout`` to open a connection, ``read_timeout`` to wait
+        for the response (time to first byte) or the next chunk of it, and
+        ``request_timeout`` for the whole call including retries, backoff
+        and rate limiter / priority lane queueing. Use deadline() for a
+        tighter budget on specific calls.
+        Pass None to disable any of them.
+
+        ``base_url``, ``mqtt_host``, ``mqtt_port`` and ``mqtt_tls`` point the
+        client at another API host or MQTT broker, e.g. the local stand-ins
+        in olarmflowclient.testing; pass ``mqtt_tls=False`` for a broker
+        without TLS.
+        """
 
         # tokens
         self._access_token = access_token
@@ -245,7 +483,37 @@ class OlarmFlowClient:
         )
 
         # api client attributes (initialized to None)
-        self._api_session: aiohttp.ClientSession | None = None
+        self._api_session: aiohttp.ClientSession | None = session
+        self._api_session_owned = session is None
+        self._api_connector_limit = connector_limit
+        self._api_connector_limit_per_host = connector_limit_per_host
+        self._api_keepalive_timeout = keepalive_timeout
+        self._api_dns_cache_ttl = dns_cache_ttl
+        self._rate_limiter = rate_limiter
+        self._json = json_codec if json_codec is not None else get_codec()
+        self._retry_policy = retry_policy
+        self._coalesce_reads = coalesce_reads
+        self._coalesce_hits = 0
+        self._coalesce_misses = 0
+        self._response_cache = response_cache
+        self._action_scheduler = ActionScheduler() if ordered_actions else None
+        self._api_validators = (
+            ResponseCache(ttl=None, max_entries=API_VALIDATOR_CACHE_SIZE)
+            if conditional_requests
+            else None
+        )
+        self._api_inflight: dict[tuple[Any, ...], asyncio.Task[dict[str, Any]]] = {}
+        self._api_warm_connections = warm_connections
+        self._metrics = metrics
+        self._tracer = tracer
+        self._circuit_breaker = circuit_breaker
+        self._priority_scheduler = priority_scheduler
+        self._hedging = hedging
+        self._api_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._request_timeout = request_timeout
+        self._base_url = base_url if base_url is not None else BASE_URL
 
         # mqtt client attributes (initialized to None)
         self._mqtt_clientId: str | None = None
@@ -266,28 +534,231 @@ class OlarmFlowClient:
         ) = None
         self._mqtt_retries: int = 0
         self._mqtt_retries_before_disconnect: int = mqtt_retries_before_disconnect
+        self._mqtt_host = mqtt_host if mqtt_host is not None else MQTT_HOST
+        self._mqtt_port = mqtt_port if mqtt_port is not None else MQTT_PORT
+        self._mqtt_tls = mqtt_tls
         self._mqtt_tls_context: ssl.SSLContext | None = None
         self._event_loop: asyncio.AbstractEventLoop | None = None
+        # Pending send_and_confirm() waiters by topic: (match, future)
+        self._mqtt_waiters: dict[
+            str,
+            list[tuple[Callable[[dict[str, Any]], bool], asyncio.Future[float]]],
+        ] = {}
 
     async def __aenter__(self) -> "OlarmFlowClient":
         """Async context manager enter."""
         await self._api_connect()
+        if self._api_warm_connections > 0:
+            await self.warm_up()
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """Async context manager exit."""
         await self._api_close()
 
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter | None:
+        """The rate limiter pacing REST calls, if one was configured."""
+        return self._rate_limiter
+
+    @property
+    def metrics(self) -> ApiMetrics | None:
+        """The metrics recording REST calls, if configured."""
+        return self._metrics
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """The circuit breaker guarding REST calls, if configured."""
+        return self._circuit_breaker
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """The cache serving device reads, if one was configured."""
+        return self._response_cache
+
+    async def close(self) -> None:
+        """Close the API session and release its pooled connections.
+
+        Only needed when the client is not used as an async context manager.
+        """
+        await self._api_close()
+
     async def _api_connect(self) -> None:
-        """Create aiohttp session."""
+        """Create the pooled aiohttp session."""
         if self._api_session is None:
-            self._api_session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=self._api_connector_limit,
+                limit_per_host=self._api_connector_limit_per_host,
+                keepalive_timeout=self._api_keepalive_timeout,
+                use_dns_cache=self._api_dns_cache_ttl is not None,
+                ttl_dns_cache=self._api_dns_cache_ttl,
+            )
+            trace_configs = []
+            if self._metrics is not None:
+                trace_configs.append(self._metrics.trace_config())
+            if self._tracer is not None:
+                trace_configs.append(api_trace_config())
+            self._api_session = aiohttp.ClientSession(
+                connector=connector, trace_configs=trace_configs or None
+            )
+            self._api_session_owned = True
 
     async def _api_close(self) -> None:
-        """Close aiohttp session."""
-        if self._api_session:
-            await self._api_session.close()
+        """Close the pooled aiohttp session.
+
+        An injected session is left open and kept, so it is used again if
+        the client makes more requests.
+        """
+        if self._api_session is not None and self._api_session_owned:
+            session = self._api_session
             self._api_session = None
+            self._api_session_owned = False
+            await session.close()
+
+    async def warm_up(
+        self,
+        connections: int | None = None,
+        mqtt_user_id: str | None = None,
+        mqtt_client_id_suffix: str | None = "1",
+    ) -> None:
+        """Pay connection setup costs before the first real request.
+
+        Opens ``connections`` pooled connections to the API host (resolving
+        and caching its address and completing the TLS handshakes) by
+        sending concurrent HEAD requests, and at the same time builds the
+        MQTT TLS context, or fully starts MQTT when ``mqtt_user_id`` is
+        given (see start_mqtt_async()). Connections stay idle in the pool
+        for up to ``keepalive_timeout`` seconds.
+
+        API warm-up is best effort: failures are logged and ignored. MQTT
+        start-up errors are raised as from start_mqtt_async().
+
+        Args:
+            connections: Connections to open; defaults to the
+                ``warm_connections`` constructor option (or 1 if that is 0).
+            mqtt_user_id: Olarm user id; if given, MQTT is started too.
+            mqtt_client_id_suffix: Suffix for the MQTT client id.
+        """
+        await self._api_connect()
+        if connections is None:
+            connections = max(1, self._api_warm_connections)
+        if mqtt_user_id is not None:
+            mqtt = self.start_mqtt_async(mqtt_user_id, mqtt_client_id_suffix)
+        else:
+            mqtt = self._mqtt_build_tls_context()
+        start = time.monotonic()
+        await asyncio.gather(
+            mqtt, *(self._api_warm_connection() for _ in range(connections))
+        )
+        _LOGGER.debug(
+            "API: warm-up took %.3fs (%d connections open)",
+            time.monotonic() - start,
+            self.get_pool_stats()["open"],
+        )
+
+    async def _api_warm_connection(self) -> None:
+        """Open one pooled connection to the API host with a HEAD request."""
+        assert self._api_session is not None
+        try:
+            async with self._api_session.head(
+                self._base_url,
+                timeout=aiohttp.ClientTimeout(total=API_WARM_UP_TIMEOUT),
+            ):
+                # Any status will do: the connection goes back to the pool
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("API: warm-up connection failed: %s", err)
+
+    def get_pool_stats(self) -> dict[str, int]:
+        """Return connection pool statistics for the API session.
+
+        ``open`` is the number of connections currently held by the pool,
+        split into ``idle`` (kept alive and ready for reuse) and ``acquired``
+        (serving a request). ``waiting`` counts requests queued for a free
+        connection because a limit was reached.
+        """
+        session = self._api_session
+        connector = session.connector if session is not None else None
+        if connector is None:
+            return {
+                "limit": self._api_connector_limit,
+                "limit_per_host": self._api_connector_limit_per_host,
+                "open": 0,
+                "idle": 0,
+                "acquired": 0,
+                "waiting": 0,
+            }
+        # aiohttp has no public pool introspection, so read the internals
+        # defensively in case they change between releases
+        conns = getattr(connector, "_conns", {})
+        waiters = getattr(connector, "_waiters", {})
+        idle = sum(len(c) for c in conns.values())
+        acquired = len(getattr(connector, "_acquired", ()))
+        return {
+            "limit": connector.limit,
+            "limit_per_host": connector.limit_per_host,
+            "open": idle + acquired,
+            "idle": idle,
+            "acquired": acquired,
+            "waiting": sum(len(w) for w in waiters.values()),
+        }
+
+    def get_coalesce_stats(self) -> dict[str, int]:
+        """Return single-flight statistics for coalesced GET requests.
+
+        ``hits`` counts calls that joined a request already in flight,
+        ``misses`` counts calls that started a new one.
+        """
+        return {
+            "hits": self._coalesce_hits,
+            "misses": self._coalesce_misses,
+            "in_flight": len(self._api_inflight),
+        }
+
+    def get_priority_stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-lane queue and wait statistics.
+
+        Always empty unless the client was created with a
+        ``priority_scheduler``; see PriorityScheduler.stats().
+        """
+        if self._priority_scheduler is None:
+            return {}
+        return self._priority_scheduler.stats()
+
+    @staticmethod
+    def deadline(timeout: float) -> AbstractContextManager[None]:
+        """Bound the REST calls made inside a ``with`` block to ``timeout`` seconds.
+
+        e.g. ``with client.deadline(2): await client.send_device_area_disarm(...)``.
+        The deadline spans all attempts and retries of each call; calls that
+        run out of time raise RequestTimeout.
+        """
+        return request_deadline(timeout)
+
+    @staticmethod
+    def lane(lane: Lane) -> AbstractContextManager[None]:
+        """Send the requests made inside a ``with`` block in ``lane``.
+
+        e.g. ``with client.lane("bulk"): await client.get_device(...)``.
+        Panic and disarm commands always stay critical.
+        """
+        return request_lane(lane)
+
+    def get_hedging_stats(self) -> dict[str, Any]:
+        """Return hedged read statistics (empty unless hedging is enabled)."""
+        if self._hedging is None:
+            return {}
+        return self._hedging.stats()
+
+    def get_action_queue_depths(self) -> dict[str, int]:
+        """Return queued plus running actions per device.
+
+        Only devices with pending actions are included; always empty unless
+        the client was created with ``ordered_actions=True``.
+        """
+        if self._action_scheduler is None:
+            return {}
+        return self._action_scheduler.queue_depths()
 
     async def _api_make_request(
         self,
@@ -297,90 +768,651 @@ class OlarmFlowClient:
         jsonBody: dict[str, Any] | None = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
-        """Make an authenticated request to the API."""
+        """Make an authenticated request to the API.
 
-        await self._api_connect()
-        assert self._api_session is not None  # Guaranteed by _api_connect
+        Identical concurrent GET requests are coalesced into one when
+        enabled for the client.
+        """
+        if not self._coalesce_reads or method != "GET" or jsonBody or kwargs:
+            return await self._api_request_recorded(
+                method, endpoint, params, jsonBody, **kwargs
+            )
 
-        headers = {
+        # Callers in different lanes don't share a request, so each read is
+        # sent in its own caller's lane
+        key = (
+            method,
+            endpoint,
+            tuple(sorted((params or {}).items())),
+            classify_request(method, endpoint),
+        )
+        task = self._api_inflight.get(key)
+        if task is None:
+            self._coalesce_misses += 1
+            # Shared by every caller, so no single caller's deadline applies
+            with no_deadline():
+                task = asyncio.get_running_loop().create_task(
+                    self._api_request_recorded(method, endpoint, params)
+                )
+            self._api_inflight[key] = task
+
+            def _done(done: asyncio.Task[dict[str, Any]]) -> None:
+                if self._api_inflight.get(key) is done:
+                    del self._api_inflight[key]
+                # Mark the exception retrieved even if every caller went away
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(_done)
+        else:
+            self._coalesce_hits += 1
+        # Shield so one caller being cancelled doesn't cancel the others
+        return await self._api_within_own_deadline(asyncio.shield(task))
+
+    async def _api_within_own_deadline(self, awaitable: Awaitable[_T]) -> _T:
+        """Wait for work shared with other callers within this caller's deadline.
+
+        Raises:
+            RequestTimeout: If the deadline() block the call is made in
+                expires first.
+        """
+        try:
+            return await _before_deadline(current_deadline(), awaitable)
+        except asyncio.TimeoutError as e:
+            raise RequestTimeout(
+                "Olarm API request timed out: deadline exceeded"
+            ) from e
+
+    async def _api_hedged_get(
+        self, endpoint: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Make a latency-sensitive GET request, hedging it when enabled.
+
+        If no answer has arrived after the hedging policy's delay, a second
+        request is sent on another pooled connection (bypassing read
+        coalescing) and the first successful answer is returned; the other
+        request is cancelled. The original error is raised if both fail.
+        """
+        policy = self._hedging
+        if policy is None:
+            return await self._api_make_request("GET", endpoint, params=params)
+
+        key = endpoint_template(endpoint)
+        policy.on_request()
+        start = time.monotonic()
+
+        def observe(task: asyncio.Task[dict[str, Any]]) -> None:
+            # A read cancelled because the hedge won took at least this long
+            if task.cancelled() or task.exception() is None:
+                policy.observe(key, time.monotonic() - start)
+
+        loop = asyncio.get_running_loop()
+        primary = loop.create_task(
+            self._api_make_request("GET", endpoint, params=params)
+        )
+        primary.add_done_callback(observe)
+        hedge: asyncio.Task[dict[str, Any]] | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=policy.delay(key))
+            if done or not policy.try_hedge():
+                return await primary
+
+            _LOGGER.debug(
+                "API: hedging GET %s after %.3fs", endpoint, time.monotonic() - start
+            )
+            hedge = loop.create_task(
+                self._api_request_recorded("GET", endpoint, params)
+            )
+            pending: set[asyncio.Task[dict[str, Any]]] = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            policy.on_hedge_won()
+                        return task.result()
+            # Both failed: report the original request's error
+            return await primary
+        finally:
+            primary.cancel()
+            if hedge is not None:
+                hedge.cancel()
+
+    async def _api_request_recorded(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        jsonBody: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make a request with retries, recording it in the metrics if enabled."""
+        if self._metrics is None:
+            return await self._api_request_with_retries(
+                method, endpoint, params, jsonBody, **kwargs
+            )
+
+        sample = RequestSample(method, endpoint_template(endpoint))
+        start = time.monotonic()
+        try:
+            return await self._api_request_with_retries(
+                method, endpoint, params, jsonBody, sample=sample, **kwargs
+            )
+        except OlarmFlowClientApiError as err:
+            sample.error = type(self._map_api_error(err)).__name__
+            raise
+        except asyncio.CancelledError:
+            sample.error = "CancelledError"
+            raise
+        finally:
+            sample.latency = time.monotonic() - start
+            self._metrics.record(sample)
+
+    async def _api_request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        jsonBody: dict[str, Any] | None = None,
+        sample: RequestSample | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an authenticated request to the API, retrying transient failures.
+
+        Idempotent requests (GET) are retried on 5xx responses, connection
+        errors and timeouts as allowed by the retry policy. Other requests
+        (actions) are only retried when the connection failed before the
+        request was sent, so an action is never applied twice.
+
+        All attempts share one deadline (see _api_deadline()); no retry is
+        started that would begin after it.
+        """
+        deadline = self._api_deadline()
+        policy = self._retry_policy
+        if policy is None:
+            return await self._api_request_timed(
+                deadline, method, endpoint, params, jsonBody, sample, **kwargs
+            )
+
+        idempotent = method in _IDEMPOTENT_METHODS
+        start = time.monotonic()
+        delay = policy.base_delay
+        attempt = 1
+        while True:
+            try:
+                return await self._api_request_timed(
+                    deadline, method, endpoint, params, jsonBody, sample, **kwargs
+                )
+            except OlarmFlowClientApiError as err:
+                if attempt >= policy.max_attempts or not self._api_should_retry(
+                    err, idempotent
+                ):
+                    raise
+                delay = policy.next_delay(delay)
+                if err.retry_after:
+                    delay = max(delay, err.retry_after)
+                now = time.monotonic()
+                if now - start + delay > policy.total_budget or (
+                    deadline is not None and now + delay >= deadline
+                ):
+                    raise
+                _LOGGER.debug(
+                    "API: retrying %s %s in %.2fs (attempt=%d): %s",
+                    method,
+                    endpoint,
+                    delay,
+                    attempt,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                if sample is not None:
+                    sample.retries += 1
+
+    def _api_deadline(self) -> float | None:
+        """Return the time.monotonic() deadline for a call starting now.
+
+        The earlier of the client's ``request_timeout`` and any deadline()
+        block the call is made in.
+        """
+        deadline = current_deadline()
+        if self._request_timeout is not None:
+            own = time.monotonic() + self._request_timeout
+            deadline = own if deadline is None else min(deadline, own)
+        return deadline
+
+    async def _api_request_timed(
+        self,
+        deadline: float | None,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        jsonBody: dict[str, Any] | None = None,
+        sample: RequestSample | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make one request attempt, cut off at ``deadline``.
+
+        The cut-off covers queueing for the rate limiter and priority lanes
+        as well as the request itself.
+        """
+        if deadline is None:
+            return await self._api_request_once(
+                method, endpoint, params, jsonBody, sample, **kwargs
+            )
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RequestTimeout("Olarm API request timed out: deadline exceeded")
+        try:
+            if _asyncio_timeout is not None:
+                async with _asyncio_timeout(remaining):
+                    return await self._api_request_once(
+                        method, endpoint, params, jsonBody, sample, **kwargs
+                    )
+            return await asyncio.wait_for(
+                self._api_request_once(
+                    method, endpoint, params, jsonBody, sample, **kwargs
+                ),
+                remaining,
+            )
+        except asyncio.TimeoutError as e:
+            # Timeouts inside the attempt are already RequestTimeout, so
+            # this is the deadline itself
+            _LOGGER.debug("API: deadline exceeded %s %s", method, endpoint)
+            raise RequestTimeout(
+                "Olarm API request timed out: deadline exceeded"
+            ) from e
+
+    def _api_should_retry(self, err: OlarmFlowClientApiError, idempotent: bool) -> bool:
+        """Return True if a failed attempt may be retried."""
+        if isinstance(err, OlarmFlowClientConnectionError):
+            cause = err.__cause__
+            if isinstance(cause, aiohttp.ClientSSLError):
+                # Certificate problems won't fix themselves
+                return False
+            return idempotent or isinstance(cause, _NOT_SENT_ERRORS)
+        assert self._retry_policy is not None
+        return idempotent and err.status_code in self._retry_policy.retry_statuses
+
+    def _api_headers(self) -> dict[str, str]:
+        """Return the headers sent with every API request."""
+        return {
             "Authorization": f"Bearer {self._access_token}",
             "Content-Type": "application/json",
         }
 
-        url = f"{BASE_URL}{endpoint}"
+    def _api_url(self, endpoint: str, params: dict[str, Any] | None) -> str:
+        """Build the full request URL, dropping params whose value is None."""
+        url = f"{self._base_url}{endpoint}"
         if params:
             filtered_params = {k: v for k, v in params.items() if v is not None}
             if filtered_params:
                 url += "?" + urllib.parse.urlencode(filtered_params)
+        return url
+
+    async def _api_response_error(
+        self, response: aiohttp.ClientResponse, method: str, endpoint: str
+    ) -> OlarmFlowClientApiError:
+        """Build the error for a non-200 response from its headers and body."""
+        text = await response.text()
+
+        # Extract error detail from the response body (tolerate
+        # non-JSON bodies, e.g. HTML from the gateway on 502/504)
+        error_code: str | None = None
+        error_message: str | None = None
+        req_id: str | None = None
+        try:
+            body = self._json.loads(text)
+            if isinstance(body, dict):
+                error_code = body.get("error") or (
+                    body["errors"][0]
+                    if isinstance(body.get("errors"), list) and body["errors"]
+                    else None
+                )
+                error_message = body.get("message")
+                req_id = body.get("reqId")
+        except (ValueError, TypeError, KeyError):
+            pass
+
+        # Headers take precedence as they survive body rewrites
+        error_code = response.headers.get("X-Olarm-Auth-Error", error_code)
+        req_id = response.headers.get("X-Olarm-Req-Id", req_id)
+        retry_after: int | None = None
+        retry_after_header = response.headers.get("Retry-After")
+        if retry_after_header is not None:
+            try:
+                retry_after = int(retry_after_header)
+            except ValueError:
+                retry_after = None
+
+        if response.status == 429 and self._rate_limiter is not None:
+            self._rate_limiter.on_rate_limited(retry_after)
+
+        _LOGGER.debug(
+            "API: request failed %s %s (status=%s): %s",
+            method,
+            endpoint,
+            response.status,
+            text,
+        )
+
+        return OlarmFlowClientApiError(
+            "Request failed",
+            status_code=response.status,
+            response_text=text,
+            error_code=error_code,
+            error_message=error_message,
+            req_id=req_id,
+            retry_after=retry_after,
+        )
+
+    async def _api_request_once(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        jsonBody: dict[str, Any] | None = None,
+        sample: RequestSample | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make a single authenticated request attempt to the API.
+
+        ``sample`` collects the attempt's measurements when metrics are on.
+        """
+
+        await self._api_connect()
+        assert self._api_session is not None  # Guaranteed by _api_connect
+
+        headers = self._api_headers()
+        url = self._api_url(endpoint, params)
+
+        # Validators and body of the last response for this URL: (ETag,
+        # Last-Modified, body)
+        validated: tuple[str | None, str | None, Any] | None = None
+        if self._api_validators is not None and method == "GET":
+            validated = self._api_validators.get(url)
+            if validated is not None:
+                etag, last_modified, _ = validated
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
 
         kwargs["headers"] = {**kwargs.get("headers", {}), **headers}
+        kwargs.setdefault("timeout", self._api_timeout)
         if jsonBody is not None:
-            kwargs["json"] = jsonBody
+            kwargs["data"] = self._json.dumps(jsonBody)
+
+        if sample is not None:
+            sample.status = None
+            # Picked up by the metrics trace config to time pool waits
+            kwargs["trace_request_ctx"] = sample
+            if "data" in kwargs:
+                sample.bytes_out += len(kwargs["data"])
+
+        breaker = self._circuit_breaker
+        permit: CircuitPermit | None = None
+        if breaker is not None:
+            permit = breaker.allow_request()
+            if permit is None:
+                _LOGGER.debug("API: circuit open, not sending %s %s", method, endpoint)
+                raise CircuitOpen(retry_after=math.ceil(breaker.retry_after))
+
+        scheduler = self._priority_scheduler
+        lane = classify_request(method, endpoint, jsonBody)
+        admitted = False
+        try:
+            if scheduler is not None:
+                await scheduler.acquire(lane)
+                admitted = True
+
+            if self._rate_limiter is not None:
+                if sample is not None:
+                    wait_start = time.monotonic()
+                    await self._rate_limiter.acquire(priority=lane == "critical")
+                    sample.rate_limit_wait += time.monotonic() - wait_start
+                else:
+                    await self._rate_limiter.acquire(priority=lane == "critical")
 
-        _LOGGER.debug("API: request %s %s", method, endpoint)
+            _LOGGER.debug("API: request %s %s", method, endpoint)
 
-        result: dict[str, Any] = {}
+            if self._tracer is None:
+                result = await self._api_send_request(
+                    method, endpoint, url, validated, sample, kwargs
+                )
+            else:
+                with traced_request(self._tracer, method, endpoint):
+                    result = await self._api_send_request(
+                        method, endpoint, url, validated, sample, kwargs
+                    )
+        except OlarmFlowClientApiError as err:
+            if breaker is not None:
+                self._circuit_report_error(breaker, err, permit)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.on_abandoned(permit)
+            raise
+        finally:
+            if admitted:
+                assert scheduler is not None
+                scheduler.release(lane)
+        if breaker is not None:
+            breaker.on_success(permit)
+        return result
+
+    @staticmethod
+    def _circuit_report_error(
+        breaker: CircuitBreaker,
+        err: OlarmFlowClientApiError,
+        permit: CircuitPermit | None,
+    ) -> None:
+        """Report a failed request to the circuit breaker.
+
+        Only outages count as failures; any other error response shows the
+        API is up.
+        """
+        if (
+            isinstance(err, OlarmFlowClientConnectionError)
+            or err.status_code in _OUTAGE_STATUSES
+        ):
+            breaker.on_failure(permit)
+        else:
+            breaker.on_success(permit)
+
+    async def _api_send_request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        validated: tuple[str | None, str | None, Any] | None,
+        sample: RequestSample | None,
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Send a prepared request and read its response."""
+        assert self._api_session is not None  # Guaranteed by _api_connect
+        # Decoded JSON (None for an empty body) or, for other content, text
+        result: Any = {}
         try:
             async with self._api_session.request(method, url, **kwargs) as response:
+                if sample is not None:
+                    sample.status = response.status
+
+                if response.status == 304 and validated is not None:
+                    _LOGGER.debug("API: not modified %s %s", method, endpoint)
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.on_success()
+                    return validated[2]  # type: ignore[no-any-return]
+
                 if response.status != 200:
-                    text = await response.text()
+                    error = await self._api_response_error(response, method, endpoint)
+                    if sample is not None:
+                        # The body is already read, so this doesn't download it again
+                        sample.bytes_in += len(await response.read())
+                    raise error
 
-                    # Extract error detail from the response body (tolerate
-                    # non-JSON bodies, e.g. HTML from the gateway on 502/504)
-                    error_code: str | None = None
-                    error_message: str | None = None
-                    req_id: str | None = None
-                    try:
-                        body = json.loads(text)
-                        if isinstance(body, dict):
-                            error_code = body.get("error") or (
-                                body["errors"][0]
-                                if isinstance(body.get("errors"), list)
-                                and body["errors"]
-                                else None
-                            )
-                            error_message = body.get("message")
-                            req_id = body.get("reqId")
-                    except (json.JSONDecodeError, ValueError, TypeError, KeyError):
-                        pass
-
-                    # Headers take precedence as they survive body rewrites
-                    error_code = response.headers.get("X-Olarm-Auth-Error", error_code)
-                    req_id = response.headers.get("X-Olarm-Req-Id", req_id)
-                    retry_after: int | None = None
-                    retry_after_header = response.headers.get("Retry-After")
-                    if retry_after_header is not None:
-                        try:
-                            retry_after = int(retry_after_header)
-                        except ValueError:
-                            retry_after = None
-
-                    _LOGGER.debug("API: request failed %s %s (status=%s): %s", method, endpoint, response.status, text)
-
-                    raise OlarmFlowClientApiError(
-                        "Request failed",
-                        status_code=response.status,
-                        response_text=text,
-                        error_code=error_code,
-                        error_message=error_message,
-                        req_id=req_id,
-                        retry_after=retry_after,
-                    )
+                if self._rate_limiter is not None:
+                    self._rate_limiter.on_success()
 
                 if "application/json" in response.headers.get("Content-Type", ""):
-                    result = await response.json()
+                    raw = await response.read()
+                    result = self._json.loads(raw) if raw.strip() else None
                 else:
                     result = await response.text()
 
+                if sample is not None:
+                    sample.bytes_in += len(await response.read())
+
+                if self._api_validators is not None and method == "GET":
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        self._api_validators.set(url, (etag, last_modified, result))
+
+        except asyncio.TimeoutError as e:
+            # Before ClientError: aiohttp's connect and read timeouts are both
+            _LOGGER.debug("API: request timed out %s %s: %s", method, endpoint, e)
+            raise RequestTimeout() from e
         except aiohttp.ClientError as e:
             _LOGGER.debug("API: connection error %s %s: %s", method, endpoint, e)
             raise OlarmFlowClientConnectionError(
                 f"Unable to connect to the Olarm API: {e!s}"
             ) from e
-        finally:
-            await self._api_close()
 
-        return result
+        return result  # type: ignore[no-any-return]
+
+    async def _api_stream_array(
+        self,
+        method: str,
+        endpoint: str,
+        key: str,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the items of the array under ``key`` in the response body.
+
+        Items are decoded one at a time as the body arrives, so memory use
+        does not grow with the size of the array. Streamed requests are not
+        retried, coalesced or cached; with metrics enabled their latency runs
+        until the stream is finished or closed.
+
+        The call's deadline (see _api_deadline()) covers the whole stream,
+        from queueing to the end of the body: any wait past it raises
+        RequestTimeout.
+        """
+        await self._api_connect()
+        assert self._api_session is not None  # Guaranteed by _api_connect
+
+        deadline = self._api_deadline()
+        breaker = self._circuit_breaker
+        permit: CircuitPermit | None = None
+        if breaker is not None:
+            permit = breaker.allow_request()
+            if permit is None:
+                _LOGGER.debug("API: circuit open, not sending %s %s", method, endpoint)
+                raise CircuitOpen(retry_after=math.ceil(breaker.retry_after))
+
+        sample: RequestSample | None = None
+        start = time.monotonic()
+        if self._metrics is not None:
+            sample = RequestSample(method, endpoint_template(endpoint))
+
+        url = self._api_url(endpoint, params)
+        trace: ApiRequestTrace | None = None
+        error: OlarmFlowClientApiError | None = None
+        answered = False
+        scheduler = self._priority_scheduler
+        lane = classify_request(method, endpoint)
+        admitted = False
+        try:
+            if scheduler is not None:
+                await _before_deadline(deadline, scheduler.acquire(lane))
+                admitted = True
+
+            if self._rate_limiter is not None:
+                wait_start = time.monotonic()
+                await _before_deadline(
+                    deadline,
+                    self._rate_limiter.acquire(priority=lane == "critical"),
+                )
+                if sample is not None:
+                    sample.rate_limit_wait = time.monotonic() - wait_start
+
+            _LOGGER.debug("API: streaming request %s %s", method, endpoint)
+
+            if self._tracer is not None:
+                trace = ApiRequestTrace(self._tracer, method, endpoint)
+            response = await _before_deadline(
+                deadline,
+                self._api_session.request(
+                    method,
+                    url,
+                    headers=self._api_headers(),
+                    timeout=self._api_timeout,
+                    trace_request_ctx=sample,
+                ),
+            )
+            async with response:
+                answered = True
+                if trace is not None:
+                    # Items are yielded to the caller from here on, so other
+                    # requests made meanwhile must not see this as active
+                    trace.detach()
+                if sample is not None:
+                    sample.status = response.status
+                if response.status != 200:
+                    raise await self._api_response_error(response, method, endpoint)
+
+                if self._rate_limiter is not None:
+                    self._rate_limiter.on_success()
+
+                streamer = JsonArrayStreamer(key)
+                while chunk := await _before_deadline(
+                    deadline, response.content.readany()
+                ):
+                    if sample is not None:
+                        sample.bytes_in += len(chunk)
+                    for raw in streamer.feed(chunk):
+                        yield self._json.loads(raw)
+                    if streamer.done:
+                        break
+        except asyncio.TimeoutError as e:
+            _LOGGER.debug("API: request timed out %s %s", method, endpoint)
+            if sample is not None:
+                sample.error = RequestTimeout.__name__
+            error = RequestTimeout()
+            raise error from e
+        except aiohttp.ClientError as e:
+            _LOGGER.debug("API: connection error %s %s: %s", method, endpoint, e)
+            if sample is not None:
+                sample.error = OlarmFlowClientConnectionError.__name__
+            error = OlarmFlowClientConnectionError(
+                f"Unable to connect to the Olarm API: {e!s}"
+            )
+            raise error from e
+        except OlarmFlowClientApiError as err:
+            if sample is not None:
+                sample.error = type(self._map_api_error(err)).__name__
+            error = err
+            raise
+        finally:
+            if admitted:
+                assert scheduler is not None
+                scheduler.release(lane)
+            if trace is not None:
+                trace.finish(error)
+            if breaker is not None:
+                if error is not None:
+                    self._circuit_report_error(breaker, error, permit)
+                elif answered:
+                    breaker.on_success(permit)
+                else:
+                    breaker.on_abandoned(permit)
+            if sample is not None:
+                assert self._metrics is not None
+                sample.latency = time.monotonic() - start
+                self._metrics.record(sample)
 
     async def _api_send_action(
         self,
@@ -390,6 +1422,28 @@ class OlarmFlowClient:
         prolink_id: str | None = None,
     ) -> dict[str, Any]:
         """Send an action command to a device or prolink."""
+        if self._action_scheduler is not None:
+            return await self._api_within_own_deadline(
+                self._action_scheduler.submit(
+                    device_id,
+                    (action_cmd, action_num, prolink_id),
+                    lambda: self._api_send_action_now(
+                        device_id, action_cmd, action_num, prolink_id
+                    ),
+                )
+            )
+        return await self._api_send_action_now(
+            device_id, action_cmd, action_num, prolink_id
+        )
+
+    async def _api_send_action_now(
+        self,
+        device_id: str,
+        action_cmd: str,
+        action_num: int,
+        prolink_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Send an action command immediately, bypassing any queue."""
         if prolink_id is not None:
             return await self._api_make_request(
                 "POST",
@@ -405,6 +1459,18 @@ class OlarmFlowClient:
 
     def _handle_api_error(self, err: OlarmFlowClientApiError) -> None:
         """Handle common API errors by raising specific exceptions."""
+        mapped = self._map_api_error(err)
+        if mapped is err:
+            # Re-raise original error for other status codes
+            raise err
+        raise mapped from err
+
+    @staticmethod
+    def _map_api_error(err: OlarmFlowClientApiError) -> OlarmFlowClientApiError:
+        """Return the specific exception for a common API error.
+
+        Errors without a more specific type are returned unchanged.
+        """
         # Preserve the original error detail on the specific exception
         detail: dict[str, Any] = {
             "status_code": err.status_code,
@@ -417,18 +1483,16 @@ class OlarmFlowClient:
         if err.status_code == 401 or err.error_code == "tokenExpired":
             # Older deployed API versions report expired tokens as 403 with
             # an error code, so match on the code as well
-            raise TokenExpired(**detail) from err
+            return TokenExpired(**detail)
         elif err.status_code == 403:
-            raise Unauthorized(**detail) from err
+            return Unauthorized(**detail)
         elif err.status_code == 429:
-            raise RateLimited(**detail) from err
+            return RateLimited(**detail)
         elif err.status_code == 500:
-            raise ServerError(**detail) from err
+            return ServerError(**detail)
         elif err.status_code in (502, 503, 504):
-            raise ServiceUnavailable(**detail) from err
-        else:
-            # Re-raise original error for other status codes
-            raise err
+            return ServiceUnavailable(**detail)
+        return err
 
     async def update_access_token(self, access_token: str, expires_at: float) -> None:
         """Update the access token.
@@ -457,6 +1521,14 @@ class OlarmFlowClient:
             ServerError: When the server returns an internal error (500).
             OlarmFlowClientApiError: For other API errors.
         """
+        cache = self._response_cache
+        cache_key = ("devices", page, pageLength, search)
+        if cache is not None and (cached := cache.get(cache_key)) is not None:
+            return cached  # type: ignore[no-any-return]
+        # An MQTT update arriving while the request is in flight makes the
+        # response stale, so it is then not cached
+        generation = cache.generation if cache is not None else 0
+
         params = {
             "page": page,
             "pageLength": pageLength,
@@ -465,7 +1537,16 @@ class OlarmFlowClient:
         }
 
         try:
-            return await self._api_make_request("GET", "/api/v4/devices", params=params)
+            if (
+                self._hedging is not None
+                and pageLength is not None
+                and pageLength <= self._hedging.max_page_length
+            ):
+                result = await self._api_hedged_get("/api/v4/devices", params)
+            else:
+                result = await self._api_make_request(
+                    "GET", "/api/v4/devices", params=params
+                )
         except OlarmFlowClientApiError as err:
             # Handle specific status codes
             if err.status_code == 404:
@@ -474,6 +1555,104 @@ class OlarmFlowClient:
             self._handle_api_error(err)
             raise  # This line is never reached but satisfies mypy
 
+        if cache is not None and isinstance(result, dict):
+            # Tag the page with its devices so an update to any of them drops it
+            device_ids = [
+                device["deviceId"]
+                for device in result.get("data") or []
+                if isinstance(device, dict) and "deviceId" in device
+            ]
+            cache.set(cache_key, result, tags=device_ids, since=generation)
+        return result
+
+    async def stream_devices(
+        self,
+        page: int | None = 1,
+        pageLength: int | None = 100,
+        search: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream one page of devices, parsing them as the response arrives.
+
+        Like get_devices(), but each device is decoded and yielded as soon
+        as it has been received, keeping peak memory flat for very large
+        ``pageLength`` values. Only the ``data`` array is returned; streamed
+        pages bypass the response cache and retries.
+
+        Raises the same errors as get_devices().
+        """
+        params = {
+            "page": page,
+            "pageLength": pageLength,
+            "search": search,
+            "deviceApiAccessOnly": "1",
+        }
+        try:
+            async for device in self._api_stream_array(
+                "GET", "/api/v4/devices", "data", params=params
+            ):
+                yield device
+        except OlarmFlowClientApiError as err:
+            if err.status_code == 404:
+                raise DevicesNotFound() from err
+            self._handle_api_error(err)
+            raise  # This line is never reached but satisfies mypy
+
+    async def iter_devices(
+        self,
+        pageLength: int = 100,
+        search: str | None = None,
+        prefetch: int = 2,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over all devices on the account, page by page.
+
+        Devices are yielded as soon as their page arrives while up to
+        ``prefetch`` following pages are fetched concurrently. Iteration
+        stops after the first short (or empty) page, or when the API reports
+        DevicesNotFound; pages prefetched past the end are discarded.
+
+        Raises the same errors as get_devices(), except DevicesNotFound.
+
+        Raises:
+            ValueError: If ``prefetch`` is negative.
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch must be at least 0")
+        loop = asyncio.get_running_loop()
+        pending: deque[asyncio.Task[dict[str, Any]]] = deque()
+        next_page = 1
+
+        def schedule() -> None:
+            nonlocal next_page
+            pending.append(
+                loop.create_task(
+                    self.get_devices(
+                        page=next_page, pageLength=pageLength, search=search
+                    )
+                )
+            )
+            next_page += 1
+
+        try:
+            while True:
+                # The page read next plus up to ``prefetch`` pages after it
+                while len(pending) <= prefetch:
+                    schedule()
+                try:
+                    result = await pending.popleft()
+                except DevicesNotFound:
+                    return
+                devices = result.get("data") or []
+                for device in devices:
+                    yield device
+                if len(devices) < pageLength:
+                    return
+        finally:
+            # Drop prefetched pages the caller will never see
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     async def get_device(self, device_id: str) -> dict[str, Any]:
         """Get a specific device associated with the account.
 
@@ -484,11 +1663,15 @@ class OlarmFlowClient:
             ServerError: When the server returns an internal error (500).
             OlarmFlowClientApiError: For other API errors.
         """
+        cache = self._response_cache
+        cache_key = ("device", device_id)
+        if cache is not None and (cached := cache.get(cache_key)) is not None:
+            return cached  # type: ignore[no-any-return]
+        generation = cache.generation if cache is not None else 0
+
         try:
-            return await self._api_make_request(
-                "GET",
-                f"/api/v4/devices/{device_id}",
-                params={"deviceApiAccessOnly": "1"},
+            result = await self._api_hedged_get(
+                f"/api/v4/devices/{device_id}", params={"deviceApiAccessOnly": "1"}
             )
         except OlarmFlowClientApiError as err:
             # Handle specific status codes
@@ -499,6 +1682,65 @@ class OlarmFlowClient:
             self._handle_api_error(err)
             raise  # This line is never reached but satisfies mypy
 
+        if cache is not None:
+            cache.set(cache_key, result, tags=(device_id,), since=generation)
+        return result
+
+    async def get_devices_by_id(
+        self, device_ids: Iterable[str], concurrency: int = 10
+    ) -> AsyncIterator[tuple[str, dict[str, Any] | OlarmFlowClientApiError]]:
+        """Fetch many devices concurrently, yielding results as they complete.
+
+        At most ``concurrency`` get_device() calls are in flight at once.
+        Each item is a ``(device_id, result)`` tuple where ``result`` is the
+        device, or the exception raised for that device (e.g. DeviceNotFound
+        or RateLimited) so one failure does not abort the batch.
+
+        ``device_ids`` is read lazily by ``concurrency`` workers, so memory
+        stays proportional to ``concurrency`` however many ids are given.
+
+        Raises:
+            ValueError: If ``concurrency`` is below 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        loop = asyncio.get_running_loop()
+        ids = iter(device_ids)
+        # Finished fetches, an unexpected error, or None when a worker is done
+        results: asyncio.Queue[
+            tuple[str, dict[str, Any] | OlarmFlowClientApiError] | Exception | None
+        ] = asyncio.Queue(concurrency)
+
+        async def worker() -> None:
+            try:
+                for device_id in ids:
+                    result: dict[str, Any] | OlarmFlowClientApiError
+                    try:
+                        result = await self.get_device(device_id)
+                    except OlarmFlowClientApiError as err:
+                        result = err
+                    await results.put((device_id, result))
+            except Exception as err:  # noqa: BLE001
+                await results.put(err)
+            else:
+                await results.put(None)
+
+        workers = [loop.create_task(worker()) for _ in range(concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
     async def get_device_actions(self, device_id: str) -> dict[str, Any]:
         """Get list of past actions for a specific device."""
         return await self._api_make_request(
@@ -517,6 +1759,69 @@ class OlarmFlowClient:
             "GET", f"/api/v4/devices/{device_id}/events", params=params
         )
 
+    async def iter_device_events(
+        self,
+        device_id: str,
+        since: str | None = None,
+        page_size: int = 100,
+        until: Any | None = None,
+        max_events: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over a device's event history, following the ``after`` cursor.
+
+        Starts after the ``since`` cursor (from the beginning if None) and
+        requests the next page as soon as the current one arrives, so it
+        downloads while the caller processes the current page. The cursor
+        for the next page is the last event's ``eventId``.
+
+        Args:
+            device_id: Device whose events are read.
+            since: Cursor to resume from, as accepted by ``after``.
+            page_size: Events requested per page.
+            until: Stop at the first event whose ``eventTs`` is later than
+                this value (same units as the API).
+            max_events: Stop after yielding this many events.
+        """
+        loop = asyncio.get_running_loop()
+        yielded = 0
+        cursor = since
+        next_page: asyncio.Task[dict[str, Any]] | None = loop.create_task(
+            self.get_device_events(device_id, limit=page_size, after=cursor)
+        )
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                events = (page.get("data") if isinstance(page, dict) else None) or []
+                last_cursor = events[-1].get(EVENTS_CURSOR_FIELD) if events else None
+                # A short page is the last one; a cursor that doesn't advance
+                # would loop forever
+                if (
+                    len(events) >= page_size
+                    and last_cursor is not None
+                    and last_cursor != cursor
+                ):
+                    cursor = last_cursor
+                    next_page = loop.create_task(
+                        self.get_device_events(device_id, limit=page_size, after=cursor)
+                    )
+                for event in events:
+                    timestamp = event.get(EVENTS_TIMESTAMP_FIELD)
+                    if (
+                        until is not None
+                        and timestamp is not None
+                        and timestamp > until
+                    ):
+                        return
+                    yield event
+                    yielded += 1
+                    if max_events is not None and yielded >= max_events:
+                        return
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
+
     async def send_device_area_disarm(
         self, device_id: str, area_num: int
     ) -> dict[str, Any]:
@@ -679,6 +1984,125 @@ class OlarmFlowClient:
         """Send User Panic."""
         return await self._api_send_action(device_id, "user-panic", 0)
 
+    async def send_bulk_actions(
+        self, actions: Iterable[BulkAction], concurrency: int = 10
+    ) -> BulkActionSummary:
+        """Send many actions with bounded concurrency and collect every outcome.
+
+        At most ``concurrency`` actions are in flight at once, and every call
+        goes through the client's rate limiter (if any), so bulk dispatch
+        shares the client's rate budget. Failures don't stop the batch:
+        each result records success, the (mapped) exception such as
+        RateLimited or ServiceUnavailable, and its latency.
+
+        Raises:
+            ValueError: If ``concurrency`` is below 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        async def send(action: BulkAction) -> BulkActionResult:
+            start = time.monotonic()
+            error: Exception
+            try:
+                response = await self._api_send_action(
+                    action.device_id,
+                    action.action_cmd,
+                    action.action_num,
+                    action.prolink_id,
+                )
+            except OlarmFlowClientApiError as err:
+                error = self._map_api_error(err)
+            except Exception as err:  # noqa: BLE001
+                error = err
+            else:
+                return BulkActionResult(
+                    action,
+                    success=True,
+                    response=response,
+                    latency=time.monotonic() - start,
+                )
+            return BulkActionResult(
+                action, success=False, error=error, latency=time.monotonic() - start
+            )
+
+        # ``concurrency`` workers take the actions in turn, so only the
+        # actions in flight have a coroutine at any time
+        indexed = enumerate(actions)
+        results: dict[int, BulkActionResult] = {}
+
+        async def worker() -> None:
+            for index, action in indexed:
+                results[index] = await send(action)
+
+        loop = asyncio.get_running_loop()
+        workers = [loop.create_task(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return BulkActionSummary([results[index] for index in sorted(results)])
+
+    async def send_and_confirm(
+        self,
+        device_id: str,
+        action_cmd: str,
+        action_num: int,
+        match: Callable[[dict[str, Any]], bool] | None = None,
+        timeout: float = 30.0,
+        prolink_id: str | None = None,
+    ) -> float:
+        """Send an action and wait until MQTT shows it took effect.
+
+        A waiter is registered for the device before the action is sent and
+        resolves on the first MQTT message for the device for which
+        ``match(payload)`` is true. Area arm/disarm/stay/sleep commands have
+        a default matcher that checks the area's state; other commands need
+        an explicit ``match``. The device must be subscribed with
+        subscribe_to_device() while MQTT is running.
+
+        Returns:
+            Seconds from sending the action to its confirmation.
+
+        Raises:
+            ActionNotConfirmed: If no matching message arrives in ``timeout``.
+            ValueError: If no matcher is given for a command without a default.
+            RuntimeError: If the device is not subscribed.
+            OlarmFlowClientApiError: If sending the action fails.
+        """
+        if match is None:
+            if action_cmd not in _AREA_CONFIRM_STATES:
+                raise ValueError(f"No default confirmation for '{action_cmd}'")
+            match = _area_state_matcher(action_cmd, action_num)
+        topic = f"v4/devices/{device_id}"
+        if topic not in self._mqtt_callbacks:
+            raise RuntimeError(
+                f"Device '{device_id}' must be subscribed to confirm actions"
+            )
+
+        future: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+        waiter = (match, future)
+        self._mqtt_waiters.setdefault(topic, []).append(waiter)
+        start = time.monotonic()
+        try:
+            await self._api_send_action(device_id, action_cmd, action_num, prolink_id)
+            remaining = max(0.0, timeout - (time.monotonic() - start))
+            try:
+                confirmed_at = await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError as e:
+                raise ActionNotConfirmed(
+                    f"Action '{action_cmd}' on device '{device_id}' was not "
+                    f"confirmed within {timeout:.0f}s"
+                ) from e
+        finally:
+            waiters = self._mqtt_waiters.get(topic)
+            if waiters is not None and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._mqtt_waiters[topic]
+        return confirmed_at - start
+
     async def start_mqtt_async(
         self,
         user_id: str,
@@ -699,7 +2123,7 @@ class OlarmFlowClient:
             client_id_suffix: Suffix for the MQTT client id.
             timeout: Seconds to wait for the first connection.
             tls_context: Optional SSL context; a default one is built in a
-                worker thread if omitted.
+                worker thread if omitted (ignored with ``mqtt_tls=False``).
 
         Raises:
             MqttAuthError: If the broker refuses the connection due to bad
@@ -726,17 +2150,14 @@ class OlarmFlowClient:
 
         if tls_context is not None:
             self._mqtt_tls_context = tls_context
-        elif self._mqtt_tls_context is None:
-            # Loading CA certs blocks, so build the context off the event loop
-            self._mqtt_tls_context = await loop.run_in_executor(
-                None, ssl.create_default_context
-            )
+        else:
+            await self._mqtt_build_tls_context()
 
         _LOGGER.debug(
             "MQTT: starting client over websockets (client_id=%s, host=%s, port=%s)",
             self._mqtt_clientId,
-            MQTT_HOST,
-            MQTT_PORT,
+            self._mqtt_host,
+            self._mqtt_port,
         )
 
         first_connect: asyncio.Future[None] = loop.create_future()
@@ -755,6 +2176,15 @@ class OlarmFlowClient:
             self.stop_mqtt()
             raise
 
+    async def _mqtt_build_tls_context(self) -> None:
+        """Build the default MQTT TLS context once, off the event loop."""
+        if self._mqtt_tls and self._mqtt_tls_context is None:
+            # Loading CA certs blocks, so build the context in a worker thread
+            loop = asyncio.get_running_loop()
+            context = await loop.run_in_executor(None, ssl.create_default_context)
+            if self._mqtt_tls_context is None:
+                self._mqtt_tls_context = context
+
     async def _mqtt_loop(self, first_connect: asyncio.Future[None]) -> None:
         """Connect/reconnect loop following the aiomqtt reconnect pattern.
 
@@ -762,24 +2192,49 @@ class OlarmFlowClient:
         access token, so tokens rotated via ``update_access_token()`` are
         picked up automatically.
         """
+        connect_span: Span | None = None
         try:
             while True:
                 self._call_status_callback("connecting", {})
+                if self._tracer is not None:
+                    connect_span = self._tracer.start_span(
+                        "olarm.mqtt.connect",
+                        {
+                            "server.address": self._mqtt_host,
+                            "server.port": self._mqtt_port,
+                        },
+                    )
                 try:
                     async with self._make_mqtt_client() as client:
+                        if connect_span is not None:
+                            connect_span.end()
+                            connect_span = None
                         self._mqtt_client = client
                         for topic in self._mqtt_callbacks:
                             _LOGGER.debug("MQTT: (re)subscribing (topic=%s)", topic)
-                            await client.subscribe(topic)
+                            await self._mqtt_subscribe_traced(client, topic)
                         self._mqtt_retries = 0
                         _LOGGER.debug("MQTT: connected to broker")
                         if not first_connect.done():
                             first_connect.set_result(None)
                         self._call_status_callback("connected", {})
                         async for message in client.messages:
-                            self._mqtt_dispatch(str(message.topic), message.payload)
+                            topic = str(message.topic)
+                            if self._tracer is None:
+                                self._mqtt_dispatch(topic, message.payload)
+                                continue
+                            with traced(
+                                self._tracer,
+                                "olarm.mqtt.dispatch",
+                                {"messaging.destination.name": topic},
+                            ):
+                                self._mqtt_dispatch(topic, message.payload)
                 except aiomqtt.MqttError as err:
                     self._mqtt_client = None
+                    if connect_span is not None:
+                        connect_span.record_exception(err)
+                        connect_span.end()
+                        connect_span = None
                     if not first_connect.done():
                         # First connect failed: surface the error through
                         # start_mqtt_async() and don't retry
@@ -810,18 +2265,21 @@ class OlarmFlowClient:
                     await asyncio.sleep(delay)
         finally:
             self._mqtt_client = None
+            if connect_span is not None:
+                # Stopped while connecting
+                connect_span.end()
 
     def _make_mqtt_client(self) -> aiomqtt.Client:
         """Build a new aiomqtt client using the current access token."""
         return aiomqtt.Client(
-            hostname=MQTT_HOST,
-            port=MQTT_PORT,
+            hostname=self._mqtt_host,
+            port=self._mqtt_port,
             username=MQTT_USER,
             password=self._access_token,
             identifier=self._mqtt_clientId,
             transport="websockets",
             websocket_path="/mqtt",
-            tls_context=self._mqtt_tls_context,
+            tls_context=self._mqtt_tls_context if self._mqtt_tls else None,
             keepalive=MQTT_KEEPALIVE,
         )
 
@@ -882,6 +2340,23 @@ class OlarmFlowClient:
         """Set a callback to be called when MQTT connection status changes."""
         self._mqtt_status_callback = callback
 
+    def set_circuit_status_callback(
+        self,
+        callback: Callable[[CircuitState, dict[str, Any]], None],
+    ) -> None:
+        """Set a callback to be called when the circuit breaker changes state.
+
+        The callback receives "closed", "open" or "half_open" and an info
+        dict with ``failures`` (consecutive failures) and, when opening,
+        ``retry_after`` (seconds until probing).
+
+        Raises:
+            RuntimeError: If the client has no circuit breaker.
+        """
+        if self._circuit_breaker is None:
+            raise RuntimeError("No circuit breaker configured for this client")
+        self._circuit_breaker.on_state_change = callback
+
     def _call_status_callback(
         self,
         status: Literal["connecting", "connected", "disconnected", "reconnecting"],
@@ -931,28 +2406,68 @@ class OlarmFlowClient:
     async def _mqtt_subscribe_now(self, client: aiomqtt.Client, topic: str) -> None:
         """Subscribe to a topic on a live connection."""
         try:
-            await client.subscribe(topic)
+            await self._mqtt_subscribe_traced(client, topic)
         except aiomqtt.MqttError as err:
             # The reconnect loop re-subscribes on the next connect
             _LOGGER.debug("MQTT: live subscribe failed (topic=%s): %s", topic, err)
         except Exception:  # noqa: BLE001
             _LOGGER.exception("MQTT: unexpected error subscribing (topic=%s)", topic)
 
+    async def _mqtt_subscribe_traced(self, client: aiomqtt.Client, topic: str) -> None:
+        """Subscribe to a topic, in a span when tracing is enabled."""
+        if self._tracer is None:
+            await client.subscribe(topic)
+            return
+        with traced(
+            self._tracer, "olarm.mqtt.subscribe", {"messaging.destination.name": topic}
+        ):
+            await client.subscribe(topic)
+
     def _mqtt_dispatch(self, topic: str, payload: Any) -> None:
         """Decode a message payload and dispatch it to the registered callback."""
+        if self._response_cache is not None and topic.startswith("v4/devices/"):
+            # The device changed, so cached reads mentioning it are stale
+            self._response_cache.invalidate_tag(topic[len("v4/devices/") :])
         callback = self._mqtt_callbacks.get(topic)
-        if callback is None:
+        waiters = self._mqtt_waiters.get(topic)
+        if callback is None and not waiters:
             return
         try:
-            if isinstance(payload, (bytes, bytearray)):
-                payload = payload.decode()
-            data = json.loads(payload)
-        except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValueError):
+            # Codecs decode bytes directly, without an intermediate str
+            data = self._json.loads(payload)
+        except (TypeError, ValueError):
             _LOGGER.error(
                 "MQTT: failed to decode message payload (topic=%s): %s", topic, payload
             )
             return
+        if waiters:
+            self._mqtt_resolve_waiters(topic, waiters, data)
+        if callback is None:
+            return
         try:
             callback(topic, data)
         except Exception:  # noqa: BLE001
             _LOGGER.exception("MQTT: error processing message (topic=%s)", topic)
+
+    def _mqtt_resolve_waiters(
+        self,
+        topic: str,
+        waiters: list[tuple[Callable[[dict[str, Any]], bool], asyncio.Future[float]]],
+        data: Any,
+    ) -> None:
+        """Resolve the send_and_confirm() waiters that this message matches.
+
+        Waiters are indexed by topic, so only the waiters for this device
+        are checked.
+        """
+        now = time.monotonic()
+        for match, future in waiters:
+            if future.done():
+                continue
+            try:
+                matched = isinstance(data, dict) and match(data)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("MQTT: confirmation matcher raised (topic=%s)", topic)
+                continue
+            if matched:
+                future.set_result(now)
@@ -0,0 +1,180 @@
+"""Priority lanes for REST requests."""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+import time
+from typing import Any, Literal
+
+Lane = Literal["critical", "interactive", "bulk"]
+
+# Lanes from highest to lowest priority
+LANES: tuple[Lane, ...] = ("critical", "interactive", "bulk")
+
+# Action commands that are always sent in the critical lane
+CRITICAL_ACTIONS = frozenset({"user-panic", "area-disarm"})
+
+_lane_override: ContextVar[Lane | None] = ContextVar(
+    "olarmflowclient_lane", default=None
+)
+
+
+@contextmanager
+def request_lane(lane: Lane) -> Iterator[None]:
+    """Send the requests made inside the block in ``lane``.
+
+    Critical action commands stay in the critical lane regardless.
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane '{lane}'")
+    token = _lane_override.set(lane)
+    try:
+        yield
+    finally:
+        _lane_override.reset(token)
+
+
+def classify_request(
+    method: str, endpoint: str, json_body: dict[str, Any] | None = None
+) -> Lane:
+    """Return the lane for a request.
+
+    Panic and disarm commands are critical. Otherwise a lane set with
+    request_lane() wins; failing that, device list and event history reads
+    are bulk and everything else (single device reads, other actions) is
+    interactive.
+    """
+    if json_body is not None and json_body.get("actionCmd") in CRITICAL_ACTIONS:
+        return "critical"
+    override = _lane_override.get()
+    if override is not None:
+        return override
+    if method == "GET" and (
+        endpoint == "/api/v4/devices" or endpoint.endswith("/events")
+    ):
+        return "bulk"
+    return "interactive"
+
+
+class PriorityScheduler:
+    """Admits REST requests by lane, highest priority first.
+
+    At most ``max_concurrent`` requests are in flight at once, of which
+    ``reserved_critical`` slots can only be used by the critical lane, so a
+    panic or disarm always finds a free slot even while a large bulk sync
+    is running. Waiting requests are admitted critical first, then
+    interactive, then bulk, and in FIFO order within a lane.
+
+    Keep ``max_concurrent`` at or below the client's connection pool limit
+    so every admitted request also gets a connection without waiting.
+    """
+
+    def __init__(self, max_concurrent: int = 10, reserved_critical: int = 2) -> None:
+        """Initialize the scheduler."""
+        if not 0 <= reserved_critical < max_concurrent:
+            # Other lanes need at least one slot
+            raise ValueError("reserved_critical must be below max_concurrent")
+        self._max_concurrent = max_concurrent
+        self._reserved = reserved_critical
+        self._queues: dict[Lane, deque[asyncio.Future[None]]] = {
+            lane: deque() for lane in LANES
+        }
+        self._in_flight: dict[Lane, int] = dict.fromkeys(LANES, 0)
+        self._admitted: dict[Lane, int] = dict.fromkeys(LANES, 0)
+        self._wait_total: dict[Lane, float] = dict.fromkeys(LANES, 0.0)
+        self._wait_max: dict[Lane, float] = dict.fromkeys(LANES, 0.0)
+
+    def _has_slot(self, lane: Lane) -> bool:
+        total = sum(self._in_flight.values())
+        if lane == "critical":
+            return total < self._max_concurrent
+        shared = total - self._in_flight["critical"]
+        return (
+            total < self._max_concurrent
+            and shared < self._max_concurrent - self._reserved
+        )
+
+    def _queued_ahead(self, lane: Lane) -> bool:
+        for other in LANES:
+            if self._queues[other]:
+                return True
+            if other == lane:
+                return False
+        return False
+
+    async def acquire(self, lane: Lane) -> float:
+        """Wait for a slot in ``lane`` and return the seconds waited.
+
+        Every successful acquire must be paired with a release().
+        """
+        if not self._queued_ahead(lane) and self._has_slot(lane):
+            self._admit(lane)
+            return 0.0
+
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queues[lane].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller was cancelled: give it back
+                self.release(lane)
+            elif future in self._queues[lane]:
+                self._queues[lane].remove(future)
+            raise
+        waited = time.monotonic() - start
+        self._wait_total[lane] += waited
+        self._wait_max[lane] = max(self._wait_max[lane], waited)
+        return waited
+
+    def release(self, lane: Lane) -> None:
+        """Free the slot held by a finished request and admit waiters."""
+        self._in_flight[lane] -= 1
+        for next_lane in LANES:
+            queue = self._queues[next_lane]
+            while queue and self._has_slot(next_lane):
+                future = queue.popleft()
+                if future.done():
+                    # Cancelled while queued; its acquire() won't hold a slot
+                    continue
+                self._admit(next_lane)
+                future.set_result(None)
+
+    def _admit(self, lane: Lane) -> None:
+        self._in_flight[lane] += 1
+        self._admitted[lane] += 1
+
+    @asynccontextmanager
+    async def slot(self, lane: Lane) -> AsyncIterator[float]:
+        """Hold a slot in ``lane`` for the duration of the block."""
+        waited = await self.acquire(lane)
+        try:
+            yield waited
+        finally:
+            self.release(lane)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return per-lane statistics.
+
+        ``queued`` and ``in_flight`` are current counts; ``requests`` is
+        the number admitted so far and ``wait_total``/``wait_max``/
+        ``wait_avg`` the seconds they spent queued.
+        """
+        return {
+            lane: {
+                "queued": len(self._queues[lane]),
+                "in_flight": self._in_flight[lane],
+                "requests": self._admitted[lane],
+                "wait_total": self._wait_total[lane],
+                "wait_max": self._wait_max[lane],
+                "wait_avg": (
+                    self._wait_total[lane] / self._admitted[lane]
+                    if self._admitted[lane]
+                    else 0.0
+                ),
+            }
+            for lane in LANES
+        }
@@ -0,0 +1,127 @@
+"""Client-side adaptive rate limiting for the Olarm REST API."""
+
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to server feedback (AIMD).
+
+    Every REST call takes one token before it is sent. The permitted rate
+    is cut multiplicatively when the API answers 429, all calls are paused
+    for any ``Retry-After`` the server sends, and the rate then recovers
+    additively (by roughly ``increase`` requests/second per second of
+    successful traffic) back up to ``max_rate``.
+
+    One limiter can be shared between several clients using the same token.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float | None = None,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Initial permitted requests per second.
+            burst: Bucket capacity; defaults to one second's worth of tokens.
+            min_rate: Floor for the permitted rate after repeated 429s.
+            max_rate: Ceiling for recovery; defaults to ``rate``.
+            increase: Additive recovery step, in requests/second.
+            decrease: Multiplicative factor applied on a 429.
+            decrease_cooldown: Seconds during which further 429s (usually
+                from requests already in flight) don't cut the rate again.
+        """
+        self._rate = rate
+        self._min_rate = min_rate
+        self._max_rate = max_rate if max_rate is not None else rate
+        self._burst = burst if burst is not None else max(1.0, rate)
+        self._increase = increase
+        self._decrease = decrease
+        self._decrease_cooldown = decrease_cooldown
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._waiting = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Currently permitted requests per second."""
+        return self._rate
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a token."""
+        return self._waiting
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self, priority: bool = False) -> None:
+        """Wait until a request may be sent.
+
+        A ``priority`` call skips the queue of waiting callers: it only
+        waits out a ``Retry-After`` pause and then borrows a token, so the
+        callers behind it wait a little longer but the overall rate holds.
+        """
+        self._waiting += 1
+        try:
+            if priority:
+                while True:
+                    now = time.monotonic()
+                    delay = self._paused_until - now
+                    if delay <= 0:
+                        self._refill(now)
+                        self._tokens -= 1
+                        return
+                    await asyncio.sleep(delay)
+            # The lock keeps waiters in FIFO order
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    delay = self._paused_until - now
+                    if delay <= 0:
+                        if self._tokens >= 1:
+                            self._tokens -= 1
+                            return
+                        delay = (1 - self._tokens) / self._rate
+                    await asyncio.sleep(delay)
+        finally:
+            self._waiting -= 1
+
+    def on_success(self) -> None:
+        """Record a successful response and recover the rate gradually."""
+        if self._rate < self._max_rate:
+            self._rate = min(self._max_rate, self._rate + self._increase / self._rate)
+
+    def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """Record a 429 response: cut the rate and honour ``Retry-After``."""
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        self._refill(now)
+        self._tokens = min(self._tokens, 0.0)
+        if now - self._last_decrease < self._decrease_cooldown:
+            return
+        self._last_decrease = now
+        self._rate = max(self._min_rate, self._rate * self._decrease)
+        _LOGGER.debug(
+            "API: rate limited, permitted rate lowered to %.2f/s (retry_after=%s)",
+            self._rate,
+            retry_after,
+        )
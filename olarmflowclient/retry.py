@@ -0,0 +1,33 @@
+"""Retry policy for transient Olarm REST API failures."""
+
+from dataclasses import dataclass
+import random
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How the client retries transient REST API failures.
+
+    Delays follow "decorrelated jitter": each delay is drawn uniformly
+    between ``base_delay`` and three times the previous delay, capped at
+    ``max_delay``. No retry is started once it would push the call past
+    ``total_budget`` seconds, measured from the first attempt.
+
+    Attributes:
+        max_attempts: Total attempts per call, including the first.
+        base_delay: Minimum delay between attempts, in seconds.
+        max_delay: Maximum delay between attempts, in seconds.
+        total_budget: Upper bound on the time spent on one call, in seconds.
+        retry_statuses: HTTP status codes treated as transient.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    total_budget: float = 30.0
+    retry_statuses: frozenset[int] = frozenset({500, 502, 503, 504})
+
+    def next_delay(self, previous: float) -> float:
+        """Return the delay before the next attempt."""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
@@ -0,0 +1,122 @@
+"""Incremental extraction of a JSON array from a streamed response body."""
+
+import re
+
+# Bytes that can change the parser state; everything else is skipped over
+_TOKEN = re.compile(rb'["\\{}\[\],:]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_OPEN = frozenset(b"{[")
+_CLOSE = frozenset(b"}]")
+_COLON = ord(":")
+
+_SEEK, _ARRAY, _DONE = range(3)
+
+
+class JsonArrayStreamer:
+    """Split the array under a top-level key of a JSON object into items.
+
+    Feed response chunks in order; each call returns the raw JSON bytes of
+    the array items completed so far, ready for a codec's ``loads``. Only
+    the item being assembled is buffered, so memory stays flat regardless
+    of the array length. Items must be objects or arrays (scalar items are
+    skipped); the rest of the document is scanned but not kept.
+    """
+
+    def __init__(self, key: str = "data") -> None:
+        """Initialize the streamer for the array under ``key``."""
+        self._key = key.encode()
+        self._buf = bytearray()
+        self._pos = 0
+        self._mode = _SEEK
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: bytes | None = None
+        self._key_matched = False
+        self._item_start: int | None = None
+
+    @property
+    def done(self) -> bool:
+        """True once the end of the array has been reached."""
+        return self._mode == _DONE
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Consume a chunk and return the raw items completed by it."""
+        if self._mode == _DONE:
+            return []
+        buf = self._buf
+        buf += chunk
+        items: list[bytes] = []
+        pos = self._pos
+        while True:
+            if self._escape:
+                if pos >= len(buf):
+                    break
+                pos += 1
+                self._escape = False
+                continue
+            match = _TOKEN.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            index = match.start()
+            char = buf[index]
+            pos = index + 1
+
+            if self._in_string:
+                if char == _BACKSLASH:
+                    self._escape = True
+                elif char == _QUOTE:
+                    self._in_string = False
+                    if self._mode == _SEEK and self._depth == 1:
+                        self._last_string = bytes(buf[self._string_start : index])
+                continue
+
+            if char == _QUOTE:
+                self._in_string = True
+                self._string_start = pos
+                continue
+
+            if self._mode == _SEEK:
+                if self._depth == 1 and char == _COLON:
+                    self._key_matched = self._last_string == self._key
+                    continue
+                if char in _OPEN:
+                    self._depth += 1
+                    if self._key_matched and self._depth == 2 and char == ord("["):
+                        self._mode = _ARRAY
+                elif char in _CLOSE:
+                    self._depth -= 1
+                self._key_matched = False
+                continue
+
+            # _ARRAY: the array itself sits at depth 2
+            if char in _OPEN:
+                self._depth += 1
+                if self._depth == 3:
+                    self._item_start = index
+            elif char in _CLOSE:
+                self._depth -= 1
+                if self._depth == 2 and self._item_start is not None:
+                    items.append(bytes(buf[self._item_start : pos]))
+                    self._item_start = None
+                elif self._depth == 1:
+                    self._mode = _DONE
+                    break
+
+        # Drop everything that is no longer needed
+        if self._item_start is not None:
+            keep = self._item_start
+        elif self._in_string and self._mode == _SEEK:
+            keep = self._string_start
+        else:
+            keep = pos
+        del buf[:keep]
+        self._pos = pos - keep
+        if self._item_start is not None:
+            self._item_start -= keep
+        self._string_start -= keep
+        return items
@@ -0,0 +1,268 @@
+"""Resumable incremental sync of device event history."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+import inspect
+import logging
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from .const import EVENTS_CURSOR_FIELD, EVENTS_TIMESTAMP_FIELD
+
+if TYPE_CHECKING:
+    from .olarmflowclient import OlarmFlowClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CursorStore(ABC):
+    """Persists the last synced event cursor for each device."""
+
+    @abstractmethod
+    async def load(self, device_id: str) -> str | None:
+        """Return the stored cursor for a device, or None to start over."""
+
+    @abstractmethod
+    async def save(
+        self, device_id: str, cursor: str, event_time: float | None = None
+    ) -> None:
+        """Store the cursor of the last event handled for a device.
+
+        Args:
+            device_id: The device synced.
+            cursor: Cursor of the last event handled.
+            event_time: Time of that event in epoch seconds, if known.
+        """
+
+    async def load_event_time(self, device_id: str) -> float | None:
+        """Return the time of the event at the stored cursor, if known."""
+        return None
+
+    async def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class SqliteCursorStore(CursorStore):
+    """Cursor store backed by a local SQLite database file.
+
+    The database is opened on first use, and it and every query run in a
+    worker thread so the event loop is never blocked.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store for the database at ``path``.
+
+        The file is created if needed when the store is first used.
+        """
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the open connection, opening it first if needed.
+
+        Must be called with the lock held.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS event_cursors ("
+                    "device_id TEXT PRIMARY KEY, cursor TEXT NOT NULL, "
+                    "updated_at REAL NOT NULL, event_time REAL)"
+                )
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(event_cursors)")
+                }
+                if "event_time" not in columns:
+                    conn.execute("ALTER TABLE event_cursors ADD COLUMN event_time REAL")
+            self._conn = conn
+        return self._conn
+
+    def _load(self, device_id: str) -> tuple[str, float | None] | None:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT cursor, event_time FROM event_cursors WHERE device_id = ?",
+                    (device_id,),
+                )
+                .fetchone()
+            )
+        return (row[0], row[1]) if row else None
+
+    def _save(self, device_id: str, cursor: str, event_time: float | None) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO event_cursors "
+                    "(device_id, cursor, updated_at, event_time) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(device_id) DO UPDATE SET "
+                    "cursor = excluded.cursor, updated_at = excluded.updated_at, "
+                    "event_time = excluded.event_time",
+                    (device_id, cursor, time.time(), event_time),
+                )
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def load(self, device_id: str) -> str | None:
+        """Return the stored cursor for a device, or None to start over."""
+        row = await asyncio.to_thread(self._load, device_id)
+        return row[0] if row else None
+
+    async def save(
+        self, device_id: str, cursor: str, event_time: float | None = None
+    ) -> None:
+        """Store the cursor of the last event handled for a device."""
+        await asyncio.to_thread(self._save, device_id, cursor, event_time)
+
+    async def load_event_time(self, device_id: str) -> float | None:
+        """Return the time of the event at the stored cursor, if known."""
+        row = await asyncio.to_thread(self._load, device_id)
+        return row[1] if row else None
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await asyncio.to_thread(self._close)
+
+
+@dataclass
+class DeviceSyncStatus:
+    """Outcome of syncing one device.
+
+    Attributes:
+        device_id: The device synced.
+        events: New events handled during this run.
+        cursor: Cursor stored after the run (the resume point).
+        last_event_ts: ``eventTs`` of the newest event handled, if any.
+        lag: Seconds between the newest event synced, including one from
+            an earlier run, and the end of the sync, or None if unknown.
+        error: The exception that stopped this device's sync, if any.
+    """
+
+    device_id: str
+    events: int = 0
+    cursor: str | None = None
+    last_event_ts: Any = None
+    lag: float | None = None
+    error: Exception | None = None
+
+
+def _event_time(timestamp: Any) -> float | None:
+    """Return an event timestamp in epoch seconds (accepts s or ms)."""
+    if not isinstance(timestamp, (int, float)):
+        return None
+    return timestamp / 1000 if timestamp > 1e11 else float(timestamp)
+
+
+class EventSync:
+    """Incrementally sync event history for many devices.
+
+    Each device resumes from the cursor saved by the previous run, and
+    events are handed to ``on_events`` one page at a time. The cursor is
+    saved only after ``on_events`` returns, so an interrupted run repeats at
+    most one page per device (at-least-once delivery).
+    """
+
+    def __init__(
+        self,
+        client: "OlarmFlowClient",
+        store: CursorStore,
+        on_events: Callable[[str, list[dict[str, Any]]], Awaitable[None] | None],
+        concurrency: int = 8,
+        page_size: int = 100,
+    ) -> None:
+        """Initialize the sync engine.
+
+        Args:
+            client: Client used to read events.
+            store: Where per-device cursors are persisted.
+            on_events: Called with (device_id, events) for every page; may
+                be a coroutine function.
+            concurrency: Maximum devices synced at the same time.
+            page_size: Events requested per page.
+        """
+        self._client = client
+        self._store = store
+        self._on_events = on_events
+        self._concurrency = concurrency
+        self._page_size = page_size
+        self._status: dict[str, DeviceSyncStatus] = {}
+
+    @property
+    def status(self) -> dict[str, DeviceSyncStatus]:
+        """Per-device status of the current or last run."""
+        return self._status
+
+    async def run(self, device_ids: Iterable[str]) -> dict[str, DeviceSyncStatus]:
+        """Sync all devices and return their status.
+
+        A failure on one device is recorded in its status and does not stop
+        the others.
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def sync_one(device_id: str) -> None:
+            async with semaphore:
+                await self._sync_device(device_id)
+
+        self._status = {
+            device_id: DeviceSyncStatus(device_id) for device_id in device_ids
+        }
+        await asyncio.gather(*(sync_one(device_id) for device_id in self._status))
+        return self._status
+
+    async def _sync_device(self, device_id: str) -> None:
+        status = self._status[device_id]
+        try:
+            status.cursor = await self._store.load(device_id)
+            batch: list[dict[str, Any]] = []
+            async for event in self._client.iter_device_events(
+                device_id, since=status.cursor, page_size=self._page_size
+            ):
+                batch.append(event)
+                if len(batch) >= self._page_size:
+                    await self._flush(status, batch)
+                    batch = []
+            if batch:
+                await self._flush(status, batch)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Sync: device %s failed: %s", device_id, err)
+            status.error = err
+        event_time = _event_time(status.last_event_ts)
+        if event_time is None and status.cursor is not None:
+            # Nothing new this run: the device is as far behind as the
+            # event at its stored cursor
+            try:
+                event_time = await self._store.load_event_time(device_id)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Sync: device %s lag unknown: %s", device_id, err)
+        if event_time is not None:
+            status.lag = max(0.0, time.time() - event_time)
+
+    async def _flush(
+        self, status: DeviceSyncStatus, batch: list[dict[str, Any]]
+    ) -> None:
+        result = self._on_events(status.device_id, batch)
+        if inspect.isawaitable(result):
+            await result
+        last = batch[-1]
+        status.events += len(batch)
+        status.last_event_ts = last.get(EVENTS_TIMESTAMP_FIELD, status.last_event_ts)
+        cursor = last.get(EVENTS_CURSOR_FIELD)
+        if cursor is not None:
+            status.cursor = str(cursor)
+            await self._store.save(
+                status.device_id,
+                status.cursor,
+                _event_time(last.get(EVENTS_TIMESTAMP_FIELD)),
+            )
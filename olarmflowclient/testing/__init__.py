@@ -0,0 +1,10 @@
+"""Local stand-ins for the Olarm API and MQTT broker, for offline load tests."""
+
+from .api import FakeOlarmApi, fake_device
+from .mqtt import FakeMqttBroker
+
+__all__ = [
+    "FakeOlarmApi",
+    "FakeMqttBroker",
+    "fake_device",
+]
@@ -0,0 +1,311 @@
+"""Local stand-in for the Olarm REST API."""
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable
+import random
+import time
+from typing import Any
+
+from aiohttp import web
+
+from ..metrics import endpoint_template
+from .server import LocalServer
+
+# Area state after each area command, as reported by real devices
+_AREA_ACTION_STATES = {
+    "area-arm": "arm",
+    "area-disarm": "disarm",
+    "area-stay": "stay",
+    "area-sleep": "sleep",
+}
+
+# Zone state after each zone command ("b" bypassed, "c" closed)
+_ZONE_ACTION_STATES = {
+    "zone-bypass": "b",
+    "zone-unbypass": "c",
+}
+
+StateListener = Callable[[str, dict[str, Any]], None]
+
+
+def fake_device(index: int, areas: int = 2, zones: int = 8) -> dict[str, Any]:
+    """Return a synthetic device shaped like the API's device objects.
+
+    Areas start disarmed and zones closed.
+    """
+    return {
+        "deviceId": f"device-{index:05d}",
+        "deviceName": f"Site {index}",
+        "deviceSerial": f"SN{index:08d}",
+        "deviceStatus": "online",
+        "deviceState": {
+            "timestamp": int(time.time() * 1000),
+            "areas": ["disarm"] * areas,
+            "zones": ["c"] * zones,
+        },
+        "deviceProfile": {
+            "areasLabels": [f"Area {n}" for n in range(1, areas + 1)],
+            "zonesLabels": [f"Zone {n}" for n in range(1, zones + 1)],
+            "zonesTypes": [10] * zones,
+        },
+    }
+
+
+class FakeOlarmApi(LocalServer):
+    """In-process Olarm REST API serving synthetic devices.
+
+    Implements ``/api/v4/devices``, ``/api/v4/devices/{id}``,
+    ``/api/v4/devices/{id}/actions`` (GET and POST) and
+    ``/api/v4/devices/{id}/events``. Every request is delayed by
+    ``latency`` plus up to ``jitter`` seconds, then answered with 429 (with
+    a ``Retry-After`` header) for a ``rate_limit_ratio`` fraction of
+    requests and with a random status from ``error_statuses`` for an
+    ``error_ratio`` fraction.
+
+    Area and zone commands change the device state, and state listeners
+    (e.g. a FakeMqttBroker) are told about every change::
+
+        async with FakeOlarmApi(devices=100, latency=0.02) as api:
+            client = OlarmFlowClient("token", base_url=api.url)
+    """
+
+    def __init__(
+        self,
+        devices: int | Iterable[dict[str, Any]] = 10,
+        events_per_device: int = 100,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        retry_after: int = 1,
+        error_ratio: float = 0.0,
+        error_statuses: Iterable[int] = (500, 502, 503),
+        access_token: str | None = None,
+        user_id: str = "fake-user",
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the fake API.
+
+        Args:
+            devices: Number of synthetic devices, or the device objects.
+            events_per_device: Events in each device's history.
+            latency: Seconds added to every response.
+            jitter: Extra random delay of up to this many seconds.
+            rate_limit_ratio: Fraction of requests answered with 429.
+            retry_after: Seconds sent in the Retry-After header of a 429.
+            error_ratio: Fraction of requests answered with a 5xx status.
+            error_statuses: Statuses used for injected errors.
+            access_token: Bearer token required on requests; None accepts
+                any token.
+            user_id: ``userId`` returned with the device list.
+            seed: Seed for the injection and jitter randomness.
+            host: Address to listen on.
+            port: Port to listen on; 0 picks a free port.
+        """
+        super().__init__(host, port)
+        if isinstance(devices, int):
+            devices = (fake_device(index) for index in range(1, devices + 1))
+        self.devices: dict[str, dict[str, Any]] = {
+            device["deviceId"]: device for device in devices
+        }
+        self.events_per_device = events_per_device
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.error_ratio = error_ratio
+        self.error_statuses = tuple(error_statuses)
+        self.access_token = access_token
+        self.user_id = user_id
+        self._random = random.Random(seed)
+        self._actions: dict[str, list[dict[str, Any]]] = {}
+        self._state_listeners: list[StateListener] = []
+        self._requests: Counter[str] = Counter()
+        self._statuses: Counter[int] = Counter()
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to OlarmFlowClient(base_url=...)."""
+        return f"http://{self.host}:{self.port}"
+
+    def add_state_listener(self, callback: StateListener) -> Callable[[], None]:
+        """Call ``callback(device_id, device)`` whenever a device changes.
+
+        Returns a function that removes the listener again.
+        """
+        self._state_listeners.append(callback)
+        return lambda: self._state_listeners.remove(callback)
+
+    def update_device_state(self, device_id: str, **state: Any) -> None:
+        """Change fields of a device's state and notify state listeners."""
+        device = self.devices[device_id]
+        device["deviceState"].update(state, timestamp=int(time.time() * 1000))
+        for listener in list(self._state_listeners):
+            listener(device_id, device)
+
+    def stats(self) -> dict[str, Any]:
+        """Return request counts by route and response counts by status."""
+        return {
+            "requests": dict(self._requests),
+            "statuses": dict(self._statuses),
+        }
+
+    def _make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/v4/devices", self._get_devices)
+        app.router.add_get("/api/v4/devices/{device_id}", self._get_device)
+        app.router.add_get("/api/v4/devices/{device_id}/actions", self._get_actions)
+        app.router.add_post("/api/v4/devices/{device_id}/actions", self._post_action)
+        app.router.add_get("/api/v4/devices/{device_id}/events", self._get_events)
+        # Answers the client's warm-up requests
+        app.router.add_head("/", self._head)
+        return app
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Callable[[web.Request], Any]
+    ) -> web.StreamResponse:
+        self._requests[f"{request.method} {endpoint_template(request.path)}"] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            response = await self._respond(request, handler)
+        except web.HTTPException as err:
+            self._statuses[err.status] += 1
+            raise
+        self._statuses[response.status] += 1
+        return response
+
+    async def _respond(
+        self, request: web.Request, handler: Callable[[web.Request], Any]
+    ) -> web.StreamResponse:
+        if request.method == "HEAD":
+            return await handler(request)  # type: ignore[no-any-return]
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if self.access_token is not None and token != self.access_token:
+            return self._error(401, "tokenExpired", "Access token is not valid")
+        if self.rate_limit_ratio and self._random.random() < self.rate_limit_ratio:
+            return self._error(
+                429,
+                "rateLimited",
+                "Too many requests",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if self.error_ratio and self._random.random() < self.error_ratio:
+            return self._error(
+                self._random.choice(self.error_statuses),
+                "injectedError",
+                "Injected server error",
+            )
+        return await handler(request)  # type: ignore[no-any-return]
+
+    def _error(
+        self,
+        status: int,
+        error: str,
+        message: str,
+        headers: dict[str, str] | None = None,
+    ) -> web.Response:
+        req_id = f"fake-{self._random.getrandbits(32):08x}"
+        return web.json_response(
+            {"error": error, "message": message, "reqId": req_id},
+            status=status,
+            headers={"X-Olarm-Req-Id": req_id, **(headers or {})},
+        )
+
+    def _device(self, request: web.Request) -> dict[str, Any]:
+        device = self.devices.get(request.match_info["device_id"])
+        if device is None:
+            raise web.HTTPNotFound(
+                text='{"error": "deviceNotFound", "message": "Device not found"}',
+                content_type="application/json",
+            )
+        return device
+
+    async def _head(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _get_devices(self, request: web.Request) -> web.Response:
+        try:
+            page = int(request.query.get("page", "1"))
+            page_length = int(request.query.get("pageLength", "100"))
+        except ValueError:
+            raise web.HTTPBadRequest() from None
+        devices = list(self.devices.values())
+        search = request.query.get("search")
+        if search:
+            devices = [d for d in devices if search.lower() in d["deviceName"].lower()]
+        start = (max(page, 1) - 1) * page_length
+        return web.json_response(
+            {
+                "userId": self.user_id,
+                "page": page,
+                "pageLength": page_length,
+                "total": len(devices),
+                "data": devices[start : start + page_length],
+            }
+        )
+
+    async def _get_device(self, request: web.Request) -> web.Response:
+        return web.json_response(self._device(request))
+
+    async def _get_actions(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        return web.json_response({"data": self._actions.get(device["deviceId"], [])})
+
+    async def _post_action(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        device_id = device["deviceId"]
+        try:
+            body = await request.json()
+            action_cmd = str(body["actionCmd"])
+            action_num = int(body["actionNum"])
+        except (ValueError, KeyError, TypeError):
+            raise web.HTTPBadRequest() from None
+        action = {
+            "actionId": f"action-{self._random.getrandbits(32):08x}",
+            "actionCmd": action_cmd,
+            "actionNum": action_num,
+            "actionCreated": int(time.time() * 1000),
+        }
+        self._actions.setdefault(device_id, []).append(action)
+        state = device["deviceState"]
+        if action_cmd in _AREA_ACTION_STATES:
+            field, value = "areas", _AREA_ACTION_STATES[action_cmd]
+        elif action_cmd in _ZONE_ACTION_STATES:
+            field, value = "zones", _ZONE_ACTION_STATES[action_cmd]
+        else:
+            return web.json_response(action)
+        if 0 < action_num <= len(state[field]):
+            values = list(state[field])
+            values[action_num - 1] = value
+            self.update_device_state(device_id, **{field: values})
+        return web.json_response(action)
+
+    async def _get_events(self, request: web.Request) -> web.Response:
+        device = self._device(request)
+        try:
+            limit = int(request.query.get("limit", "50"))
+            after = int(request.query["after"]) if "after" in request.query else 0
+        except ValueError:
+            raise web.HTTPBadRequest() from None
+        # Events are numbered 1..events_per_device, a minute apart
+        first = after + 1
+        last = min(self.events_per_device, after + limit)
+        base_ts = device["deviceState"]["timestamp"] - self.events_per_device * 60000
+        return web.json_response(
+            {
+                "data": [
+                    {
+                        "eventId": str(n),
+                        "eventTs": base_ts + n * 60000,
+                        "eventAction": "zone-active",
+                        "eventMsg": f"Zone {(n - 1) % 8 + 1} active",
+                    }
+                    for n in range(first, last + 1)
+                ]
+            }
+        )
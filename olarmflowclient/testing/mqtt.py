@@ -0,0 +1,339 @@
+"""Local stand-in for the Olarm MQTT broker (MQTT 3.1.1 over websockets)."""
+
+import asyncio
+import json
+import logging
+import random
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from .api import FakeOlarmApi
+from .server import LocalServer
+
+_LOGGER = logging.getLogger(__name__)
+
+# MQTT control packet types
+_CONNECT = 1
+_CONNACK = 2
+_PUBLISH = 3
+_PUBACK = 4
+_PUBREC = 5
+_PUBREL = 6
+_PUBCOMP = 7
+_SUBSCRIBE = 8
+_SUBACK = 9
+_UNSUBSCRIBE = 10
+_UNSUBACK = 11
+_PINGREQ = 12
+_PINGRESP = 13
+_DISCONNECT = 14
+
+# CONNACK return codes
+_CONNACK_ACCEPTED = 0
+_CONNACK_BAD_PROTOCOL = 1
+_CONNACK_NOT_AUTHORIZED = 5
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Return True if ``topic`` matches a filter with ``+``/``#`` wildcards."""
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+
+def _packet(packet_type: int, body: bytes = b"", flags: int = 0) -> bytes:
+    """Encode a control packet: fixed header with remaining length, then body."""
+    header = bytearray([packet_type << 4 | flags])
+    length = len(body)
+    while True:
+        byte, length = length % 128, length // 128
+        header.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(header) + body
+
+
+def _read_packet(buffer: bytearray) -> tuple[int, int, bytes] | None:
+    """Remove and return the first complete packet in ``buffer``, if any.
+
+    Returns the packet type, the fixed header flags and the body.
+    """
+    length = 0
+    for index in range(1, min(len(buffer), 5)):
+        length += (buffer[index] & 0x7F) << 7 * (index - 1)
+        if not buffer[index] & 0x80:
+            end = index + 1 + length
+            if len(buffer) < end:
+                return None
+            packet = (buffer[0] >> 4, buffer[0] & 0x0F, bytes(buffer[index + 1 : end]))
+            del buffer[:end]
+            return packet
+    if len(buffer) >= 5:
+        raise ValueError("Malformed remaining length")
+    return None
+
+
+def _read_string(body: bytes, pos: int) -> tuple[bytes, int]:
+    """Read a length-prefixed field at ``pos``; return it and the next offset."""
+    length = int.from_bytes(body[pos : pos + 2], "big")
+    return body[pos + 2 : pos + 2 + length], pos + 2 + length
+
+
+class _Session:
+    """One connected MQTT client."""
+
+    def __init__(self, ws: web.WebSocketResponse) -> None:
+        self.ws = ws
+        self.client_id: str | None = None
+        self.subscriptions: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def send(self, data: bytes) -> None:
+        # Keep packets from concurrent publishers whole
+        async with self._lock:
+            await self.ws.send_bytes(data)
+
+
+class FakeMqttBroker(LocalServer):
+    """In-process MQTT broker that speaks MQTT 3.1.1 over websockets.
+
+    Accepts the client's websocket connections on ``/mqtt``, handles
+    subscribe/unsubscribe (with ``+``/``#`` wildcards), QoS 0-2 publishes
+    and keep-alive pings, and delivers messages to subscribers at QoS 0.
+
+    Given a FakeOlarmApi, it publishes each device's state to
+    ``v4/devices/{id}`` whenever an action changes it, and with
+    ``publish_rate`` set also publishes synthetic state changes (a random
+    zone toggling between active and closed) that many times per second
+    per device::
+
+        async with FakeOlarmApi() as api, FakeMqttBroker(api, 2.0) as broker:
+            client = OlarmFlowClient(
+                "token",
+                base_url=api.url,
+                mqtt_host=broker.host,
+                mqtt_port=broker.port,
+                mqtt_tls=False,
+            )
+    """
+
+    def __init__(
+        self,
+        api: FakeOlarmApi | None = None,
+        publish_rate: float = 0.0,
+        access_token: str | None = None,
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the fake broker.
+
+        Args:
+            api: Fake API whose devices' state is published.
+            publish_rate: Synthetic state messages per second per device;
+                0 publishes only on actions.
+            access_token: Password required on CONNECT; None accepts any.
+            seed: Seed for the synthetic state changes.
+            host: Address to listen on.
+            port: Port to listen on; 0 picks a free port.
+        """
+        super().__init__(host, port)
+        self.api = api
+        self.publish_rate = publish_rate
+        self.access_token = access_token
+        self._random = random.Random(seed)
+        self._sessions: set[_Session] = set()
+        self._publisher: asyncio.Task[None] | None = None
+        self._remove_listener: Any = None
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._published = 0
+        self._delivered = 0
+
+    async def start(self) -> None:
+        """Start listening and publishing device state."""
+        await super().start()
+        if self.api is not None and self._remove_listener is None:
+            self._remove_listener = self.api.add_state_listener(self._on_state)
+        if self.api is not None and self.publish_rate > 0 and self._publisher is None:
+            self._publisher = asyncio.get_running_loop().create_task(
+                self._publish_loop()
+            )
+
+    async def close(self) -> None:
+        """Stop publishing, disconnect all clients and stop listening."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        tasks = list(self._tasks)
+        if self._publisher is not None:
+            tasks.append(self._publisher)
+            self._publisher = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.disconnect_clients()
+        await super().close()
+
+    async def disconnect_clients(self) -> None:
+        """Drop every client connection, e.g. to exercise reconnects."""
+        sessions = list(self._sessions)
+        await asyncio.gather(
+            *(session.ws.close() for session in sessions), return_exceptions=True
+        )
+
+    async def publish(self, topic: str, payload: Any) -> int:
+        """Publish ``payload`` to the subscribers of ``topic``.
+
+        Payloads that aren't bytes or str are sent as JSON. Returns the
+        number of clients the message was delivered to.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        elif not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode()
+        topic_bytes = topic.encode()
+        data = _packet(
+            _PUBLISH, len(topic_bytes).to_bytes(2, "big") + topic_bytes + payload
+        )
+        sessions = [
+            session
+            for session in self._sessions
+            if any(topic_matches(f, topic) for f in session.subscriptions)
+        ]
+        results = await asyncio.gather(
+            *(session.send(data) for session in sessions), return_exceptions=True
+        )
+        delivered = sum(1 for result in results if not isinstance(result, Exception))
+        self._published += 1
+        self._delivered += delivered
+        return delivered
+
+    def stats(self) -> dict[str, int]:
+        """Return the connected clients, subscriptions and message counts."""
+        return {
+            "clients": len(self._sessions),
+            "subscriptions": sum(len(s.subscriptions) for s in self._sessions),
+            "published": self._published,
+            "delivered": self._delivered,
+        }
+
+    def _make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/mqtt", self._handle)
+        return app
+
+    def _on_state(self, device_id: str, device: dict[str, Any]) -> None:
+        task = asyncio.get_running_loop().create_task(
+            self.publish(f"v4/devices/{device_id}", device)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _publish_loop(self) -> None:
+        assert self.api is not None
+        while True:
+            await asyncio.sleep(1 / self.publish_rate)
+            for device_id, device in self.api.devices.items():
+                zones = list(device["deviceState"]["zones"])
+                if not zones:
+                    continue
+                index = self._random.randrange(len(zones))
+                zones[index] = "a" if zones[index] == "c" else "c"
+                self.api.update_device_state(device_id, zones=zones)
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(protocols=("mqtt",))
+        await ws.prepare(request)
+        session = _Session(ws)
+        buffer = bytearray()
+        try:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.BINARY:
+                    break
+                buffer += message.data
+                while (packet := _read_packet(buffer)) is not None:
+                    if not await self._on_packet(session, *packet):
+                        return ws
+        except ValueError as err:
+            _LOGGER.debug("Fake MQTT broker: dropping client: %s", err)
+        finally:
+            self._sessions.discard(session)
+            await ws.close()
+        return ws
+
+    async def _on_packet(
+        self, session: _Session, packet_type: int, flags: int, body: bytes
+    ) -> bool:
+        """Handle one packet; return False to close the connection."""
+        if session.client_id is None and packet_type != _CONNECT:
+            raise ValueError("Expected CONNECT")
+        if packet_type == _CONNECT:
+            return await self._on_connect(session, body)
+        if packet_type == _PUBLISH:
+            qos = flags >> 1 & 0x03
+            topic, pos = _read_string(body, 0)
+            packet_id = body[pos : pos + 2] if qos else b""
+            await self.publish(topic.decode(), body[pos + len(packet_id) :])
+            if qos == 1:
+                await session.send(_packet(_PUBACK, packet_id))
+            elif qos == 2:
+                await session.send(_packet(_PUBREC, packet_id))
+        elif packet_type == _PUBREL:
+            await session.send(_packet(_PUBCOMP, body[:2]))
+        elif packet_type == _SUBSCRIBE:
+            pos, granted = 2, bytearray()
+            while pos < len(body):
+                topic, pos = _read_string(body, pos)
+                session.subscriptions.add(topic.decode())
+                # Messages are always delivered at QoS 0
+                granted.append(0)
+                pos += 1
+            await session.send(_packet(_SUBACK, body[:2] + bytes(granted)))
+        elif packet_type == _UNSUBSCRIBE:
+            pos = 2
+            while pos < len(body):
+                topic, pos = _read_string(body, pos)
+                session.subscriptions.discard(topic.decode())
+            await session.send(_packet(_UNSUBACK, body[:2]))
+        elif packet_type == _PINGREQ:
+            await session.send(_packet(_PINGRESP))
+        elif packet_type == _DISCONNECT:
+            return False
+        return True
+
+    async def _on_connect(self, session: _Session, body: bytes) -> bool:
+        if session.client_id is not None:
+            raise ValueError("Second CONNECT")
+        _, pos = _read_string(body, 0)  # protocol name
+        level, connect_flags = body[pos], body[pos + 1]
+        client_id, pos = _read_string(body, pos + 4)
+        if connect_flags & 0x04:
+            # Skip the will topic and message
+            _, pos = _read_string(body, pos)
+            _, pos = _read_string(body, pos)
+        if connect_flags & 0x80:
+            _, pos = _read_string(body, pos)  # username
+        password = _read_string(body, pos)[0] if connect_flags & 0x40 else b""
+        if level not in (3, 4):
+            code = _CONNACK_BAD_PROTOCOL
+        elif (
+            self.access_token is not None
+            and password.decode(errors="replace") != self.access_token
+        ):
+            code = _CONNACK_NOT_AUTHORIZED
+        else:
+            code = _CONNACK_ACCEPTED
+        await session.send(_packet(_CONNACK, bytes([0, code])))
+        if code != _CONNACK_ACCEPTED:
+            return False
+        session.client_id = client_id.decode(errors="replace")
+        self._sessions.add(session)
+        return True
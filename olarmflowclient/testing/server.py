@@ -0,0 +1,54 @@
+"""Base class for the local stand-in servers."""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from aiohttp import web
+
+
+class LocalServer(ABC):
+    """An aiohttp app served on a local port for the lifetime of the object.
+
+    Use it as an async context manager, or call start() and close(). With
+    ``port=0`` a free port is picked on start().
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Initialize the server (it is not listening until started)."""
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    @abstractmethod
+    def _make_app(self) -> web.Application:
+        """Return the application to serve."""
+
+    async def start(self) -> None:
+        """Start listening."""
+        if self._runner is not None:
+            return
+        runner = web.AppRunner(self._make_app(), access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self.port = runner.addresses[0][1]
+        self._runner = runner
+
+    async def close(self) -> None:
+        """Stop listening and close open connections."""
+        if self._runner is not None:
+            runner = self._runner
+            self._runner = None
+            await runner.cleanup()
+
+    async def __aenter__(self) -> Any:
+        """Async context manager enter."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.close()
@@ -0,0 +1,280 @@
+"""Tracing hooks for REST calls and MQTT, with an OpenTelemetry adapter.
+
+Nothing here runs unless a Tracer is passed to OlarmFlowClient(tracer=...).
+opentelemetry-api is optional and only needed for OpenTelemetryTracer.
+"""
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from .metrics import endpoint_template
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None  # type: ignore[assignment]
+
+# Header carrying the Olarm request id, for matching spans to server logs
+REQ_ID_HEADER = "X-Olarm-Req-Id"
+
+Attributes = Mapping[str, str | int | float | bool]
+
+
+class Span:
+    """A timed operation. This base implementation records nothing.
+
+    Timestamps are nanoseconds since the epoch, as in OpenTelemetry.
+    """
+
+    def set_attribute(self, key: str, value: str | int | float | bool) -> None:
+        """Set an attribute on the span."""
+
+    def record_exception(self, err: BaseException) -> None:
+        """Mark the span as failed with ``err``."""
+
+    def end(self, end_time: int | None = None) -> None:
+        """End the span, now or at ``end_time``."""
+
+
+class Tracer:
+    """Creates spans. Subclass this to send spans to a tracing backend.
+
+    This base implementation returns spans that record nothing.
+    """
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Attributes | None = None,
+        parent: Span | None = None,
+        start_time: int | None = None,
+    ) -> Span:
+        """Start a span, as a child of ``parent`` if given."""
+        return Span()
+
+
+class _OpenTelemetrySpan(Span):
+    def __init__(self, span: Any) -> None:
+        self.span = span
+
+    def set_attribute(self, key: str, value: str | int | float | bool) -> None:
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, err: BaseException) -> None:
+        self.span.record_exception(err)
+        self.span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(err)))
+
+    def end(self, end_time: int | None = None) -> None:
+        self.span.end(end_time=end_time)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that creates OpenTelemetry spans.
+
+    Spans without a parent are children of the active OpenTelemetry span,
+    so client calls nest under the application's own spans.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """Initialize with an OpenTelemetry tracer (default: "olarmflowclient")."""
+        if otel_trace is None:
+            raise RuntimeError("opentelemetry-api is not installed")
+        self._tracer = tracer or otel_trace.get_tracer("olarmflowclient")
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Attributes | None = None,
+        parent: Span | None = None,
+        start_time: int | None = None,
+    ) -> Span:
+        """Start an OpenTelemetry span."""
+        context = None
+        if isinstance(parent, _OpenTelemetrySpan):
+            context = otel_trace.set_span_in_context(parent.span)
+        return _OpenTelemetrySpan(
+            self._tracer.start_span(
+                name, context=context, attributes=attributes, start_time=start_time
+            )
+        )
+
+
+@contextmanager
+def traced(
+    tracer: Tracer,
+    name: str,
+    attributes: Attributes | None = None,
+    parent: Span | None = None,
+) -> Iterator[Span]:
+    """Run the body in a span that records any exception raised."""
+    span = tracer.start_span(name, attributes, parent)
+    try:
+        yield span
+    except BaseException as err:
+        span.record_exception(err)
+        raise
+    finally:
+        span.end()
+
+
+class ApiRequestTrace:
+    """Span for one REST request attempt, split into phases.
+
+    While active, the trace config from api_trace_config() adds child spans
+    for the phases aiohttp reports: ``dns``, ``connection_queued`` (waiting
+    for a pooled connection), ``connect`` (TCP connect and TLS handshake,
+    which aiohttp reports together), ``request_send`` and
+    ``time_to_first_byte``. ``body_read`` runs from the response headers
+    until the trace is finished.
+    """
+
+    def __init__(self, tracer: Tracer, method: str, endpoint: str) -> None:
+        """Start the request span and make it the active request."""
+        self.tracer = tracer
+        self.span = tracer.start_span(
+            "olarm.api.request",
+            {"http.request.method": method, "http.route": endpoint_template(endpoint)},
+        )
+        self.response_at: int | None = None
+        self._token: Token[ApiRequestTrace | None] | None = _active_request.set(self)
+
+    def phase(self, name: str, start_time: int, end_time: int) -> None:
+        """Record a completed phase of the request as a child span."""
+        self.tracer.start_span(name, parent=self.span, start_time=start_time).end(
+            end_time
+        )
+
+    def detach(self) -> None:
+        """Stop being the active request (phases can't be added after this)."""
+        if self._token is not None:
+            _active_request.reset(self._token)
+            self._token = None
+
+    def finish(self, err: BaseException | None = None) -> None:
+        """End the request span, recording ``err`` and its req_id if failed."""
+        self.detach()
+        now = time.time_ns()
+        if self.response_at is not None:
+            self.phase("body_read", self.response_at, now)
+        if err is not None:
+            status_code = getattr(err, "status_code", None)
+            req_id = getattr(err, "req_id", None)
+            if status_code is not None:
+                self.span.set_attribute("http.response.status_code", status_code)
+            if req_id:
+                self.span.set_attribute("olarm.req_id", req_id)
+            self.span.set_attribute("error.type", type(err).__name__)
+            self.span.record_exception(err)
+        self.span.end(now)
+
+
+_active_request: ContextVar[ApiRequestTrace | None] = ContextVar(
+    "olarmflowclient_active_request", default=None
+)
+
+
+@contextmanager
+def traced_request(
+    tracer: Tracer, method: str, endpoint: str
+) -> Iterator[ApiRequestTrace]:
+    """Run one REST request attempt inside an ApiRequestTrace."""
+    request = ApiRequestTrace(tracer, method, endpoint)
+    try:
+        yield request
+    except BaseException as err:
+        request.finish(err)
+        raise
+    request.finish()
+
+
+def api_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config that adds phase spans to the active request.
+
+    Requests made outside an ApiRequestTrace (e.g. warm-up requests) are
+    ignored.
+    """
+    config = aiohttp.TraceConfig()
+
+    def mark(attr: str) -> Any:
+        async def handler(
+            session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+        ) -> None:
+            if _active_request.get() is not None:
+                setattr(ctx, attr, time.time_ns())
+
+        return handler
+
+    def phase(name: str, start_attr: str) -> Any:
+        async def handler(
+            session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+        ) -> None:
+            request = _active_request.get()
+            if request is not None and hasattr(ctx, start_attr):
+                now = time.time_ns()
+                request.phase(name, getattr(ctx, start_attr), now)
+                ctx.ready_at = now
+
+        return handler
+
+    async def on_request_start(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        if _active_request.get() is not None:
+            ctx.ready_at = time.time_ns()
+
+    async def on_connection_reused(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        request = _active_request.get()
+        if request is not None:
+            request.span.set_attribute("olarm.connection_reused", True)
+            ctx.ready_at = time.time_ns()
+
+    async def on_headers_sent(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestHeadersSentParams,
+    ) -> None:
+        request = _active_request.get()
+        if request is not None and hasattr(ctx, "ready_at"):
+            ctx.sent_at = time.time_ns()
+            request.phase("request_send", ctx.ready_at, ctx.sent_at)
+
+    async def on_request_end(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        request = _active_request.get()
+        if request is None:
+            return
+        request.response_at = time.time_ns()
+        if hasattr(ctx, "sent_at"):
+            request.phase("time_to_first_byte", ctx.sent_at, request.response_at)
+        response = params.response
+        request.span.set_attribute("http.response.status_code", response.status)
+        req_id = response.headers.get(REQ_ID_HEADER)
+        if req_id:
+            request.span.set_attribute("olarm.req_id", req_id)
+
+    config.on_request_start.append(on_request_start)
+    config.on_dns_resolvehost_start.append(mark("dns_at"))
+    config.on_dns_resolvehost_end.append(phase("dns", "dns_at"))
+    config.on_connection_queued_start.append(mark("queued_at"))
+    config.on_connection_queued_end.append(phase("connection_queued", "queued_at"))
+    config.on_connection_create_start.append(mark("connect_at"))
+    config.on_connection_create_end.append(phase("connect", "connect_at"))
+    config.on_connection_reuseconn.append(on_connection_reused)
+    config.on_request_headers_sent.append(on_headers_sent)
+    config.on_request_end.append(on_request_end)
+    return config
@@ -0,0 +1,932 @@
+"""Tests for the OlarmFlowClient REST request layer against a local HTTP server."""
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+import olarmflowclient.olarmflowclient as olarm_module
+from olarmflowclient import (
+    AdaptiveRateLimiter,
+    ApiMetrics,
+    CircuitBreaker,
+    CircuitOpen,
+    HedgingPolicy,
+    PriorityScheduler,
+    DeviceNotFound,
+    DevicesNotFound,
+    OlarmFlowClient,
+    OlarmFlowClientApiError,
+    OlarmFlowClientConnectionError,
+    RateLimited,
+    RequestTimeout,
+    RetryPolicy,
+    ServiceUnavailable,
+    Span,
+    Tracer,
+)
+
+
+@pytest.fixture
+def access_token():
+    return "test_access_token"
+
+
+@pytest.fixture
+def device_id():
+    return "test_device_id"
+
+
+@pytest.fixture
+async def api_server(monkeypatch):
+    """Start a scriptable local API and point the client's BASE_URL at it.
+
+    Returns a holder with `app` (add routes before the first request),
+    `requests` (every request seen, in order) and `peers` (the client
+    address of each request, to observe connection reuse).
+    """
+
+    class Holder:
+        app = web.Application()
+        requests: list[web.Request] = []
+        peers: list[Any] = []
+        server: TestServer | None = None
+
+        @classmethod
+        async def start(cls) -> None:
+            cls.server = TestServer(cls.app)
+            await cls.server.start_server()
+            monkeypatch.setattr(
+                olarm_module, "BASE_URL", str(cls.server.make_url("")).rstrip("/")
+            )
+
+    @web.middleware
+    async def record(request: web.Request, handler: Any) -> web.StreamResponse:
+        Holder.requests.append(request)
+        Holder.peers.append(request.transport.get_extra_info("peername"))
+        return await handler(request)
+
+    Holder.app.middlewares.append(record)
+
+    yield Holder
+    if Holder.server is not None:
+        await Holder.server.close()
+
+
+async def _device_handler(request: web.Request) -> web.Response:
+    return web.json_response({"deviceId": request.match_info["device_id"]})
+
+
+class TestConnectionPool:
+    async def test_connections_reused_across_requests(
+        self, api_server, access_token, device_id
+    ):
+        """Sequential requests share one keep-alive connection."""
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", _device_handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token) as client:
+            for _ in range(3):
+                result = await client.get_device(device_id)
+                assert result == {"deviceId": device_id}
+
+            stats = client.get_pool_stats()
+            assert stats["open"] == 1
+            assert stats["idle"] == 1
+            assert stats["acquired"] == 0
+
+        assert len(set(api_server.peers)) == 1
+        assert api_server.requests[0].headers["Authorization"] == (
+            f"Bearer {access_token}"
+        )
+
+    async def test_connector_options_applied(self, access_token):
+        """Pool limits are passed through to the connector."""
+        client = OlarmFlowClient(
+            access_token, connector_limit=7, connector_limit_per_host=3
+        )
+        assert client.get_pool_stats()["open"] == 0
+
+        await client._api_connect()
+        stats = client.get_pool_stats()
+        assert stats["limit"] == 7
+        assert stats["limit_per_host"] == 3
+        await client.close()
+        assert client._api_session is None
+
+    async def test_injected_session_left_open(
+        self, api_server, access_token, device_id
+    ):
+        """A caller-supplied session is used but never closed by the client."""
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", _device_handler)
+        await api_server.start()
+
+        async with aiohttp.ClientSession() as session:
+            async with OlarmFlowClient(access_token, session=session) as client:
+                await client.get_device(device_id)
+                assert client._api_session is session
+
+            assert not session.closed
+            # Reconnecting after close reuses the injected session
+            assert client._api_session is session
+            await client.get_device(device_id)
+            assert client._api_session is session
+            await client.close()
+            assert not session.closed
+
+    async def test_warm_up_on_entry_opens_pooled_connections(
+        self, api_server, access_token, device_id
+    ):
+        """Entering with warm_connections pre-opens reusable connections."""
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", _device_handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, warm_connections=3) as client:
+            assert [r.method for r in api_server.requests] == ["HEAD"] * 3
+            assert client.get_pool_stats()["idle"] == 3
+            assert client._mqtt_tls_context is not None
+
+            await client.get_device(device_id)
+            # The real request reused a warm connection
+            assert api_server.peers[-1] in api_server.peers[:3]
+            assert client.get_pool_stats()["open"] == 3
+
+    async def test_warm_up_failure_is_ignored(self, access_token):
+        """An unreachable API host does not fail warm-up."""
+        with patch.object(olarm_module, "BASE_URL", "http://127.0.0.1:1"):
+            async with OlarmFlowClient(access_token) as client:
+                await client.warm_up(connections=2)
+                assert client.get_pool_stats()["open"] == 0
+
+
+class TestRateLimiter:
+    async def test_429_feeds_back_into_limiter(
+        self, api_server, access_token, device_id
+    ):
+        """A 429 with Retry-After lowers the permitted rate and pauses calls."""
+        responses = [
+            web.json_response(
+                {"error": "rateLimited"}, status=429, headers={"Retry-After": "0"}
+            ),
+            web.json_response({"deviceId": device_id}),
+        ]
+
+        async def handler(request: web.Request) -> web.Response:
+            return responses.pop(0)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        limiter = AdaptiveRateLimiter(rate=20.0)
+        async with OlarmFlowClient(access_token, rate_limiter=limiter) as client:
+            assert client.rate_limiter is limiter
+            with pytest.raises(RateLimited) as exc_info:
+                await client.get_device(device_id)
+            assert exc_info.value.retry_after == 0
+            assert limiter.rate == 10.0
+
+            assert await client.get_device(device_id) == {"deviceId": device_id}
+            assert limiter.rate > 10.0
+
+
+NO_DELAY_RETRIES = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+class TestRetries:
+    def test_decorrelated_jitter_bounds(self):
+        """Delays stay between base_delay and max_delay."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+        delay = policy.base_delay
+        for _ in range(50):
+            delay = policy.next_delay(delay)
+            assert 0.1 <= delay <= 1.0
+
+    async def test_reads_retried_on_gateway_errors(
+        self, api_server, access_token, device_id
+    ):
+        """Transient 502/504 responses on a GET are retried until success."""
+        statuses = [502, 504]
+
+        async def handler(request: web.Request) -> web.Response:
+            if statuses:
+                return web.Response(status=statuses.pop(0), text="<html></html>")
+            return web.json_response({"deviceId": device_id})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token, retry_policy=NO_DELAY_RETRIES
+        ) as client:
+            assert await client.get_device(device_id) == {"deviceId": device_id}
+        assert len(api_server.requests) == 3
+
+    async def test_reads_give_up_after_max_attempts(
+        self, api_server, access_token, device_id
+    ):
+        """The last error is raised once all attempts are used."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=503)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token, retry_policy=NO_DELAY_RETRIES
+        ) as client:
+            with pytest.raises(ServiceUnavailable):
+                await client.get_device(device_id)
+        assert len(api_server.requests) == 3
+
+    async def test_actions_not_retried_after_reaching_server(
+        self, api_server, access_token, device_id
+    ):
+        """An action that reached the server is never sent twice."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=502)
+
+        api_server.app.router.add_post("/api/v4/devices/{device_id}/actions", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token, retry_policy=NO_DELAY_RETRIES
+        ) as client:
+            with pytest.raises(OlarmFlowClientApiError) as exc_info:
+                await client.send_device_area_arm(device_id, 1)
+        assert exc_info.value.status_code == 502
+        assert len(api_server.requests) == 1
+
+    async def test_actions_retried_when_connection_refused(
+        self, monkeypatch, access_token, device_id
+    ):
+        """An action whose connection was never established is retried."""
+        # Nothing listens on port 1, so every connect is refused
+        monkeypatch.setattr(olarm_module, "BASE_URL", "http://127.0.0.1:1")
+
+        async with OlarmFlowClient(
+            access_token, retry_policy=NO_DELAY_RETRIES
+        ) as client:
+            with patch.object(
+                client, "_api_request_once", wraps=client._api_request_once
+            ) as mock_once:
+                with pytest.raises(OlarmFlowClientConnectionError):
+                    await client.send_device_area_arm(device_id, 1)
+        assert mock_once.call_count == 3
+
+
+class TestMetrics:
+    async def test_latency_status_retries_and_bytes_recorded(
+        self, api_server, access_token, device_id
+    ):
+        """Each call is recorded once per endpoint template, with retries."""
+        statuses = [503]
+
+        async def handler(request: web.Request) -> web.Response:
+            if statuses:
+                return web.Response(status=statuses.pop(0), text="busy")
+            return web.json_response({"deviceId": request.match_info["device_id"]})
+
+        async def action_handler(request: web.Request) -> web.Response:
+            return web.json_response({"error": "rateLimited"}, status=429)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        api_server.app.router.add_post(
+            "/api/v4/devices/{device_id}/actions", action_handler
+        )
+        await api_server.start()
+
+        metrics = ApiMetrics()
+        async with OlarmFlowClient(
+            access_token, retry_policy=NO_DELAY_RETRIES, metrics=metrics
+        ) as client:
+            await client.get_device(device_id)
+            await client.get_device("other")
+            with pytest.raises(OlarmFlowClientApiError):
+                await client.send_device_area_arm(device_id, 1)
+
+        snapshot = metrics.snapshot()
+        reads = snapshot["GET /api/v4/devices/{id}"]
+        assert reads["count"] == 2
+        assert reads["statuses"] == {200: 2}
+        assert reads["retries"] == 1
+        assert reads["errors"] == {}
+        assert reads["bytes_in"] == len(b"busy") + sum(
+            len(json.dumps({"deviceId": d})) for d in (device_id, "other")
+        )
+        assert reads["connect_time"] > 0
+        assert reads["latency"]["count"] == 2
+
+        actions = snapshot["POST /api/v4/devices/{id}/actions"]
+        assert actions["statuses"] == {429: 1}
+        # Errors are counted by the specific class they map to
+        assert actions["errors"] == {"RateLimited": 1}
+        assert actions["bytes_out"] > 0
+
+    async def test_stream_recorded(self, api_server, access_token):
+        """Streamed pages are recorded once the stream is consumed."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({"data": [{"deviceId": "a"}]})
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        metrics = ApiMetrics()
+        async with OlarmFlowClient(access_token, metrics=metrics) as client:
+            assert [d async for d in client.stream_devices()] == [{"deviceId": "a"}]
+
+        stats = metrics.snapshot()["GET /api/v4/devices"]
+        assert stats["statuses"] == {200: 1}
+        assert stats["bytes_in"] > 0
+
+
+class RecordedSpan(Span):
+    def __init__(self, name: str, attributes: Any, parent: Any) -> None:
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.error: BaseException | None = None
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, err):
+        self.error = err
+
+    def end(self, end_time=None):
+        self.ended = True
+
+
+class RecordingTracer(Tracer):
+    """Keeps every span started, in order."""
+
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+
+    def start_span(self, name, attributes=None, parent=None, start_time=None):
+        span = RecordedSpan(name, attributes, parent)
+        self.spans.append(span)
+        return span
+
+    def named(self, name: str) -> list[RecordedSpan]:
+        return [span for span in self.spans if span.name == name]
+
+
+class TestTracing:
+    async def test_request_phases_and_req_id(self, api_server, access_token, device_id):
+        """Each attempt is a span with phase children and the Olarm req id."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response(
+                {"deviceId": device_id}, headers={"X-Olarm-Req-Id": "req-1"}
+            )
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        tracer = RecordingTracer()
+        async with OlarmFlowClient(access_token, tracer=tracer) as client:
+            await client.get_device(device_id)
+            await client.get_device(device_id)
+
+        first, second = tracer.named("olarm.api.request")
+        assert first.attributes == {
+            "http.request.method": "GET",
+            "http.route": "/api/v4/devices/{id}",
+            "http.response.status_code": 200,
+            "olarm.req_id": "req-1",
+        }
+        phases = [span.name for span in tracer.spans if span.parent is first]
+        assert phases[:1] == ["connect"]
+        assert phases[-3:] == ["request_send", "time_to_first_byte", "body_read"]
+        assert second.attributes["olarm.connection_reused"] is True
+        assert all(span.ended for span in tracer.spans)
+
+    async def test_failed_attempt_span(self, api_server, access_token, device_id):
+        """Error responses record the error class and the body's req id."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({"reqId": "req-2"}, status=404)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        tracer = RecordingTracer()
+        async with OlarmFlowClient(access_token, tracer=tracer) as client:
+            with pytest.raises(DeviceNotFound):
+                await client.get_device(device_id)
+
+        (span,) = tracer.named("olarm.api.request")
+        assert span.attributes["http.response.status_code"] == 404
+        assert span.attributes["olarm.req_id"] == "req-2"
+        assert isinstance(span.error, OlarmFlowClientApiError)
+
+
+class TestCircuitBreaker:
+    async def test_outage_opens_circuit_and_fails_fast(
+        self, api_server, access_token, device_id
+    ):
+        """Gateway errors open the circuit; calls then never reach the API."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=503)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        transitions = []
+        async with OlarmFlowClient(
+            access_token,
+            retry_policy=None,
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_time=60),
+        ) as client:
+            client.set_circuit_status_callback(
+                lambda state, info: transitions.append(state)
+            )
+            for _ in range(2):
+                with pytest.raises(ServiceUnavailable):
+                    await client.get_device(device_id)
+            with pytest.raises(CircuitOpen) as exc_info:
+                await client.get_device(device_id)
+
+        assert exc_info.value.retry_after == 60
+        assert len(api_server.requests) == 2
+        assert transitions == ["open"]
+
+    async def test_probe_success_closes_circuit(
+        self, api_server, access_token, device_id
+    ):
+        """A successful probe after the recovery time closes the circuit."""
+        statuses = [502]
+
+        async def handler(request: web.Request) -> web.Response:
+            if statuses:
+                return web.Response(status=statuses.pop(0))
+            return web.json_response({"deviceId": device_id})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_time=0)
+        async with OlarmFlowClient(
+            access_token, retry_policy=None, circuit_breaker=breaker
+        ) as client:
+            with pytest.raises(ServiceUnavailable):
+                await client.get_device(device_id)
+            assert breaker.state == "half_open"
+
+            assert await client.get_device(device_id) == {"deviceId": device_id}
+            assert breaker.state == "closed"
+
+    async def test_client_errors_do_not_count(
+        self, api_server, access_token, device_id
+    ):
+        """A 404 shows the API is up and resets the failure count."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=404)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        breaker = CircuitBreaker(failure_threshold=1)
+        async with OlarmFlowClient(
+            access_token, retry_policy=None, circuit_breaker=breaker
+        ) as client:
+            with pytest.raises(DeviceNotFound):
+                await client.get_device(device_id)
+        assert breaker.state == "closed"
+
+    def test_status_callback_requires_breaker(self, access_token):
+        with pytest.raises(RuntimeError):
+            OlarmFlowClient(access_token).set_circuit_status_callback(print)
+
+
+class TestPriorityLanes:
+    async def test_panic_not_queued_behind_bulk_reads(
+        self, api_server, access_token, device_id
+    ):
+        """A panic is sent while bulk device pages hold every shared slot."""
+        release = asyncio.Event()
+
+        async def devices_handler(request: web.Request) -> web.Response:
+            await release.wait()
+            return web.json_response({"data": []})
+
+        async def action_handler(request: web.Request) -> web.Response:
+            return web.json_response({"actionCmd": "user-panic"})
+
+        api_server.app.router.add_get("/api/v4/devices", devices_handler)
+        api_server.app.router.add_post(
+            "/api/v4/devices/{device_id}/actions", action_handler
+        )
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token,
+            priority_scheduler=PriorityScheduler(max_concurrent=2, reserved_critical=1),
+        ) as client:
+            bulk = [
+                asyncio.create_task(client.get_devices(page=page))
+                for page in range(1, 4)
+            ]
+            await asyncio.sleep(0.05)
+            assert client.get_priority_stats()["bulk"]["queued"] == 2
+
+            result = await asyncio.wait_for(client.send_user_panic(device_id), 1)
+            assert result == {"actionCmd": "user-panic"}
+
+            release.set()
+            await asyncio.gather(*bulk)
+            stats = client.get_priority_stats()
+            assert stats["bulk"]["requests"] == 3
+            assert stats["critical"]["wait_max"] == 0.0
+
+    async def test_lane_override(self, api_server, access_token, device_id):
+        """Requests in a lane() block are sent in that lane."""
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", _device_handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token, priority_scheduler=PriorityScheduler()
+        ) as client:
+            with client.lane("bulk"):
+                await client.get_device(device_id)
+            assert client.get_priority_stats()["bulk"]["requests"] == 1
+
+    async def test_shared_work_keeps_each_callers_lane(
+        self, api_server, access_token, device_id
+    ):
+        """Coalesced reads and queued actions use their own caller's lane."""
+
+        async def device_handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.05)
+            return web.json_response({"deviceId": device_id})
+
+        async def action_handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.05)
+            return web.json_response({})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", device_handler)
+        api_server.app.router.add_post(
+            "/api/v4/devices/{device_id}/actions", action_handler
+        )
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token,
+            priority_scheduler=PriorityScheduler(),
+            coalesce_reads=True,
+            ordered_actions=True,
+        ) as client:
+
+            async def in_bulk_lane(call: Any) -> Any:
+                with client.lane("bulk"):
+                    return await call()
+
+            await asyncio.gather(
+                in_bulk_lane(lambda: client.get_device(device_id)),
+                client.get_device(device_id),
+            )
+            await asyncio.gather(
+                in_bulk_lane(lambda: client.send_device_area_arm(device_id, 1)),
+                client.send_device_area_stay(device_id, 1),
+            )
+            stats = client.get_priority_stats()
+
+        assert stats["bulk"]["requests"] == 2
+        assert stats["interactive"]["requests"] == 2
+
+
+class TestHedging:
+    async def test_slow_read_hedged(self, api_server, access_token, device_id):
+        """A read slower than the hedge delay is answered by its duplicate."""
+        calls = 0
+
+        async def handler(request: web.Request) -> web.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+            return web.json_response({"deviceId": device_id})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        policy = HedgingPolicy(max_ratio=1.0, initial_delay=0.05)
+        async with OlarmFlowClient(
+            access_token, hedging=policy, coalesce_reads=True
+        ) as client:
+            result = await asyncio.wait_for(client.get_device(device_id), 1)
+            assert result == {"deviceId": device_id}
+
+            stats = client.get_hedging_stats()
+            assert stats["hedges"] == 1
+            assert stats["hedge_wins"] == 1
+            # The abandoned read counts as at least as slow as the wait
+            assert stats["delays"]["/api/v4/devices/{id}"] >= 0.05
+        # The hedge wasn't coalesced into the slow request
+        assert len(api_server.requests) == 2
+
+    async def test_hedge_budget(self, api_server, access_token):
+        """No hedge is sent once the budget is used up."""
+
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.05)
+            return web.json_response({"data": []})
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        policy = HedgingPolicy(max_ratio=0.0, initial_delay=0.01)
+        async with OlarmFlowClient(access_token, hedging=policy) as client:
+            await client.get_devices(pageLength=10)
+            # Large pages are never hedged
+            await client.get_devices(pageLength=500)
+
+        assert len(api_server.requests) == 2
+        assert policy.stats()["requests"] == 1
+        assert policy.stats()["hedges"] == 0
+
+
+class TestTimeouts:
+    async def test_read_timeout(self, api_server, access_token, device_id):
+        """A response that never starts raises RequestTimeout."""
+
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(5)
+            return web.json_response({})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(
+            access_token, retry_policy=None, read_timeout=0.05
+        ) as client:
+            with pytest.raises(RequestTimeout) as exc_info:
+                await client.get_device(device_id)
+        assert isinstance(exc_info.value, OlarmFlowClientConnectionError)
+
+    async def test_deadline_spans_retries(self, api_server, access_token, device_id):
+        """Retries stop once the next one would start past the deadline."""
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(status=503)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        policy = RetryPolicy(max_attempts=100, base_delay=0.05, max_delay=0.05)
+        async with OlarmFlowClient(access_token, retry_policy=policy) as client:
+            start = asyncio.get_running_loop().time()
+            with client.deadline(0.12):
+                with pytest.raises(ServiceUnavailable):
+                    await client.get_device(device_id)
+            assert asyncio.get_running_loop().time() - start < 0.12
+        assert 2 <= len(api_server.requests) <= 3
+
+    async def test_deadline_cuts_off_hung_action(
+        self, api_server, access_token, device_id
+    ):
+        """A hung action is abandoned at the deadline and not re-sent."""
+
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(5)
+            return web.json_response({})
+
+        api_server.app.router.add_post("/api/v4/devices/{device_id}/actions", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, request_timeout=10) as client:
+            with client.deadline(0.1):
+                with pytest.raises(RequestTimeout):
+                    await client.send_device_area_disarm(device_id, 1)
+        assert len(api_server.requests) == 1
+
+    async def test_deadline_covers_streamed_body(self, api_server, access_token):
+        """A body that keeps trickling in is cut off at the request timeout."""
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            response = web.StreamResponse(headers={"Content-Type": "application/json"})
+            await response.prepare(request)
+            await response.write(b'{"data": [')
+            for i in range(50):
+                await response.write(b'%s{"deviceId": "d%d"}' % (b"," * bool(i), i))
+                await asyncio.sleep(0.02)
+            await response.write(b"]}")
+            await response.write_eof()
+            return response
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        streamed = []
+        async with OlarmFlowClient(access_token, request_timeout=0.2) as client:
+            start = asyncio.get_running_loop().time()
+            with pytest.raises(RequestTimeout):
+                async for device in client.stream_devices():
+                    streamed.append(device)
+            assert asyncio.get_running_loop().time() - start < 0.5
+        assert 0 < len(streamed) < 50
+
+    async def test_coalesced_read_keeps_each_callers_deadline(
+        self, api_server, access_token, device_id
+    ):
+        """A shared read is bounded by each caller's deadline, not the first's."""
+
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.2)
+            return web.json_response({"deviceId": device_id})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, coalesce_reads=True) as client:
+
+            async def hurried() -> dict[str, Any]:
+                with client.deadline(0.05):
+                    return await client.get_device(device_id)
+
+            first = asyncio.ensure_future(hurried())
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(client.get_device(device_id))
+            with pytest.raises(RequestTimeout):
+                await first
+            assert await second == {"deviceId": device_id}
+        assert len(api_server.requests) == 1
+
+    async def test_queued_actions_keep_each_callers_deadline(
+        self, api_server, access_token, device_id
+    ):
+        """Ordered actions run under their own caller's deadline only."""
+
+        async def handler(request: web.Request) -> web.Response:
+            body = await request.json()
+            await asyncio.sleep(0.15)
+            return web.json_response({"actionCmd": body["actionCmd"]})
+
+        api_server.app.router.add_post("/api/v4/devices/{device_id}/actions", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, ordered_actions=True) as client:
+
+            async def arm() -> dict[str, Any]:
+                with client.deadline(0.2):
+                    return await client.send_device_area_arm(device_id, 1)
+
+            first = asyncio.ensure_future(arm())
+            await asyncio.sleep(0.01)
+            # Sent after the first caller's deadline has passed
+            second = asyncio.ensure_future(client.send_device_area_stay(device_id, 1))
+            assert await first == {"actionCmd": "area-arm"}
+            assert await second == {"actionCmd": "area-stay"}
+
+            # A caller's own deadline bounds its wait in the queue
+            blocker = asyncio.ensure_future(client.send_device_area_arm(device_id, 2))
+            await asyncio.sleep(0.01)
+            start = asyncio.get_running_loop().time()
+            with client.deadline(0.05):
+                with pytest.raises(RequestTimeout):
+                    await client.send_device_area_sleep(device_id, 2)
+            assert asyncio.get_running_loop().time() - start < 0.1
+            await blocker
+
+
+class TestCoalescing:
+    async def test_concurrent_identical_reads_share_one_request(
+        self, api_server, access_token, device_id
+    ):
+        """Concurrent get_device calls for one device send a single request."""
+        release = asyncio.Event()
+
+        async def handler(request: web.Request) -> web.Response:
+            await release.wait()
+            return web.json_response({"deviceId": request.match_info["device_id"]})
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, coalesce_reads=True) as client:
+            calls = [
+                asyncio.ensure_future(client.get_device(device_id)) for _ in range(5)
+            ]
+            other = asyncio.ensure_future(client.get_device("other_device"))
+            await asyncio.sleep(0.05)
+            release.set()
+            results = await asyncio.gather(*calls, other)
+
+            assert results[:5] == [{"deviceId": device_id}] * 5
+            assert results[5] == {"deviceId": "other_device"}
+            assert client.get_coalesce_stats() == {
+                "hits": 4,
+                "misses": 2,
+                "in_flight": 0,
+            }
+        assert len(api_server.requests) == 2
+
+    async def test_coalesced_error_reaches_every_caller(
+        self, api_server, access_token, device_id
+    ):
+        """Each waiting caller receives the shared request's error."""
+
+        async def handler(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.02)
+            return web.Response(status=404)
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, coalesce_reads=True) as client:
+            results = await asyncio.gather(
+                *(client.get_device(device_id) for _ in range(3)),
+                return_exceptions=True,
+            )
+        assert all(isinstance(result, DeviceNotFound) for result in results)
+        assert len(api_server.requests) == 1
+
+
+class TestConditionalRequests:
+    async def test_not_modified_returns_stored_body(self, api_server, access_token):
+        """A 304 answer to If-None-Match reuses the previous body."""
+        body = {"data": [{"deviceId": "d1"}]}
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response(body, headers={"ETag": '"v1"'})
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, conditional_requests=True) as client:
+            first = await client.get_devices()
+            second = await client.get_devices()
+            # A different page has its own validators
+            await client.get_devices(page=2)
+
+        assert first == second == body
+        assert "If-None-Match" not in api_server.requests[0].headers
+        assert api_server.requests[1].headers["If-None-Match"] == '"v1"'
+        assert "If-None-Match" not in api_server.requests[2].headers
+
+    async def test_last_modified_validator(self, api_server, access_token, device_id):
+        """Last-Modified is echoed back as If-Modified-Since."""
+        stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.headers.get("If-Modified-Since") == stamp:
+                return web.Response(status=304)
+            return web.json_response(
+                {"deviceId": device_id}, headers={"Last-Modified": stamp}
+            )
+
+        api_server.app.router.add_get("/api/v4/devices/{device_id}", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token, conditional_requests=True) as client:
+            await client.get_device(device_id)
+            assert await client.get_device(device_id) == {"deviceId": device_id}
+        assert api_server.requests[1].headers["If-Modified-Since"] == stamp
+
+
+class TestStreaming:
+    async def test_stream_devices_parses_chunked_body(self, api_server, access_token):
+        """Devices are yielded one by one from a chunked response."""
+        devices = [{"deviceId": f"d{i}", "deviceName": f"Site {i}"} for i in range(50)]
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            assert request.query["pageLength"] == "50"
+            response = web.StreamResponse(headers={"Content-Type": "application/json"})
+            await response.prepare(request)
+            payload = json.dumps({"userId": "u1", "data": devices}).encode()
+            for i in range(0, len(payload), 97):
+                await response.write(payload[i : i + 97])
+            await response.write_eof()
+            return response
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token) as client:
+            streamed = [d async for d in client.stream_devices(pageLength=50)]
+        assert streamed == devices
+
+    async def test_stream_devices_maps_404(self, api_server, access_token):
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({"error": "notFound"}, status=404)
+
+        api_server.app.router.add_get("/api/v4/devices", handler)
+        await api_server.start()
+
+        async with OlarmFlowClient(access_token) as client:
+            with pytest.raises(DevicesNotFound):
+                async for _ in client.stream_devices():
+                    pass
@@ -0,0 +1,28 @@
+"""Tests for the benchmark harness."""
+
+from benchmarks import micro  # noqa: F401  (registers the benchmarks)
+from benchmarks.harness import BENCHMARKS, compare, run
+
+
+async def test_micro_benchmarks_run():
+    selected = [b for name, b in BENCHMARKS.items() if name.startswith("micro.")]
+    results = await run(selected, repeat=2, quick=True)
+
+    assert set(results) == {b.name for b in selected}
+    for bench in selected:
+        result = results[bench.name]
+        assert result["iterations"] == bench.quick_iterations
+        assert len(result["timings"]) == 2
+        assert result["per_op"] == result["median"] / result["iterations"]
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"per_op": 1.0}, "b": {"per_op": 1.0}}}
+    current = {
+        "results": {"a": {"per_op": 1.05}, "b": {"per_op": 1.5}, "new": {"per_op": 1.0}}
+    }
+
+    rows = compare(baseline, current, threshold=0.1)
+
+    assert [(r["name"], r["regression"]) for r in rows] == [("a", False), ("b", True)]
+    assert rows[1]["change"] == 0.5
@@ -0,0 +1,64 @@
+"""Tests for the in-memory response cache."""
+
+import time
+
+from olarmflowclient import ResponseCache
+
+
+class TestResponseCache:
+    def test_hit_miss_and_hit_rate(self):
+        cache = ResponseCache(ttl=None)
+        assert cache.get("a") is None
+        cache.set("a", {"value": 1})
+        assert cache.get("a") == {"value": 1}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        cache = ResponseCache(ttl=10)
+        cache.set("a", 1)
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(ttl=None, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_tag(self):
+        cache = ResponseCache(ttl=None)
+        cache.set(("device", "d1"), {}, tags=("d1",))
+        cache.set(("devices", 1), {}, tags=("d1", "d2"))
+        cache.set(("devices", 2), {}, tags=("d3",))
+
+        assert cache.invalidate_tag("d1") == 2
+        assert cache.invalidate_tag("d1") == 0
+        assert cache.get(("devices", 2)) == {}
+        # Removing the page also removed it from its other tags
+        assert cache.invalidate_tag("d2") == 0
+        assert cache.stats()["invalidations"] == 2
+
+    def test_set_skipped_after_tag_invalidated(self):
+        cache = ResponseCache(ttl=None)
+        generation = cache.generation
+        cache.invalidate_tag("d2")
+        assert cache.set("a", 1, tags=("d1",), since=generation)
+        assert not cache.set("b", 2, tags=("d1", "d2"), since=generation)
+        assert cache.get("b") is None
+        # Without ``since`` the value is always stored
+        assert cache.set("b", 2, tags=("d2",))
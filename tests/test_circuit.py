@@ -0,0 +1,87 @@
+"""Tests for the REST API circuit breaker."""
+
+import time
+
+from olarmflowclient import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        transitions = []
+        breaker = CircuitBreaker(
+            failure_threshold=3,
+            on_state_change=lambda state, info: transitions.append((state, info)),
+        )
+        breaker.on_failure()
+        breaker.on_failure()
+        breaker.on_success()  # resets the count
+        for _ in range(3):
+            assert breaker.allow_request()
+            breaker.on_failure()
+
+        assert breaker.state == "open"
+        assert not breaker.allow_request()
+        assert transitions == [("open", {"failures": 3, "retry_after": 30.0})]
+
+    def test_half_open_probe_closes_or_reopens(self, monkeypatch):
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now)
+        breaker = CircuitBreaker(failure_threshold=1, recovery_time=10)
+        breaker.on_failure()
+        assert breaker.retry_after == 10
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+        assert breaker.state == "half_open"
+        probe = breaker.allow_request()
+        assert probe is not None and probe.probe
+        # Only one probe at a time
+        assert breaker.allow_request() is None
+        breaker.on_failure(probe)
+        assert breaker.state == "open"
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 20)
+        probe = breaker.allow_request()
+        assert probe is not None
+        breaker.on_success(probe)
+        assert breaker.state == "closed"
+        assert breaker.allow_request()
+
+    def test_abandoned_probe_frees_slot(self, monkeypatch):
+        now = time.monotonic()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_time=1)
+        breaker.on_failure()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+
+        probe = breaker.allow_request()
+        assert probe is not None
+        breaker.on_abandoned(probe)
+        assert breaker.allow_request()
+
+    def test_late_outcomes_do_not_count_as_probes(self, monkeypatch):
+        now = time.monotonic()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_time=1)
+        early = breaker.allow_request()
+        assert early is not None and not early.probe
+        breaker.on_failure()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+        probe = breaker.allow_request()
+        assert probe is not None
+
+        # A request admitted while closed finishes during the probe
+        breaker.on_success(early)
+        assert breaker.state == "half_open"
+        breaker.on_abandoned(early)
+        assert breaker.allow_request() is None
+
+        breaker.on_success(probe)
+        assert breaker.state == "closed"
+
+    def test_callback_errors_are_contained(self):
+        def callback(state, info):
+            raise RuntimeError("boom")
+
+        breaker = CircuitBreaker(failure_threshold=1, on_state_change=callback)
+        breaker.on_failure()
+        assert breaker.state == "open"
+        breaker.reset()
+        assert breaker.state == "closed"
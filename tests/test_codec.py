@@ -0,0 +1,49 @@
+"""Tests for the pluggable JSON codecs."""
+
+import pytest
+
+from olarmflowclient import JsonCodec, OlarmFlowClient, get_codec
+from olarmflowclient.codec import MsgspecCodec, OrjsonCodec
+
+
+def _available_codecs() -> list[type[JsonCodec]]:
+    codecs: list[type[JsonCodec]] = [JsonCodec]
+    for codec_cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            codec_cls()
+        except RuntimeError:
+            continue
+        codecs.append(codec_cls)
+    return codecs
+
+
+@pytest.mark.parametrize("codec_cls", _available_codecs())
+class TestCodecs:
+    def test_round_trip_bytes(self, codec_cls):
+        codec = codec_cls()
+        body = {"actionCmd": "area-arm", "actionNum": 1, "name": "Zoë"}
+        encoded = codec.dumps(body)
+        assert isinstance(encoded, bytes)
+        assert codec.loads(encoded) == body
+        assert codec.loads(bytearray(encoded)) == body
+        assert codec.loads(memoryview(encoded)) == body
+        assert codec.loads(encoded.decode()) == body
+
+    def test_malformed_input_raises_value_error(self, codec_cls):
+        codec = codec_cls()
+        with pytest.raises(ValueError):
+            codec.loads(b"invalid json")
+        with pytest.raises(ValueError):
+            codec.loads(b"\xff\xfe")
+
+
+def test_get_codec_by_name():
+    assert get_codec("json").name == "json"
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_client_uses_supplied_codec():
+    codec = JsonCodec()
+    client = OlarmFlowClient("token", json_codec=codec)
+    assert client._json is codec
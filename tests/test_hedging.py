@@ -0,0 +1,33 @@
+"""Tests for the hedged read policy."""
+
+from olarmflowclient import HedgingPolicy
+
+
+class TestHedgingPolicy:
+    def test_delay_tracks_quantile(self):
+        policy = HedgingPolicy(initial_delay=0.5, min_samples=10, min_delay=0)
+        assert policy.delay("/api/v4/devices/{id}") == 0.5
+
+        for ms in range(1, 101):
+            policy.observe("/api/v4/devices/{id}", ms / 1000)
+        assert policy.delay("/api/v4/devices/{id}") == 0.096
+        # Other endpoints keep their own history
+        assert policy.delay("/api/v4/devices") == 0.5
+
+    def test_delay_bounds(self):
+        policy = HedgingPolicy(min_samples=1, min_delay=0.05, max_delay=1.0)
+        policy.observe("a", 0.001)
+        assert policy.delay("a") == 0.05
+        policy.observe("b", 30.0)
+        assert policy.delay("b") == 1.0
+
+    def test_hedges_capped_by_ratio(self):
+        policy = HedgingPolicy(max_ratio=0.1)
+        for _ in range(19):
+            policy.on_request()
+        assert policy.try_hedge()
+        assert not policy.try_hedge()
+
+        policy.on_request()
+        assert policy.try_hedge()
+        assert policy.stats()["hedge_ratio"] == 0.1
@@ -0,0 +1,105 @@
+"""Tests for the load generator."""
+
+import json
+
+import pytest
+
+from olarmflowclient import OlarmFlowClient
+from olarmflowclient.loadgen import (
+    LoadGenerator,
+    format_report,
+    main,
+    parse_weights,
+    percentile,
+)
+from olarmflowclient.testing import FakeOlarmApi
+
+
+def test_parse_weights():
+    assert parse_weights("get_device=3,action") == {"get_device": 3.0, "action": 1.0}
+    with pytest.raises(ValueError):
+        parse_weights("get_everything=1", ("get_device",))
+    with pytest.raises(ValueError):
+        parse_weights("action=0")
+
+
+def test_percentile():
+    values = [float(n) for n in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) is None
+
+
+async def test_load_generator_reports_errors():
+    async with FakeOlarmApi(
+        devices=3, error_ratio=0.5, error_statuses=(503,), seed=1
+    ) as api:
+        async with OlarmFlowClient(
+            "token", base_url=api.url, retry_policy=None
+        ) as client:
+            generator = LoadGenerator(
+                client, list(api.devices), rate=200, mix={"get_device": 1}, seed=1
+            )
+            report = await generator.run(0.25)
+
+    total = report["total"]
+    assert total["count"] == report["operations"]["get_device"]["count"] >= 40
+    assert total["ok"] > 0
+    assert total["errors"] == {"ServiceUnavailable": total["failed"]}
+    assert total["p50_ms"] <= total["p99_ms"] <= total["max_ms"]
+    assert api.stats()["requests"]["GET /api/v4/devices/{id}"] == total["count"]
+    assert "ServiceUnavailable" in format_report(report)
+
+
+async def test_skips_calls_over_concurrency():
+    async with FakeOlarmApi(devices=1, latency=0.2) as api:
+        async with OlarmFlowClient("token", base_url=api.url) as client:
+            generator = LoadGenerator(
+                client, list(api.devices), rate=100, concurrency=2, seed=1
+            )
+            report = await generator.run(0.1)
+
+    assert report["total"]["count"] == 2
+    assert report["skipped"] >= 5
+
+
+def test_cli_against_fake_servers(capsys):
+    assert (
+        main(
+            [
+                "--fake",
+                "--devices",
+                "5",
+                "--rate",
+                "50",
+                "--duration",
+                "0.5",
+                "--mix",
+                "get_device=1,action=1",
+                "--mqtt-rate",
+                "50",
+                "--seed",
+                "1",
+                "--json",
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["total"]["failed"] == 0
+    assert set(report["operations"]) <= {
+        "get_device",
+        "action:area-arm",
+        "action:area-disarm",
+    }
+    assert report["mqtt"]["messages"] > 0
+    assert report["mqtt"]["statuses"]["connected"] == 1
+
+
+@pytest.mark.parametrize(
+    "argv", [["--devices", "0"], ["--actions", "area-arm,user-everything"]]
+)
+def test_cli_rejects_bad_arguments(argv, capsys):
+    with pytest.raises(SystemExit):
+        main(["--fake", *argv])
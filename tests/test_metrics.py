@@ -0,0 +1,75 @@
+"""Tests for REST request metrics."""
+
+from olarmflowclient import ApiMetrics, RequestSample
+from olarmflowclient.metrics import LatencyHistogram, endpoint_template
+
+
+class TestEndpointTemplate:
+    def test_ids_replaced(self):
+        assert endpoint_template("/api/v4/devices") == "/api/v4/devices"
+        assert endpoint_template("/api/v4/devices/abc") == "/api/v4/devices/{id}"
+        assert (
+            endpoint_template("/api/v4/devices/abc/actions")
+            == "/api/v4/devices/{id}/actions"
+        )
+        assert (
+            endpoint_template("/api/v4/prolinks/p1/actions")
+            == "/api/v4/prolinks/{id}/actions"
+        )
+
+
+class TestLatencyHistogram:
+    def test_quantiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram([0.1, 1.0])
+        for value in (0.05, 0.05, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.75) == 1.0
+        # The overflow bucket reports the largest value seen
+        assert histogram.quantile(0.99) == 3.0
+        assert histogram.snapshot()["buckets"] == {"0.1": 2, "1.0": 1, "+Inf": 1}
+
+    def test_empty(self):
+        assert LatencyHistogram().quantile(0.5) is None
+
+
+class TestApiMetrics:
+    def test_record_aggregates_per_endpoint(self):
+        metrics = ApiMetrics()
+        metrics.record(
+            RequestSample("GET", "/api/v4/devices/{id}", 200, latency=0.02, bytes_in=10)
+        )
+        metrics.record(
+            RequestSample(
+                "GET",
+                "/api/v4/devices/{id}",
+                429,
+                error="RateLimited",
+                retries=2,
+                latency=0.3,
+                bytes_in=5,
+            )
+        )
+
+        stats = metrics.snapshot()["GET /api/v4/devices/{id}"]
+        assert stats["count"] == 2
+        assert stats["statuses"] == {200: 1, 429: 1}
+        assert stats["errors"] == {"RateLimited": 1}
+        assert stats["retries"] == 2
+        assert stats["bytes_in"] == 15
+        assert stats["latency"]["max"] == 0.3
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_listeners(self):
+        seen = []
+        metrics = ApiMetrics(on_request=seen.append)
+        remove = metrics.add_listener(lambda sample: 1 / 0)  # errors are logged
+        sample = RequestSample("POST", "/api/v4/devices/{id}/actions", 200)
+
+        metrics.record(sample)
+        remove()
+        metrics.record(sample)
+        assert seen == [sample, sample]
@@ -2,10 +2,14 @@
 Tests for the unified OlarmFlowClient class combining API and MQTT functionality.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from olarmflowclient import (
+    ActionNotConfirmed,
+    BulkAction,
     OlarmFlowClient,
     OlarmFlowClientApiError,
     TokenExpired,
@@ -19,7 +23,9 @@ from olarmflowclient import (
     MqttAuthError,
     MqttConnectError,
     MqttTimeoutError,
+    ResponseCache,
 )
+from olarmflowclient.testing import FakeOlarmApi
 
 
 @pytest.fixture
@@ -353,6 +359,82 @@ class TestOlarmFlowClient:
             assert exc_info.value.status_code == 418
             mock_request.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_iter_devices_paginates_until_short_page(self, access_token):
+        """Test iter_devices yields every page in order and stops on a short page."""
+        client = OlarmFlowClient(access_token)
+        pages = {
+            1: {"data": [{"deviceId": "d1"}, {"deviceId": "d2"}]},
+            2: {"data": [{"deviceId": "d3"}, {"deviceId": "d4"}]},
+            3: {"data": [{"deviceId": "d5"}]},
+        }
+
+        async def fake_get_devices(page, pageLength, search):
+            if page not in pages:
+                raise DevicesNotFound()
+            return pages[page]
+
+        with patch.object(
+            client, "get_devices", side_effect=fake_get_devices
+        ) as mock_get:
+            devices = [
+                device["deviceId"]
+                async for device in client.iter_devices(pageLength=2, prefetch=2)
+            ]
+
+        assert devices == ["d1", "d2", "d3", "d4", "d5"]
+        requested = [call.kwargs["page"] for call in mock_get.call_args_list]
+        # Pages are prefetched ahead of the consumer, never more than 3 in flight
+        assert requested[:3] == [1, 2, 3]
+        assert max(requested) <= 5
+
+    @pytest.mark.asyncio
+    async def test_iter_devices_without_prefetch(self, access_token):
+        """Test iter_devices with prefetch=0 reads every page, one at a time."""
+        client = OlarmFlowClient(access_token)
+
+        async def fake_get_devices(page, pageLength, search):
+            ids = range((page - 1) * pageLength, min(page * pageLength, 25))
+            return {"data": [{"deviceId": f"d{n}"} for n in ids]}
+
+        with patch.object(
+            client, "get_devices", side_effect=fake_get_devices
+        ) as mock_get:
+            devices = [
+                device["deviceId"]
+                async for device in client.iter_devices(pageLength=10, prefetch=0)
+            ]
+            with pytest.raises(ValueError):
+                await client.iter_devices(prefetch=-1).__anext__()
+
+        assert devices == [f"d{n}" for n in range(25)]
+        assert [call.kwargs["page"] for call in mock_get.call_args_list] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_iter_devices_stops_on_devices_not_found(self, access_token):
+        """Test iter_devices ends cleanly when the API reports no more devices."""
+        client = OlarmFlowClient(access_token)
+
+        async def fake_get_devices(page, pageLength, search):
+            if page == 1:
+                return {"data": [{"deviceId": "d1"}, {"deviceId": "d2"}]}
+            raise DevicesNotFound()
+
+        with patch.object(client, "get_devices", side_effect=fake_get_devices):
+            devices = [device async for device in client.iter_devices(pageLength=2)]
+
+        assert [d["deviceId"] for d in devices] == ["d1", "d2"]
+
+    @pytest.mark.asyncio
+    async def test_iter_devices_propagates_other_errors(self, access_token):
+        """Test iter_devices surfaces errors other than DevicesNotFound."""
+        client = OlarmFlowClient(access_token)
+
+        with patch.object(client, "get_devices", side_effect=RateLimited()):
+            with pytest.raises(RateLimited):
+                async for _ in client.iter_devices(prefetch=0):
+                    pass
+
     @pytest.mark.asyncio
     async def test_get_device(self, access_token, device_id):
         """Test get_device method."""
@@ -371,6 +453,65 @@ class TestOlarmFlowClient:
                 params={"deviceApiAccessOnly": "1"},
             )
 
+    @pytest.mark.asyncio
+    async def test_get_device_cached_until_mqtt_update(self, access_token, device_id):
+        """Test cached device reads are invalidated by an MQTT message."""
+        cache = ResponseCache(ttl=60)
+        client = OlarmFlowClient(access_token, response_cache=cache)
+        client.subscribe_to_device(device_id, MagicMock())
+
+        with patch.object(
+            client, "_api_make_request", return_value={"deviceId": device_id}
+        ) as mock_request:
+            await client.get_device(device_id)
+            await client.get_device(device_id)
+            assert mock_request.call_count == 1
+
+            client._mqtt_dispatch(f"v4/devices/{device_id}", b'{"state": "arm"}')
+            await client.get_device(device_id)
+            assert mock_request.call_count == 2
+
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_device_not_cached_after_update_in_flight(
+        self, access_token, device_id
+    ):
+        """Test a response overtaken by an MQTT update is not cached."""
+        cache = ResponseCache(ttl=60)
+        client = OlarmFlowClient(access_token, response_cache=cache)
+        client.subscribe_to_device(device_id, MagicMock())
+
+        async def respond_after_update(*args, **kwargs):
+            # The update arrives while the request is still in flight
+            client._mqtt_dispatch(f"v4/devices/{device_id}", b'{"state": "arm"}')
+            return {"state": "disarm"}
+
+        with patch.object(
+            client, "_api_make_request", side_effect=respond_after_update
+        ):
+            assert await client.get_device(device_id) == {"state": "disarm"}
+
+        assert cache.get(("device", device_id)) is None
+
+    @pytest.mark.asyncio
+    async def test_get_devices_page_invalidated_by_member_device(self, access_token):
+        """Test a cached devices page is dropped when one of its devices changes."""
+        client = OlarmFlowClient(access_token, response_cache=ResponseCache())
+        page = {"data": [{"deviceId": "d1"}, {"deviceId": "d2"}]}
+
+        with patch.object(
+            client, "_api_make_request", return_value=page
+        ) as mock_request:
+            await client.get_devices()
+            client._mqtt_dispatch("v4/devices/other", b"{}")
+            await client.get_devices()
+            assert mock_request.call_count == 1
+
+            client._mqtt_dispatch("v4/devices/d2", b"{}")
+            await client.get_devices()
+            assert mock_request.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_device_404_raises_device_not_found(
         self, access_token, device_id
@@ -447,6 +588,121 @@ class TestOlarmFlowClient:
             assert exc_info.value.status_code == 429
             mock_request.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_devices_by_id(self, access_token):
+        """Test get_devices_by_id reports per-device results and errors."""
+        client = OlarmFlowClient(access_token)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_get_device(device_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if device_id == "missing":
+                raise DeviceNotFound(device_id)
+            if device_id == "limited":
+                raise RateLimited()
+            return {"deviceId": device_id}
+
+        device_ids = ["d1", "missing", "d2", "limited", "d3"]
+        with patch.object(client, "get_device", side_effect=fake_get_device):
+            results = {
+                device_id: result
+                async for device_id, result in client.get_devices_by_id(
+                    device_ids, concurrency=2
+                )
+            }
+
+        assert set(results) == set(device_ids)
+        assert results["d1"] == {"deviceId": "d1"}
+        assert isinstance(results["missing"], DeviceNotFound)
+        assert isinstance(results["limited"], RateLimited)
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_get_devices_by_id_reads_ids_lazily(self, access_token):
+        """Test get_devices_by_id only pulls ids as workers become free."""
+        client = OlarmFlowClient(access_token)
+        pulled = 0
+
+        def device_ids():
+            nonlocal pulled
+            for n in range(5000):
+                pulled += 1
+                yield f"d{n}"
+
+        async def fake_get_device(device_id):
+            await asyncio.sleep(0)
+            return {"deviceId": device_id}
+
+        with patch.object(client, "get_device", side_effect=fake_get_device):
+            results = client.get_devices_by_id(device_ids(), concurrency=3)
+            assert await results.__anext__() == ("d0", {"deviceId": "d0"})
+            # Each worker holds one id, plus the results queue (size 3)
+            assert pulled <= 3 + 3 + 1
+            await results.aclose()
+
+        with pytest.raises(ValueError):
+            await client.get_devices_by_id(["d1"], concurrency=0).__anext__()
+
+    @pytest.mark.asyncio
+    async def test_iter_device_events_follows_cursor(self, access_token, device_id):
+        """Test iter_device_events pages through history with the after cursor."""
+        client = OlarmFlowClient(access_token)
+        history = [{"eventId": f"e{i}", "eventTs": i} for i in range(7)]
+
+        async def fake_get_device_events(device_id, limit, after):
+            start = 0 if after is None else int(after[1:]) + 1
+            return {"data": history[start : start + limit]}
+
+        with patch.object(
+            client, "get_device_events", side_effect=fake_get_device_events
+        ) as mock_events:
+            events = [
+                event
+                async for event in client.iter_device_events(device_id, page_size=3)
+            ]
+
+        assert events == history
+        cursors = [call.kwargs["after"] for call in mock_events.call_args_list]
+        assert cursors == [None, "e2", "e5"]
+
+    @pytest.mark.asyncio
+    async def test_iter_device_events_bounds(self, access_token, device_id):
+        """Test iter_device_events stops at the time and count bounds."""
+        client = OlarmFlowClient(access_token)
+
+        async def fake_get_device_events(device_id, limit, after):
+            start = 0 if after is None else int(after[1:]) + 1
+            return {
+                "data": [
+                    {"eventId": f"e{i}", "eventTs": i}
+                    for i in range(start, start + limit)
+                ]
+            }
+
+        with patch.object(
+            client, "get_device_events", side_effect=fake_get_device_events
+        ):
+            by_time = [
+                event["eventTs"]
+                async for event in client.iter_device_events(
+                    device_id, since="e9", page_size=4, until=15
+                )
+            ]
+            by_count = [
+                event["eventTs"]
+                async for event in client.iter_device_events(
+                    device_id, page_size=4, max_events=6
+                )
+            ]
+
+        assert by_time == [10, 11, 12, 13, 14, 15]
+        assert by_count == [0, 1, 2, 3, 4, 5]
+
     @pytest.mark.asyncio
     async def test_send_device_area_arm(self, access_token, device_id):
         """Test send_device_area_arm method."""
@@ -461,6 +717,223 @@ class TestOlarmFlowClient:
             assert result == expected_result
             mock_action.assert_called_once_with(device_id, "area-arm", 1)
 
+    @pytest.mark.asyncio
+    async def test_send_bulk_actions(self, access_token):
+        """Test send_bulk_actions reports per-target outcomes in order."""
+        client = OlarmFlowClient(access_token)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_send_action(device_id, action_cmd, action_num, prolink_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if device_id == "busy":
+                raise OlarmFlowClientApiError("Request failed", status_code=429)
+            if device_id == "down":
+                raise OlarmFlowClientConnectionError()
+            return {"deviceId": device_id, "prolinkId": prolink_id}
+
+        actions = [
+            BulkAction("d1", "area-arm", 1),
+            BulkAction("busy", "area-arm", 1),
+            BulkAction("d2", "link-io-open", 2, prolink_id="link1"),
+            BulkAction("down", "area-arm", 1),
+        ]
+        with patch.object(client, "_api_send_action", side_effect=fake_send_action):
+            summary = await client.send_bulk_actions(actions, concurrency=2)
+
+        assert [result.action for result in summary.results] == actions
+        assert [result.action.device_id for result in summary.succeeded] == [
+            "d1",
+            "d2",
+        ]
+        assert summary.results[2].response == {"deviceId": "d2", "prolinkId": "link1"}
+        # Raw API errors are mapped to their specific exception types
+        assert isinstance(summary.results[1].error, RateLimited)
+        assert summary.error_counts() == {
+            "RateLimited": 1,
+            "OlarmFlowClientConnectionError": 1,
+        }
+        assert all(result.latency >= 0 for result in summary.results)
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_send_bulk_actions_records_every_failure(self, access_token):
+        """Test unexpected errors get a result slot and don't stop the batch."""
+        client = OlarmFlowClient(access_token)
+        pulled = 0
+
+        def generate():
+            nonlocal pulled
+            for n in range(6):
+                pulled += 1
+                yield BulkAction(f"d{n}", "area-arm", 1)
+
+        async def fake_send_action(device_id, action_cmd, action_num, prolink_id):
+            # Actions are read from the iterable as workers free up
+            assert pulled <= int(device_id[1:]) + 2
+            await asyncio.sleep(0.01 if device_id == "d0" else 0)
+            if device_id == "d1":
+                raise RuntimeError("boom")
+            if device_id == "d4":
+                raise OlarmFlowClientApiError("Request failed", status_code=503)
+            return {"deviceId": device_id}
+
+        with patch.object(client, "_api_send_action", side_effect=fake_send_action):
+            summary = await client.send_bulk_actions(generate(), concurrency=2)
+            with pytest.raises(ValueError):
+                await client.send_bulk_actions([], concurrency=0)
+
+        assert [result.action.device_id for result in summary.results] == [
+            f"d{n}" for n in range(6)
+        ]
+        assert summary.error_counts() == {"RuntimeError": 1, "ServiceUnavailable": 1}
+        assert len(summary.succeeded) == 4
+
+    @pytest.mark.asyncio
+    async def test_ordered_actions_per_device(self, access_token):
+        """Test ordered_actions keeps per-device order and runs devices in parallel."""
+        client = OlarmFlowClient(access_token, ordered_actions=True)
+        log = []
+        release = asyncio.Event()
+
+        async def fake_send_now(device_id, action_cmd, action_num, prolink_id):
+            log.append(("start", device_id, action_cmd))
+            await release.wait()
+            log.append(("end", device_id, action_cmd))
+            return {"actionCmd": action_cmd}
+
+        with patch.object(client, "_api_send_action_now", side_effect=fake_send_now):
+            calls = [
+                asyncio.ensure_future(client.send_device_zone_bypass("d1", 3)),
+                asyncio.ensure_future(client.send_device_area_arm("d1", 1)),
+                # Identical to the action queued just before: shares its request
+                asyncio.ensure_future(client.send_device_area_arm("d1", 1)),
+                asyncio.ensure_future(client.send_device_area_arm("d2", 1)),
+            ]
+            await asyncio.sleep(0.01)
+            # Both devices started; d1's arm waits behind its bypass
+            assert log == [("start", "d1", "zone-bypass"), ("start", "d2", "area-arm")]
+            assert client.get_action_queue_depths() == {"d1": 2, "d2": 1}
+
+            release.set()
+            results = await asyncio.gather(*calls)
+
+        assert [r["actionCmd"] for r in results] == [
+            "zone-bypass",
+            "area-arm",
+            "area-arm",
+            "area-arm",
+        ]
+        d1_log = [entry for entry in log if entry[1] == "d1"]
+        assert d1_log == [
+            ("start", "d1", "zone-bypass"),
+            ("end", "d1", "zone-bypass"),
+            ("start", "d1", "area-arm"),
+            ("end", "d1", "area-arm"),
+        ]
+        assert client._action_scheduler.coalesced == 1
+        assert client.get_action_queue_depths() == {}
+
+    @pytest.mark.asyncio
+    async def test_ordered_actions_error_does_not_block_queue(self, access_token):
+        """Test a failed action is reported and the next one still runs."""
+        client = OlarmFlowClient(access_token, ordered_actions=True)
+
+        async def fake_send_now(device_id, action_cmd, action_num, prolink_id):
+            if action_cmd == "zone-bypass":
+                raise OlarmFlowClientApiError("Request failed", status_code=400)
+            return {"ok": True}
+
+        with patch.object(client, "_api_send_action_now", side_effect=fake_send_now):
+            results = await asyncio.gather(
+                client.send_device_zone_bypass("d1", 3),
+                client.send_device_area_arm("d1", 1),
+                return_exceptions=True,
+            )
+
+        assert isinstance(results[0], OlarmFlowClientApiError)
+        assert results[1] == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_ordered_action_cancelled_before_start_is_not_sent(self):
+        """Test a queued action its caller gave up on never reaches the API."""
+        async with FakeOlarmApi(devices=1, latency=0.1) as api:
+            async with OlarmFlowClient(
+                "token", base_url=api.url, ordered_actions=True
+            ) as client:
+                arm = asyncio.ensure_future(
+                    client.send_device_area_arm("device-00001", 1)
+                )
+                await asyncio.sleep(0.01)
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        client.send_device_area_disarm("device-00001", 1), 0.02
+                    )
+                # A coalesced action stays queued while anyone still waits
+                stay = [
+                    asyncio.ensure_future(
+                        client.send_device_area_stay("device-00001", 1)
+                    )
+                    for _ in range(2)
+                ]
+                await asyncio.sleep(0.01)
+                stay[0].cancel()
+                await arm
+                assert (await stay[1])["actionCmd"] == "area-stay"
+                assert client.get_action_queue_depths() == {}
+                actions = await client.get_device_actions("device-00001")
+
+        assert [a["actionCmd"] for a in actions["data"]] == ["area-arm", "area-stay"]
+
+    @pytest.mark.asyncio
+    async def test_send_and_confirm(self, access_token, device_id):
+        """Test send_and_confirm resolves on the matching MQTT state."""
+        client = OlarmFlowClient(access_token)
+        topic = f"v4/devices/{device_id}"
+        client._mqtt_callbacks[topic] = MagicMock()
+
+        async def fake_send(device_id, action_cmd, action_num, prolink_id):
+            loop = asyncio.get_running_loop()
+            # A message for another area does not confirm the action
+            loop.call_soon(
+                client._mqtt_dispatch,
+                topic,
+                b'{"deviceState": {"areas": ["disarm", "arm"]}}',
+            )
+            loop.call_soon(
+                client._mqtt_dispatch,
+                topic,
+                b'{"deviceState": {"areas": ["arm", "arm"]}}',
+            )
+            return {"ok": True}
+
+        with patch.object(client, "_api_send_action", side_effect=fake_send):
+            latency = await client.send_and_confirm(device_id, "area-arm", 1)
+
+        assert latency >= 0
+        assert client._mqtt_callbacks[topic].call_count == 2
+        assert client._mqtt_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_send_and_confirm_timeout(self, access_token, device_id):
+        """Test send_and_confirm raises ActionNotConfirmed on timeout."""
+        client = OlarmFlowClient(access_token)
+        client._mqtt_callbacks[f"v4/devices/{device_id}"] = MagicMock()
+
+        with patch.object(client, "_api_send_action", return_value={"ok": True}):
+            with pytest.raises(ActionNotConfirmed):
+                await client.send_and_confirm(device_id, "area-disarm", 1, timeout=0.01)
+            with pytest.raises(ValueError):
+                await client.send_and_confirm(device_id, "zone-bypass", 1)
+            with pytest.raises(RuntimeError):
+                await client.send_and_confirm("other", "area-arm", 1)
+
+        assert client._mqtt_waiters == {}
+
     def test_set_mqtt_status_callback(self, access_token):
         """Test setting MQTT status callback."""
         client = OlarmFlowClient(access_token)
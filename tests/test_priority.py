@@ -0,0 +1,114 @@
+"""Tests for the REST request priority lanes."""
+
+import asyncio
+
+import pytest
+
+from olarmflowclient import PriorityScheduler
+from olarmflowclient.priority import classify_request, request_lane
+
+
+class TestClassifyRequest:
+    def test_default_lanes(self):
+        assert (
+            classify_request(
+                "POST", "/api/v4/devices/d1/actions", {"actionCmd": "user-panic"}
+            )
+            == "critical"
+        )
+        assert (
+            classify_request(
+                "POST", "/api/v4/devices/d1/actions", {"actionCmd": "area-arm"}
+            )
+            == "interactive"
+        )
+        assert classify_request("GET", "/api/v4/devices/d1") == "interactive"
+        assert classify_request("GET", "/api/v4/devices") == "bulk"
+        assert classify_request("GET", "/api/v4/devices/d1/events") == "bulk"
+
+    def test_override_keeps_critical_actions(self):
+        with request_lane("bulk"):
+            assert classify_request("GET", "/api/v4/devices/d1") == "bulk"
+            assert (
+                classify_request(
+                    "POST", "/api/v4/devices/d1/actions", {"actionCmd": "area-disarm"}
+                )
+                == "critical"
+            )
+        assert classify_request("GET", "/api/v4/devices/d1") == "interactive"
+
+        with pytest.raises(ValueError):
+            with request_lane("urgent"):
+                pass
+
+
+class TestPriorityScheduler:
+    async def test_reserved_slots_only_for_critical(self):
+        scheduler = PriorityScheduler(max_concurrent=2, reserved_critical=1)
+        await scheduler.acquire("bulk")
+
+        interactive = asyncio.create_task(scheduler.acquire("interactive"))
+        await asyncio.sleep(0)
+        assert not interactive.done()
+        # The reserved slot is still free for critical requests
+        assert await scheduler.acquire("critical") == 0.0
+
+        scheduler.release("bulk")
+        await interactive
+        assert scheduler.stats()["interactive"]["requests"] == 1
+        assert scheduler.stats()["interactive"]["wait_max"] > 0
+
+    async def test_higher_lanes_admitted_first(self):
+        scheduler = PriorityScheduler(max_concurrent=1, reserved_critical=0)
+        await scheduler.acquire("bulk")
+        order = []
+
+        async def wait(lane):
+            await scheduler.acquire(lane)
+            order.append(lane)
+            scheduler.release(lane)
+
+        tasks = [
+            asyncio.create_task(wait(lane))
+            for lane in ("bulk", "interactive", "critical")
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["bulk"]["queued"] == 1
+
+        scheduler.release("bulk")
+        await asyncio.gather(*tasks)
+        assert order == ["critical", "interactive", "bulk"]
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = PriorityScheduler(max_concurrent=1, reserved_critical=0)
+        await scheduler.acquire("bulk")
+        waiter = asyncio.create_task(scheduler.acquire("bulk"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        scheduler.release("bulk")
+        stats = scheduler.stats()["bulk"]
+        assert stats["queued"] == 0
+        assert stats["in_flight"] == 0
+
+    async def test_release_skips_waiter_cancelled_before_it_runs(self):
+        scheduler = PriorityScheduler(max_concurrent=1, reserved_critical=0)
+        await scheduler.acquire("bulk")
+        cancelled = asyncio.create_task(scheduler.acquire("bulk"))
+        waiter = asyncio.create_task(scheduler.acquire("bulk"))
+        await asyncio.sleep(0)
+
+        # The slot is freed before the cancelled task gets to run
+        cancelled.cancel()
+        scheduler.release("bulk")
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        await asyncio.wait_for(waiter, 1)
+
+        stats = scheduler.stats()["bulk"]
+        assert stats["queued"] == 0
+        assert stats["in_flight"] == 1
+        scheduler.release("bulk")
+        assert scheduler.stats()["bulk"]["in_flight"] == 0
@@ -0,0 +1,62 @@
+"""Tests for the adaptive client-side rate limiter."""
+
+import asyncio
+import time
+
+from olarmflowclient import AdaptiveRateLimiter
+
+
+class TestAdaptiveRateLimiter:
+    async def test_burst_then_paced(self):
+        """Tokens up to the burst are free, later calls wait for refill."""
+        limiter = AdaptiveRateLimiter(rate=50.0, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        # Two calls beyond the burst at 50/s need ~40ms of refill
+        assert time.monotonic() - start >= 0.035
+
+    async def test_rate_limited_cuts_rate_once_per_cooldown(self):
+        """A burst of 429s from in-flight calls halves the rate only once."""
+        limiter = AdaptiveRateLimiter(rate=8.0, min_rate=1.0)
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        assert limiter.rate == 4.0
+
+    async def test_rate_floor_and_recovery(self):
+        """The rate never drops below min_rate and recovers towards max_rate."""
+        limiter = AdaptiveRateLimiter(rate=2.0, min_rate=1.5, decrease_cooldown=0)
+        limiter.on_rate_limited()
+        limiter.on_rate_limited()
+        assert limiter.rate == 1.5
+
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.rate == 2.0
+
+    async def test_retry_after_pauses_callers(self):
+        """Retry-After blocks new calls and they are reported as queued."""
+        limiter = AdaptiveRateLimiter(rate=100.0)
+        limiter.on_rate_limited(retry_after=0.05)
+
+        start = time.monotonic()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+        await waiter
+        assert time.monotonic() - start >= 0.05
+        assert limiter.queue_depth == 0
+
+    async def test_priority_skips_queue_but_borrows_token(self):
+        """A priority call doesn't wait behind others but still uses a token."""
+        limiter = AdaptiveRateLimiter(rate=10.0, burst=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        start = time.monotonic()
+        await limiter.acquire(priority=True)
+        assert time.monotonic() - start < 0.05
+        assert not waiter.done()
+        await waiter
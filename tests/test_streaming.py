@@ -0,0 +1,56 @@
+"""Tests for incremental JSON array extraction."""
+
+import json
+
+import pytest
+
+from olarmflowclient.streaming import JsonArrayStreamer
+
+DOCUMENT = {
+    "userId": "u1",
+    "meta": {"data": [{"decoy": True}], "note": 'tricky "data": [{}] \\ text'},
+    "data": [
+        {"deviceId": "d1", "deviceName": "Brace } and [ bracket"},
+        {"deviceId": "d2", "nested": {"zones": [1, 2, {"x": "\\"}]}},
+        {"deviceId": "d3", "deviceName": 'Quote " inside'},
+    ],
+    "after": "tail",
+}
+
+
+def _split(payload: bytes, size: int) -> list[bytes]:
+    return [payload[i : i + size] for i in range(0, len(payload), size)]
+
+
+class TestJsonArrayStreamer:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 10_000])
+    def test_items_extracted_across_chunk_boundaries(self, chunk_size):
+        payload = json.dumps(DOCUMENT).encode()
+        streamer = JsonArrayStreamer("data")
+        items = []
+        for chunk in _split(payload, chunk_size):
+            items.extend(json.loads(raw) for raw in streamer.feed(chunk))
+
+        assert items == DOCUMENT["data"]
+        assert streamer.done
+
+    def test_buffer_holds_only_current_item(self):
+        devices = [{"deviceId": f"d{i}", "pad": "x" * 100} for i in range(200)]
+        payload = json.dumps({"data": devices}).encode()
+        streamer = JsonArrayStreamer()
+        largest = 0
+        for chunk in _split(payload, 50):
+            streamer.feed(chunk)
+            largest = max(largest, len(streamer._buf))
+        assert largest < 300
+
+    def test_missing_or_non_array_key_yields_nothing(self):
+        for document in ({"other": [{"a": 1}]}, {"data": {"a": [{"b": 1}]}}):
+            streamer = JsonArrayStreamer("data")
+            assert streamer.feed(json.dumps(document).encode()) == []
+            assert not streamer.done
+
+    def test_empty_array(self):
+        streamer = JsonArrayStreamer("data")
+        assert streamer.feed(b'{"data": [], "userId": "u"}') == []
+        assert streamer.done
@@ -0,0 +1,93 @@
+"""Tests for resumable incremental event sync."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from olarmflowclient import (
+    DeviceNotFound,
+    EventSync,
+    OlarmFlowClient,
+    SqliteCursorStore,
+)
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = SqliteCursorStore(str(tmp_path / "cursors.db"))
+    yield store
+    await store.close()
+
+
+def _fake_history(histories):
+    async def fake_get_device_events(device_id, limit, after):
+        if device_id not in histories:
+            raise DeviceNotFound(device_id)
+        events = histories[device_id]
+        start = 0
+        if after is not None:
+            start = next(i for i, e in enumerate(events) if e["eventId"] == after) + 1
+        return {"data": events[start : start + limit]}
+
+    return fake_get_device_events
+
+
+class TestEventSync:
+    async def test_resumes_from_persisted_cursor(self, tmp_path, store):
+        now_ms = int(time.time() * 1000)
+        histories = {
+            "d1": [{"eventId": f"a{i}", "eventTs": now_ms - 5000} for i in range(5)],
+            "d2": [{"eventId": f"b{i}", "eventTs": now_ms} for i in range(2)],
+        }
+        received: dict[str, list[str]] = {"d1": [], "d2": []}
+
+        async def on_events(device_id, events):
+            received[device_id].extend(event["eventId"] for event in events)
+
+        client = OlarmFlowClient("token")
+        with patch.object(
+            client, "get_device_events", side_effect=_fake_history(histories)
+        ):
+            status = await EventSync(client, store, on_events, page_size=2).run(
+                ["d1", "d2"]
+            )
+            assert received == {
+                "d1": ["a0", "a1", "a2", "a3", "a4"],
+                "d2": ["b0", "b1"],
+            }
+            assert status["d1"].events == 5
+            assert status["d1"].cursor == "a4"
+            assert 4 <= status["d1"].lag < 60
+
+            # New events arrive; a fresh store on the same file resumes
+            histories["d1"].append({"eventId": "a5", "eventTs": now_ms})
+            reopened = SqliteCursorStore(str(tmp_path / "cursors.db"))
+            calls = []
+            status = await EventSync(
+                client, reopened, lambda d, e: calls.append((d, e))
+            ).run(["d1", "d2"])
+            await reopened.close()
+
+        assert calls == [("d1", [{"eventId": "a5", "eventTs": now_ms}])]
+        assert status["d1"].events == 1
+        assert status["d2"].events == 0
+        assert status["d2"].cursor == "b1"
+        # Lag for a device with nothing new comes from its stored cursor
+        assert status["d2"].last_event_ts is None
+        assert 0 <= status["d2"].lag < 60
+
+    async def test_device_failure_is_isolated(self, store):
+        client = OlarmFlowClient("token")
+        histories = {"d1": [{"eventId": "a0"}]}
+        with patch.object(
+            client, "get_device_events", side_effect=_fake_history(histories)
+        ):
+            status = await EventSync(client, store, lambda d, e: None).run(
+                ["d1", "missing"]
+            )
+
+        assert status["d1"].events == 1
+        assert status["d1"].error is None
+        assert isinstance(status["missing"].error, DeviceNotFound)
+        assert await store.load("missing") is None
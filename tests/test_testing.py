@@ -0,0 +1,143 @@
+"""Tests for the local fake Olarm API and MQTT broker."""
+
+import asyncio
+
+import pytest
+
+from olarmflowclient import (
+    DeviceNotFound,
+    MqttAuthError,
+    OlarmFlowClient,
+    RateLimited,
+    ServiceUnavailable,
+    TokenExpired,
+)
+from olarmflowclient.testing import FakeMqttBroker, FakeOlarmApi
+from olarmflowclient.testing.mqtt import topic_matches
+
+
+class TestFakeOlarmApi:
+    async def test_devices_and_events(self):
+        async with FakeOlarmApi(devices=5, events_per_device=25) as api:
+            async with OlarmFlowClient("token", base_url=api.url) as client:
+                page = await client.get_devices(page=2, pageLength=2)
+                assert page["total"] == 5
+                assert [d["deviceId"] for d in page["data"]] == [
+                    "device-00003",
+                    "device-00004",
+                ]
+                device = await client.get_device("device-00001")
+                assert device["deviceState"]["areas"] == ["disarm", "disarm"]
+                with pytest.raises(DeviceNotFound):
+                    await client.get_device("missing")
+
+                events = [
+                    e
+                    async for e in client.iter_device_events(
+                        "device-00001", page_size=10
+                    )
+                ]
+                assert [e["eventId"] for e in events] == [str(n) for n in range(1, 26)]
+
+            assert api.stats()["requests"]["GET /api/v4/devices/{id}/events"] == 3
+
+    async def test_actions_change_state(self):
+        async with FakeOlarmApi(devices=1) as api:
+            async with OlarmFlowClient("token", base_url=api.url) as client:
+                await client.send_device_area_arm("device-00001", 2)
+                await client.send_device_zone_bypass("device-00001", 3)
+                device = await client.get_device("device-00001")
+                actions = await client.get_device_actions("device-00001")
+
+        assert device["deviceState"]["areas"] == ["disarm", "arm"]
+        assert device["deviceState"]["zones"][2] == "b"
+        assert [a["actionCmd"] for a in actions["data"]] == [
+            "area-arm",
+            "zone-bypass",
+        ]
+
+    async def test_error_injection(self):
+        async with FakeOlarmApi(access_token="secret") as api:
+            async with OlarmFlowClient("wrong", base_url=api.url) as client:
+                with pytest.raises(TokenExpired):
+                    await client.get_devices()
+
+            api.access_token = None
+            async with OlarmFlowClient(
+                "token", base_url=api.url, retry_policy=None
+            ) as client:
+                api.rate_limit_ratio = 1.0
+                with pytest.raises(RateLimited) as err:
+                    await client.get_devices()
+                assert err.value.retry_after == 1
+
+                api.rate_limit_ratio = 0.0
+                api.error_ratio = 1.0
+                api.error_statuses = (503,)
+                with pytest.raises(ServiceUnavailable):
+                    await client.get_devices()
+
+        assert api.stats()["statuses"] == {401: 1, 429: 1, 503: 1}
+
+    async def test_latency(self):
+        async with FakeOlarmApi(latency=0.05) as api:
+            async with OlarmFlowClient("token", base_url=api.url) as client:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await client.get_device("device-00001")
+                assert loop.time() - start >= 0.05
+
+
+class TestFakeMqttBroker:
+    async def test_publishes_device_state(self):
+        async with (
+            FakeOlarmApi(devices=2) as api,
+            FakeMqttBroker(api, publish_rate=50, seed=1) as broker,
+        ):
+            async with OlarmFlowClient(
+                "token",
+                base_url=api.url,
+                mqtt_host=broker.host,
+                mqtt_port=broker.port,
+                mqtt_tls=False,
+            ) as client:
+                received: asyncio.Queue[dict] = asyncio.Queue()
+                client.subscribe_to_device(
+                    "device-00002", lambda topic, data: received.put_nowait(data)
+                )
+                await client.start_mqtt_async("user")
+                try:
+                    state = await asyncio.wait_for(received.get(), 2)
+                    assert state["deviceId"] == "device-00002"
+                    assert "a" in state["deviceState"]["zones"]
+
+                    # An action's state change is published to confirm it
+                    await client.send_and_confirm(
+                        "device-00002", "area-stay", 1, timeout=2
+                    )
+                finally:
+                    client.stop_mqtt()
+
+            assert broker.stats()["delivered"] >= 2
+
+    async def test_rejects_wrong_password(self):
+        async with FakeMqttBroker(access_token="secret") as broker:
+            client = OlarmFlowClient(
+                "wrong", mqtt_host=broker.host, mqtt_port=broker.port, mqtt_tls=False
+            )
+            with pytest.raises(MqttAuthError):
+                await client.start_mqtt_async("user", timeout=5)
+
+
+@pytest.mark.parametrize(
+    ("topic_filter", "topic", "expected"),
+    [
+        ("v4/devices/a", "v4/devices/a", True),
+        ("v4/devices/+", "v4/devices/a", True),
+        ("v4/#", "v4/devices/a", True),
+        ("v4/devices/+", "v4/devices/a/b", False),
+        ("v4/devices/a", "v4/devices/b", False),
+    ],
+)
+def test_topic_matches(topic_filter, topic, expected):
+    assert topic_matches(topic_filter, topic) is expected
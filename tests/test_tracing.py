@@ -0,0 +1,50 @@
+"""Tests for the tracing hooks."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from olarmflowclient import OlarmFlowClient, OpenTelemetryTracer, Span, Tracer
+from olarmflowclient.tracing import traced
+
+
+def test_traced_records_exceptions():
+    tracer = MagicMock(spec=Tracer)
+    with pytest.raises(ValueError):
+        with traced(tracer, "work", {"key": 1}):
+            raise ValueError("boom")
+
+    tracer.start_span.assert_called_once_with("work", {"key": 1}, None)
+    span = tracer.start_span.return_value
+    assert isinstance(span.record_exception.call_args.args[0], ValueError)
+    span.end.assert_called_once_with()
+
+
+def test_base_tracer_is_noop():
+    with traced(Tracer(), "work") as span:
+        span.set_attribute("key", 1)
+    assert type(span) is Span
+
+
+def test_opentelemetry_tracer_requires_package():
+    try:
+        import opentelemetry  # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError):
+            OpenTelemetryTracer()
+    else:
+        assert isinstance(OpenTelemetryTracer().start_span("x"), Span)
+
+
+async def test_mqtt_subscribe_traced():
+    tracer = MagicMock(spec=Tracer)
+    client = OlarmFlowClient("token", tracer=tracer)
+    mqtt_client = MagicMock(subscribe=AsyncMock())
+
+    await client._mqtt_subscribe_now(mqtt_client, "v4/devices/d1")
+
+    mqtt_client.subscribe.assert_awaited_once_with("v4/devices/d1")
+    tracer.start_span.assert_called_once_with(
+        "olarm.mqtt.subscribe", {"messaging.destination.name": "v4/devices/d1"}, None
+    )
+    tracer.start_span.return_value.end.assert_called_once_with()